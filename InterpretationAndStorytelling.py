@@ -1,64 +1,178 @@
-import React, { useState, useEffect } from 'react';
-import { LineChart, Line, AreaChart, Area, BarChart, Bar, XAxis, YAxis, CartesianGrid, Tooltip, Legend, ResponsiveContainer, PieChart, Pie, Cell, ScatterPlot, Scatter } from 'recharts';
+import React, { useState, useEffect, useCallback, useRef } from 'react';
+import { LineChart, Line, AreaChart, Area, BarChart, Bar, ComposedChart, XAxis, YAxis, CartesianGrid, Tooltip, Legend, ResponsiveContainer, PieChart, Pie, Cell, ScatterPlot, Scatter } from 'recharts';
 import { TrendingUp, TrendingDown, DollarSign, Activity, BarChart3, Filter, RefreshCw } from 'lucide-react';
+import { OHLCVStore, epochDayToISO } from './src/js/utils/ohlcvStore';
+import { loadStaticStore } from './src/js/utils/arrowStore';
+import { TIMEFRAMES } from './src/js/utils/barPyramid';
+import { selectView, selectCurrentStock, selectChartSeries, selectCorrelationData, selectIndicatorSeries, selectTimeIndexes, selectScatterIndex, selectVolumeStats } from './src/js/utils/selectors';
+import { SCREEN_METRICS, METRIC_LABELS, formatMetric, hasMarketCap, missingMarketCapText, topK, bottomK, percentileOf, peerGroup } from './src/js/utils/screener';
+import { loadSymbols, ensureTimeframe, loadCachedStore, seedFromCache, DEFAULT_API_URL } from './src/js/utils/dataApi';
+import { openSeriesCache } from './src/js/utils/seriesCache';
+import { useScreen } from './src/js/utils/useScreen';
+import { useElementWidth } from './src/js/utils/useElementWidth';
+import { loadCorrelationNetwork } from './src/js/utils/correlationNetwork';
+import CorrelationNetworkChart from './src/js/charts/CorrelationNetworkChart';
+import { loadSectorCube, sectorAllocation } from './src/js/utils/sectorCube';
+import SectorHeatmap from './src/js/charts/SectorHeatmap';
+import SymbolPicker from './src/js/components/SymbolPicker';
+import VirtualList from './src/js/components/VirtualList';
+import { subscribeQuotes } from './src/js/utils/quoteStream';
+import { loadStories, storyFor } from './src/js/utils/stories';
+import { momentumSignal, indicatorSummary, STRONG_BULLISH, MILD_BULLISH, MILD_BEARISH, STRONG_BEARISH } from './src/js/utils/signals';
+import { ANIMATION_POINT_LIMIT, chartAnimation } from './src/js/utils/chartAnimation';
+import { PLOT_MARGIN, X_AXIS_HEIGHT, Y_AXIS_WIDTH } from './src/js/utils/hitTest';
 
-const StockMarketDashboard = () => {
+// Sample quotes shown until the processed columnar store (data/process_data.py) loads
+const sampleStockData = {
+  'AAPL': {
+    name: 'Apple Inc.',
+    current: 185.42,
+    change: 2.34,
+    changePercent: 1.28,
+    volume: 45623000,
+    marketCap: 2890000000000,
+    priceHistory: [
+      { date: '2024-01-01', price: 180.25, volume: 52000000, high: 182.5, low: 178.3, open: 179.1, close: 180.25 },
+      { date: '2024-01-02', price: 182.15, volume: 48000000, high: 184.2, low: 180.8, open: 180.25, close: 182.15 },
+      { date: '2024-01-03', price: 178.90, volume: 61000000, high: 183.1, low: 177.5, open: 182.15, close: 178.90 },
+      { date: '2024-01-04', price: 181.75, volume: 43000000, high: 183.8, low: 179.2, open: 178.90, close: 181.75 },
+      { date: '2024-01-05', price: 185.42, volume: 45623000, high: 186.9, low: 182.1, open: 181.75, close: 185.42 },
+    ]
+  },
+  'GOOGL': {
+    name: 'Alphabet Inc.',
+    current: 142.68,
+    change: -1.87,
+    changePercent: -1.29,
+    volume: 23450000,
+    marketCap: 1780000000000,
+    priceHistory: [
+      { date: '2024-01-01', price: 145.20, volume: 28000000, high: 147.1, low: 143.8, open: 144.5, close: 145.20 },
+      { date: '2024-01-02', price: 143.85, volume: 31000000, high: 146.2, low: 142.9, open: 145.20, close: 143.85 },
+      { date: '2024-01-03', price: 147.30, volume: 25000000, high: 148.5, low: 144.1, open: 143.85, close: 147.30 },
+      { date: '2024-01-04', price: 144.55, volume: 29000000, high: 148.0, low: 143.2, open: 147.30, close: 144.55 },
+      { date: '2024-01-05', price: 142.68, volume: 23450000, high: 145.8, low: 141.9, open: 144.55, close: 142.68 },
+    ]
+  },
+  'TSLA': {
+    name: 'Tesla Inc.',
+    current: 248.91,
+    change: 8.45,
+    changePercent: 3.51,
+    volume: 89234000,
+    marketCap: 790000000000,
+    priceHistory: [
+      { date: '2024-01-01', price: 235.20, volume: 95000000, high: 238.5, low: 232.1, open: 234.0, close: 235.20 },
+      { date: '2024-01-02', price: 240.75, volume: 78000000, high: 243.2, low: 236.8, open: 235.20, close: 240.75 },
+      { date: '2024-01-03', price: 238.46, volume: 102000000, high: 242.9, low: 235.3, open: 240.75, close: 238.46 },
+      { date: '2024-01-04', price: 245.33, volume: 84000000, high: 248.1, low: 239.7, open: 238.46, close: 245.33 },
+      { date: '2024-01-05', price: 248.91, volume: 89234000, high: 251.8, low: 246.2, open: 245.33, close: 248.91 },
+    ]
+  }
+};
+
+const CHART_HEIGHT = 300;
+// Leaders and laggards shown in the comparative analysis
+const COMPARISON_COUNT = 3;
+const RANKING_ROW_HEIGHT = 32;
+const RANKING_HEIGHT = 256;
+
+const formatDay = (day) => new Date(epochDayToISO(day)).toLocaleDateString();
+
+// storeFormat picks the statically deployed store: 'columnar' (ohlcv.bin) or
+// 'arrow' (the processed/arrow export of data/export_arrow.py)
+const StockMarketDashboard = ({ animationPointLimit = ANIMATION_POINT_LIMIT, storeFormat = 'columnar' } = {}) => {
   const [selectedStock, setSelectedStock] = useState('AAPL');
   const [timeframe, setTimeframe] = useState('1M');
   const [viewType, setViewType] = useState('price');
   const [hoveredData, setHoveredData] = useState(null);
-  const [animationKey, setAnimationKey] = useState(0);
-
-  // Mock stock data - in real app, this would come from an API
-  const stockData = {
-    'AAPL': {
-      name: 'Apple Inc.',
-      current: 185.42,
-      change: 2.34,
-      changePercent: 1.28,
-      volume: 45623000,
-      marketCap: 2890000000000,
-      priceHistory: [
-        { date: '2024-01-01', price: 180.25, volume: 52000000, high: 182.5, low: 178.3, open: 179.1, close: 180.25 },
-        { date: '2024-01-02', price: 182.15, volume: 48000000, high: 184.2, low: 180.8, open: 180.25, close: 182.15 },
-        { date: '2024-01-03', price: 178.90, volume: 61000000, high: 183.1, low: 177.5, open: 182.15, close: 178.90 },
-        { date: '2024-01-04', price: 181.75, volume: 43000000, high: 183.8, low: 179.2, open: 178.90, close: 181.75 },
-        { date: '2024-01-05', price: 185.42, volume: 45623000, high: 186.9, low: 182.1, open: 181.75, close: 185.42 },
-      ]
-    },
-    'GOOGL': {
-      name: 'Alphabet Inc.',
-      current: 142.68,
-      change: -1.87,
-      changePercent: -1.29,
-      volume: 23450000,
-      marketCap: 1780000000000,
-      priceHistory: [
-        { date: '2024-01-01', price: 145.20, volume: 28000000, high: 147.1, low: 143.8, open: 144.5, close: 145.20 },
-        { date: '2024-01-02', price: 143.85, volume: 31000000, high: 146.2, low: 142.9, open: 145.20, close: 143.85 },
-        { date: '2024-01-03', price: 147.30, volume: 25000000, high: 148.5, low: 144.1, open: 143.85, close: 147.30 },
-        { date: '2024-01-04', price: 144.55, volume: 29000000, high: 148.0, low: 143.2, open: 147.30, close: 144.55 },
-        { date: '2024-01-05', price: 142.68, volume: 23450000, high: 145.8, low: 141.9, open: 144.55, close: 142.68 },
-      ]
-    },
-    'TSLA': {
-      name: 'Tesla Inc.',
-      current: 248.91,
-      change: 8.45,
-      changePercent: 3.51,
-      volume: 89234000,
-      marketCap: 790000000000,
-      priceHistory: [
-        { date: '2024-01-01', price: 235.20, volume: 95000000, high: 238.5, low: 232.1, open: 234.0, close: 235.20 },
-        { date: '2024-01-02', price: 240.75, volume: 78000000, high: 243.2, low: 236.8, open: 235.20, close: 240.75 },
-        { date: '2024-01-03', price: 238.46, volume: 102000000, high: 242.9, low: 235.3, open: 240.75, close: 238.46 },
-        { date: '2024-01-04', price: 245.33, volume: 84000000, high: 248.1, low: 239.7, open: 238.46, close: 245.33 },
-        { date: '2024-01-05', price: 248.91, volume: 89234000, high: 251.8, low: 246.2, open: 245.33, close: 248.91 },
-      ]
-    }
-  };
+  const [screenMetric, setScreenMetric] = useState('changePercent');
+  const [store, setStore] = useState(() => OHLCVStore.fromRecords(sampleStockData));
+  const [chartRef, chartWidth] = useElementWidth();
+  // Live bars mutate the store in place; this counter re-renders after each batch
+  const [, setLiveRevision] = useState(0);
+  const [streamSession, setStreamSession] = useState(0);
+  const [network, setNetwork] = useState(null);
+  const [sectorCube, setSectorCube] = useState(null);
+  const [stories, setStories] = useState(null);
+  // Series fetched from the data API, kept in IndexedDB across reloads
+  const [seriesCache] = useState(() => openSeriesCache());
+
+  // Only the most recent load may replace the store
+  const loadRequest = useRef(0);
+  const selection = useRef(selectedStock);
+  selection.current = selectedStock;
+
+  const loadStore = useCallback(() => {
+    const request = ++loadRequest.current;
+    const symbol = selection.current;
+    let answered = false;
+    // Paint the selected symbol from the browser cache while the server answers
+    loadCachedStore(seriesCache, symbol).then(cached => {
+      if (cached && !answered && request === loadRequest.current) setStore(cached);
+    });
+    // Served by data/serve.py: start from the symbol list and fetch bars per
+    // view. Deployed as static files: load the whole store
+    loadSymbols(DEFAULT_API_URL, { cache: 'no-cache' })
+      .then(loaded => seedFromCache(loaded, seriesCache, symbol))
+      .catch(() => loadStaticStore(storeFormat, { cache: 'no-cache' }))
+      .then(loaded => {
+        answered = true;
+        if (request !== loadRequest.current) return;
+        setStore(loaded);
+        setSelectedStock(prev => (loaded.has(prev) ? prev : loaded.symbols[0]));
+      })
+      // No processed store deployed - keep showing the sample data
+      .catch(() => {});
+    loadCorrelationNetwork(undefined, { cache: 'no-cache' })
+      .then(loaded => {
+        if (request === loadRequest.current) setNetwork(loaded);
+      })
+      // data/correlate.py has not been run - the network card stays hidden
+      .catch(() => {});
+    loadSectorCube(undefined, { cache: 'no-cache' })
+      .then(loaded => {
+        if (request === loadRequest.current) setSectorCube(loaded);
+      })
+      // Shipped alongside the store; the sample allocation stays until it loads
+      .catch(() => {});
+    loadStories(undefined, { cache: 'no-cache' })
+      .then(loaded => {
+        if (request === loadRequest.current) setStories(loaded);
+      })
+      // Without generated stories the narratives are written inline below
+      .catch(() => {});
+  }, [seriesCache, storeFormat]);
+
+  useEffect(() => {
+    loadStore();
+    return () => {
+      loadRequest.current++;
+    };
+  }, [loadStore]);
+
+  // With a store from the data API, fetch just the window the selected symbol
+  // and timeframe show, less whatever the series cache already holds; the
+  // view widens in place once it arrives
+  useEffect(() => {
+    if (!store.has(selectedStock)) return undefined;
+    // A newer symbol or timeframe cancels the fetch of this one
+    const controller = new AbortController();
+    ensureTimeframe(store, selectedStock, timeframe, { cache: seriesCache, options: { signal: controller.signal } })
+      .then(changed => {
+        if (changed) setLiveRevision(revision => revision + 1);
+      })
+      .catch(() => {});
+    return () => {
+      controller.abort();
+    };
+  }, [store, selectedStock, timeframe, seriesCache]);
 
-  // Portfolio allocation data
+  // Stream live quotes into whichever store is shown; reconnecting replays the
+  // latest bar of every symbol, so a refresh catches up without a reload
+  useEffect(() => subscribeQuotes(store, setLiveRevision), [store, streamSession]);
+
+  // Portfolio allocation data (sample until the sector cube loads)
   const portfolioData = [
     { name: 'Technology', value: 45, color: '#3B82F6' },
     { name: 'Healthcare', value: 20, color: '#10B981' },
@@ -66,29 +180,66 @@ const StockMarketDashboard = () => {
     { name: 'Energy', value: 12, color: '#EF4444' },
     { name: 'Consumer', value: 8, color: '#8B5CF6' }
   ];
+  const allocationData = sectorCube
+    ? sectorAllocation(sectorCube, portfolioData.map(entry => entry.color))
+    : portfolioData;
+
+  // Derived data is memoized per (symbol, data version, inputs) in selectors.js,
+  // so hover and view-type changes re-render without recomputing any of it.
+  // Coarsest pyramid level that still fills the price chart for this timeframe
+  const view = selectView(store, selectedStock, timeframe, chartWidth);
+  const currentStock = selectCurrentStock(store, selectedStock, view);
+  // Narrative texts the pipeline generated for this symbol (data/pipeline/narrative.py)
+  const story = storyFor(stories, selectedStock);
+  // LTTB price line and min/max volume bars sized to the chart, so Recharts
+  // never builds more SVG nodes than there are pixels to show them
+  const chartSeries = selectChartSeries(store, selectedStock, view, chartWidth);
+
+  // MACD rows from the pipeline's daily indicator columns (empty for sample data)
+  const indicatorSeries = selectIndicatorSeries(store, selectedStock, view, chartWidth);
 
-  // Volume vs Price correlation data
-  const correlationData = stockData[selectedStock].priceHistory.map(item => ({
-    volume: item.volume / 1000000, // Convert to millions
-    price: item.price,
-    date: item.date
-  }));
+  // Volume vs Price correlation data (volume in millions)
+  const correlationData = selectCorrelationData(store, selectedStock, view);
 
-  const currentStock = stockData[selectedStock];
+  // Hover hit-testing: binary search over the time axis, uniform grid for the
+  // scatter plot. Recharts' own Tooltip scans the series, so charts are hovered
+  // through these indexes and the tooltips rendered from the hit
+  const timeIndexes = selectTimeIndexes(store, selectedStock, view, chartWidth);
+  const scatterIndex = selectScatterIndex(store, selectedStock, view);
+
+  // Universe rankings, re-sorted in a worker as live quotes arrive (null
+  // until the first sort of a store is back)
+  const screen = useScreen(store);
+
+  const hoverHandlers = (chart, index) => ({
+    onMouseMove: (event) => {
+      const rect = event.currentTarget.getBoundingClientRect();
+      const x = event.clientX - rect.left;
+      const y = event.clientY - rect.top;
+      const hit = index.hitTest(x, y, rect.width, rect.height);
+      setHoveredData(hit < 0 ? null : { chart, index: hit, x, y });
+    },
+    onMouseLeave: () => setHoveredData(null)
+  });
+
+  const hoverTooltip = (chart, render) => hoveredData && hoveredData.chart === chart && (
+    <div className="absolute pointer-events-none z-10" style={{ left: hoveredData.x + 12, top: hoveredData.y + 12 }}>
+      {render(hoveredData.index)}
+    </div>
+  );
 
   // Interactive handlers
+  // Charts keep their keys and transition to the new series in place
   const handleStockChange = (stock) => {
     setSelectedStock(stock);
-    setAnimationKey(prev => prev + 1);
   };
 
   const handleTimeframeChange = (tf) => {
     setTimeframe(tf);
-    setAnimationKey(prev => prev + 1);
   };
 
   const refreshData = () => {
-    setAnimationKey(prev => prev + 1);
+    setStreamSession(session => session + 1);
   };
 
   // Custom tooltip components
@@ -122,6 +273,14 @@ const StockMarketDashboard = () => {
     return null;
   };
 
+  const ScatterTooltip = ({ point }) => (
+    <div className="bg-white p-3 border border-gray-300 rounded-lg shadow-lg">
+      <p className="font-semibold">{`Date: ${point.date}`}</p>
+      <p style={{ color: '#8B5CF6' }}>{`Volume: ${point.volume.toFixed(1)}M`}</p>
+      <p style={{ color: '#8B5CF6' }}>{`Price: $${point.price.toFixed(2)}`}</p>
+    </div>
+  );
+
   return (
     <div className="min-h-screen bg-gradient-to-br from-blue-50 to-indigo-100 p-6">
       <div className="max-w-7xl mx-auto">
@@ -143,20 +302,12 @@ const StockMarketDashboard = () => {
             <div className="flex items-center gap-2">
               <Filter size={18} className="text-gray-600" />
               <span className="font-medium">Stock:</span>
-              <select 
-                value={selectedStock} 
-                onChange={(e) => handleStockChange(e.target.value)}
-                className="border border-gray-300 rounded-lg px-3 py-2 focus:ring-2 focus:ring-blue-500 focus:border-transparent"
-              >
-                <option value="AAPL">Apple (AAPL)</option>
-                <option value="GOOGL">Alphabet (GOOGL)</option>
-                <option value="TSLA">Tesla (TSLA)</option>
-              </select>
+              <SymbolPicker store={store} value={selectedStock} onChange={handleStockChange} />
             </div>
             
             <div className="flex items-center gap-2">
               <span className="font-medium">Timeframe:</span>
-              {['1W', '1M', '3M', '1Y'].map(tf => (
+              {TIMEFRAMES.map(tf => (
                 <button
                   key={tf}
                   onClick={() => handleTimeframeChange(tf)}
@@ -231,7 +382,7 @@ const StockMarketDashboard = () => {
               <div className="flex items-center justify-between">
                 <div>
                   <p className="text-orange-100 text-sm">Market Cap</p>
-                  <p className="text-2xl font-bold">${(currentStock.marketCap / 1000000000000).toFixed(2)}T</p>
+                  <p className="text-2xl font-bold">{formatMetric('marketCap', currentStock.marketCap)}</p>
                 </div>
                 <BarChart3 size={32} className="text-orange-200" />
               </div>
@@ -242,120 +393,191 @@ const StockMarketDashboard = () => {
         {/* Main Charts */}
         <div className="grid grid-cols-1 lg:grid-cols-2 gap-8 mb-8">
           {/* Price Chart */}
-          <div className="bg-white rounded-xl shadow-lg p-6">
+          <div ref={chartRef} className="bg-white rounded-xl shadow-lg p-6">
             <h2 className="text-xl font-bold text-gray-800 mb-4">
               {currentStock.name} - Price Movement
             </h2>
-            <ResponsiveContainer width="100%" height={300}>
-              <AreaChart data={currentStock.priceHistory} key={`price-${animationKey}`}>
-                <defs>
-                  <linearGradient id="colorPrice" x1="0" y1="0" x2="0" y2="1">
-                    <stop offset="5%" stopColor="#3B82F6" stopOpacity={0.8}/>
-                    <stop offset="95%" stopColor="#3B82F6" stopOpacity={0.1}/>
-                  </linearGradient>
-                </defs>
-                <CartesianGrid strokeDasharray="3 3" stroke="#E5E7EB" />
-                <XAxis 
-                  dataKey="date" 
-                  stroke="#6B7280"
-                  fontSize={12}
-                  tickFormatter={(value) => new Date(value).toLocaleDateString()}
-                />
-                <YAxis 
-                  stroke="#6B7280"
-                  fontSize={12}
-                  tickFormatter={(value) => `$${value}`}
+            <div className="relative" {...hoverHandlers('price', timeIndexes.price)}>
+              <ResponsiveContainer width="100%" height={CHART_HEIGHT}>
+                <AreaChart data={chartSeries.price} margin={PLOT_MARGIN}>
+                  <defs>
+                    <linearGradient id="colorPrice" x1="0" y1="0" x2="0" y2="1">
+                      <stop offset="5%" stopColor="#3B82F6" stopOpacity={0.8}/>
+                      <stop offset="95%" stopColor="#3B82F6" stopOpacity={0.1}/>
+                    </linearGradient>
+                  </defs>
+                  <CartesianGrid strokeDasharray="3 3" stroke="#E5E7EB" />
+                  <XAxis 
+                    type="number"
+                    dataKey="day" 
+                    domain={timeIndexes.price.domain}
+                    allowDataOverflow
+                    height={X_AXIS_HEIGHT}
+                    stroke="#6B7280"
+                    fontSize={12}
+                    tickFormatter={formatDay}
+                  />
+                  <YAxis 
+                    width={Y_AXIS_WIDTH}
+                    stroke="#6B7280"
+                    fontSize={12}
+                    tickFormatter={(value) => `$${value}`}
+                  />
+                  <Area
+                    type="monotone"
+                    dataKey="price"
+                    stroke="#3B82F6"
+                    strokeWidth={3}
+                    fillOpacity={1}
+                    fill="url(#colorPrice)"
+                    {...chartAnimation(chartSeries.price.length, animationPointLimit)}
+                  />
+                </AreaChart>
+              </ResponsiveContainer>
+              {hoverTooltip('price', (i) => (
+                <CustomTooltip
+                  active
+                  label={chartSeries.price[i].date}
+                  payload={[{ dataKey: 'price', value: chartSeries.price[i].price, color: '#3B82F6' }]}
                 />
-                <Tooltip content={<CustomTooltip />} />
-                <Area
-                  type="monotone"
-                  dataKey="price"
-                  stroke="#3B82F6"
-                  strokeWidth={3}
-                  fillOpacity={1}
-                  fill="url(#colorPrice)"
-                  animationDuration={1500}
-                />
-              </AreaChart>
-            </ResponsiveContainer>
+              ))}
+            </div>
           </div>
 
           {/* Volume Chart */}
           <div className="bg-white rounded-xl shadow-lg p-6">
             <h2 className="text-xl font-bold text-gray-800 mb-4">Trading Volume</h2>
-            <ResponsiveContainer width="100%" height={300}>
-              <BarChart data={currentStock.priceHistory} key={`volume-${animationKey}`}>
+            <div className="relative" {...hoverHandlers('volume', timeIndexes.volume)}>
+              <ResponsiveContainer width="100%" height={CHART_HEIGHT}>
+                <BarChart data={chartSeries.volume} margin={PLOT_MARGIN}>
+                  <CartesianGrid strokeDasharray="3 3" stroke="#E5E7EB" />
+                  <XAxis 
+                    type="number"
+                    dataKey="day" 
+                    domain={timeIndexes.volume.domain}
+                    allowDataOverflow
+                    height={X_AXIS_HEIGHT}
+                    stroke="#6B7280"
+                    fontSize={12}
+                    tickFormatter={formatDay}
+                  />
+                  <YAxis 
+                    width={Y_AXIS_WIDTH}
+                    stroke="#6B7280"
+                    fontSize={12}
+                    tickFormatter={(value) => `${(value / 1000000).toFixed(0)}M`}
+                  />
+                  <Bar 
+                    dataKey="volume" 
+                    fill="#10B981"
+                    radius={[4, 4, 0, 0]}
+                    {...chartAnimation(chartSeries.volume.length, animationPointLimit)}
+                  />
+                </BarChart>
+              </ResponsiveContainer>
+              {hoverTooltip('volume', (i) => (
+                <VolumeTooltip
+                  active
+                  label={chartSeries.volume[i].date}
+                  payload={[{ value: chartSeries.volume[i].volume / 1000000, color: '#10B981' }]}
+                />
+              ))}
+            </div>
+          </div>
+        </div>
+
+        {/* MACD from the daily indicator columns (data/pipeline/indicators.py) */}
+        {indicatorSeries.length > 0 && (
+          <div className="bg-white rounded-xl shadow-lg p-6 mb-8">
+            <h2 className="text-xl font-bold text-gray-800 mb-4">MACD (12, 26, 9)</h2>
+            <ResponsiveContainer width="100%" height={200}>
+              <ComposedChart data={indicatorSeries} margin={PLOT_MARGIN}>
                 <CartesianGrid strokeDasharray="3 3" stroke="#E5E7EB" />
                 <XAxis 
-                  dataKey="date" 
+                  type="number"
+                  dataKey="day" 
+                  domain={timeIndexes.price.domain}
+                  allowDataOverflow
+                  height={X_AXIS_HEIGHT}
                   stroke="#6B7280"
                   fontSize={12}
-                  tickFormatter={(value) => new Date(value).toLocaleDateString()}
+                  tickFormatter={formatDay}
                 />
                 <YAxis 
+                  width={Y_AXIS_WIDTH}
                   stroke="#6B7280"
                   fontSize={12}
-                  tickFormatter={(value) => `${(value / 1000000).toFixed(0)}M`}
-                />
-                <Tooltip content={<VolumeTooltip />} />
-                <Bar 
-                  dataKey="volume" 
-                  fill="#10B981"
-                  radius={[4, 4, 0, 0]}
-                  animationDuration={1500}
+                  tickFormatter={(value) => value.toFixed(1)}
                 />
-              </BarChart>
+                <Bar dataKey="histogram" {...chartAnimation(indicatorSeries.length, animationPointLimit)}>
+                  {indicatorSeries.map((row, index) => (
+                    <Cell key={index} fill={row.histogram >= 0 ? '#10B981' : '#EF4444'} />
+                  ))}
+                </Bar>
+                <Line type="monotone" dataKey="macd" stroke="#3B82F6" strokeWidth={2} dot={false} {...chartAnimation(indicatorSeries.length, animationPointLimit)} />
+                <Line type="monotone" dataKey="signal" stroke="#F59E0B" strokeWidth={2} dot={false} {...chartAnimation(indicatorSeries.length, animationPointLimit)} />
+              </ComposedChart>
             </ResponsiveContainer>
           </div>
-        </div>
+        )}
+
+        {/* Sector heatmap from the precomputed cube (data/pipeline/cube.py) */}
+        {sectorCube && (
+          <div className="bg-white rounded-xl shadow-lg p-6 mb-8">
+            <h2 className="text-xl font-bold text-gray-800 mb-4">Sector Performance Heatmap</h2>
+            <SectorHeatmap cube={sectorCube} />
+          </div>
+        )}
 
         {/* Secondary Charts */}
         <div className="grid grid-cols-1 lg:grid-cols-2 gap-8">
           {/* Price vs Volume Correlation */}
           <div className="bg-white rounded-xl shadow-lg p-6">
             <h2 className="text-xl font-bold text-gray-800 mb-4">Price vs Volume Analysis</h2>
-            <ResponsiveContainer width="100%" height={300}>
-              <ScatterPlot data={correlationData} key={`scatter-${animationKey}`}>
-                <CartesianGrid strokeDasharray="3 3" stroke="#E5E7EB" />
-                <XAxis 
-                  type="number" 
-                  dataKey="volume" 
-                  name="Volume"
-                  stroke="#6B7280"
-                  fontSize={12}
-                  tickFormatter={(value) => `${value.toFixed(0)}M`}
-                />
-                <YAxis 
-                  type="number" 
-                  dataKey="price" 
-                  name="Price"
-                  stroke="#6B7280"
-                  fontSize={12}
-                  tickFormatter={(value) => `$${value}`}
-                />
-                <Tooltip 
-                  cursor={{ strokeDasharray: '3 3' }}
-                  formatter={(value, name) => [
-                    name === 'volume' ? `${value.toFixed(1)}M` : `$${value.toFixed(2)}`,
-                    name === 'volume' ? 'Volume' : 'Price'
-                  ]}
-                />
-                <Scatter 
-                  dataKey="price" 
-                  fill="#8B5CF6"
-                  animationDuration={1500}
-                />
-              </ScatterPlot>
-            </ResponsiveContainer>
+            <div className="relative" {...hoverHandlers('scatter', scatterIndex)}>
+              <ResponsiveContainer width="100%" height={CHART_HEIGHT}>
+                <ScatterPlot data={correlationData} margin={PLOT_MARGIN}>
+                  <CartesianGrid strokeDasharray="3 3" stroke="#E5E7EB" />
+                  <XAxis 
+                    type="number" 
+                    dataKey="volume" 
+                    name="Volume"
+                    domain={scatterIndex.domainX}
+                    allowDataOverflow
+                    height={X_AXIS_HEIGHT}
+                    stroke="#6B7280"
+                    fontSize={12}
+                    tickFormatter={(value) => `${value.toFixed(0)}M`}
+                  />
+                  <YAxis 
+                    type="number" 
+                    dataKey="price" 
+                    name="Price"
+                    domain={scatterIndex.domainY}
+                    allowDataOverflow
+                    width={Y_AXIS_WIDTH}
+                    stroke="#6B7280"
+                    fontSize={12}
+                    tickFormatter={(value) => `$${value.toFixed(0)}`}
+                  />
+                  <Scatter 
+                    dataKey="price" 
+                    fill="#8B5CF6"
+                    {...chartAnimation(correlationData.length, animationPointLimit)}
+                  />
+                </ScatterPlot>
+              </ResponsiveContainer>
+              {hoverTooltip('scatter', (i) => <ScatterTooltip point={correlationData[i]} />)}
+            </div>
           </div>
 
           {/* Portfolio Allocation */}
           <div className="bg-white rounded-xl shadow-lg p-6">
             <h2 className="text-xl font-bold text-gray-800 mb-4">Portfolio Allocation</h2>
             <ResponsiveContainer width="100%" height={300}>
-              <PieChart key={`pie-${animationKey}`}>
+              <PieChart>
                 <Pie
-                  data={portfolioData}
+                  data={allocationData}
                   cx="50%"
                   cy="50%"
                   labelLine={false}
@@ -365,7 +587,7 @@ const StockMarketDashboard = () => {
                   dataKey="value"
                   animationDuration={1500}
                 >
-                  {portfolioData.map((entry, index) => (
+                  {allocationData.map((entry, index) => (
                     <Cell key={`cell-${index}`} fill={entry.color} />
                   ))}
                 </Pie>
@@ -377,6 +599,17 @@ const StockMarketDashboard = () => {
           </div>
         </div>
 
+        {/* Correlation network (data/correlate.py) */}
+        {network && (
+          <div className="bg-white rounded-xl shadow-lg p-6 mt-8">
+            <h2 className="text-xl font-bold text-gray-800 mb-4">Market Correlation Network</h2>
+            <p className="text-sm text-gray-600 mb-4">
+              {network.window}-day return correlations as of {network.asOf}. Zoom in or click a sector to see its stocks; drag a stock to pull its neighbours.
+            </p>
+            <CorrelationNetworkChart network={network} />
+          </div>
+        )}
+
         {/* Enhanced Data Storytelling Section */}
         <div className="bg-white rounded-xl shadow-lg p-6 mt-8">
           <h2 className="text-xl font-bold text-gray-800 mb-6">📊 Data Story: What the Numbers Tell Us</h2>
@@ -384,6 +617,14 @@ const StockMarketDashboard = () => {
           {/* Key Performance Narrative */}
           <div className="bg-gradient-to-r from-slate-50 to-blue-50 p-6 rounded-lg mb-6">
             <h3 className="text-lg font-bold text-gray-800 mb-3">🎯 Performance Narrative</h3>
+            {story ? (
+              <div className="prose text-gray-700">
+                <p className="mb-3"><strong>Market Story:</strong> {story.performance}</p>
+                <p className="mb-3"><strong>Volume Intelligence:</strong> {story.volume}</p>
+                <p><strong>Market Context:</strong> {story.context}</p>
+                <p className="text-xs text-gray-500 mt-3">Generated from the close of {story.asOf}</p>
+              </div>
+            ) : (
             <div className="prose text-gray-700">
               <p className="mb-3">
                 <strong>Market Story:</strong> {currentStock.name} is currently trading at <span className="font-bold text-blue-600">${currentStock.current}</span>, 
@@ -404,15 +645,20 @@ const StockMarketDashboard = () => {
               </p>
               
               <p>
-                <strong>Market Context:</strong> With a market capitalization of <span className="font-bold text-purple-600">${(currentStock.marketCap / 1000000000000).toFixed(2)}T</span>, 
-                {currentStock.marketCap > 2000000000000 
-                  ? " this stock commands significant market influence as a mega-cap leader, often serving as a market bellwether."
-                  : currentStock.marketCap > 1000000000000
-                  ? " this represents a large-cap stalwart with substantial institutional ownership and lower volatility profile."
-                  : " this mid-to-large cap position offers growth potential while maintaining relative stability."
-                }
+                <strong>Market Context:</strong> {hasMarketCap(currentStock.marketCap) ? (
+                  <>
+                    With a market capitalization of <span className="font-bold text-purple-600">{formatMetric('marketCap', currentStock.marketCap)}</span>, 
+                    {currentStock.marketCap > 2000000000000 
+                      ? " this stock commands significant market influence as a mega-cap leader, often serving as a market bellwether."
+                      : currentStock.marketCap > 1000000000000
+                      ? " this represents a large-cap stalwart with substantial institutional ownership and lower volatility profile."
+                      : " this mid-to-large cap position offers growth potential while maintaining relative stability."
+                    }
+                  </>
+                ) : missingMarketCapText(currentStock.name)}
               </p>
             </div>
+            )}
           </div>
 
           {/* Technical Analysis Story */}
@@ -424,17 +670,24 @@ const StockMarketDashboard = () => {
               </h3>
               <div className="space-y-2 text-sm text-blue-800">
                 {(() => {
-                  const prices = currentStock.priceHistory.map(d => d.price);
-                  const trend = prices[prices.length - 1] > prices[0] ? 'upward' : 'downward';
-                  const volatility = Math.max(...prices) - Math.min(...prices);
-                  const avgPrice = prices.reduce((a, b) => a + b) / prices.length;
+                  // Rolling-window stats precomputed per symbol (data/pipeline/rolling.py)
+                  // and kept current tick by tick (rollingStats.js). Reading them is O(1),
+                  // so unlike the screen (useScreen.js) this needs no worker round trip
+                  const { 5: week, 20: month, 50: quarter } = currentStock.stats;
+                  const trend = week.last > week.first ? 'upward' : 'downward';
+                  const volatility = week.range;
+                  const avgPrice = week.mean;
+                  const signal = momentumSignal(currentStock);
+                  const technicals = indicatorSummary(currentStock);
                   
                   return (
                     <>
-                      <p><strong>5-Day Trend:</strong> {trend === 'upward' ? '📈 Bullish' : '📉 Bearish'} ({((prices[prices.length - 1] / prices[0] - 1) * 100).toFixed(1)}% net change)</p>
+                      <p><strong>5-Day Trend:</strong> {trend === 'upward' ? '📈 Bullish' : '📉 Bearish'} ({((week.last / week.first - 1) * 100).toFixed(1)}% net change)</p>
                       <p><strong>Volatility Range:</strong> ${volatility.toFixed(2)} ({((volatility / avgPrice) * 100).toFixed(1)}% of average price)</p>
                       <p><strong>Price Position:</strong> Currently {currentStock.current > avgPrice ? '🔴 above' : '🟢 below'} 5-day average (${avgPrice.toFixed(2)})</p>
-                      <p><strong>Momentum Signal:</strong> {currentStock.changePercent > 2 ? '🚀 Strong bullish' : currentStock.changePercent > 0 ? '📈 Mild bullish' : currentStock.changePercent > -2 ? '📉 Mild bearish' : '⚠️ Strong bearish'}</p>
+                      <p><strong>Moving Averages:</strong> 20-day ${month.mean.toFixed(2)} · 50-day ${quarter.mean.toFixed(2)} (σ ${month.std.toFixed(2)} over {month.count} days)</p>
+                      {technicals && <p><strong>MACD / RSI:</strong> {technicals}</p>}
+                      <p><strong>Momentum Signal:</strong> {story ? story.momentum : signal === STRONG_BULLISH ? '🚀 Strong bullish' : signal === MILD_BULLISH ? '📈 Mild bullish' : signal === MILD_BEARISH ? '📉 Mild bearish' : '⚠️ Strong bearish'}</p>
                     </>
                   );
                 })()}
@@ -448,9 +701,7 @@ const StockMarketDashboard = () => {
               </h3>
               <div className="space-y-2 text-sm text-green-800">
                 {(() => {
-                  const volumes = currentStock.priceHistory.map(d => d.volume);
-                  const avgVolume = volumes.reduce((a, b) => a + b) / volumes.length;
-                  const volumeRatio = currentStock.volume / avgVolume;
+                  const { avgVolume, volumeRatio } = selectVolumeStats(store, selectedStock, 5);
                   
                   return (
                     <>
@@ -474,13 +725,15 @@ const StockMarketDashboard = () => {
               <div>
                 <h4 className="font-semibold text-amber-800 mb-2">📊 Technical Indicators Suggest:</h4>
                 <ul className="text-sm text-amber-700 space-y-1">
-                  {currentStock.changePercent > 2 ? (
+                  {story ? (
+                    story.outlook.split('\n').map(line => <li key={line}>• {line}</li>)
+                  ) : momentumSignal(currentStock) === STRONG_BULLISH ? (
                     <>
                       <li>• 🎯 Strong momentum may continue short-term</li>
                       <li>• ⚠️ Watch for profit-taking at resistance levels</li>
                       <li>• 📈 Consider position sizing on pullbacks</li>
                     </>
-                  ) : currentStock.changePercent > 0 ? (
+                  ) : momentumSignal(currentStock) === MILD_BULLISH ? (
                     <>
                       <li>• 📈 Modest uptrend with room for growth</li>
                       <li>• ✅ Stable foundation for continued gains</li>
@@ -499,16 +752,18 @@ const StockMarketDashboard = () => {
                 <h4 className="font-semibold text-amber-800 mb-2">🎯 Risk-Reward Assessment:</h4>
                 <div className="text-sm text-amber-700 space-y-1">
                   <p><strong>Risk Level:</strong> {
+                    story ? story.risk :
                     currentStock.volume > 80000000 ? '🔴 High (elevated volume suggests volatility)' :
                     Math.abs(currentStock.changePercent) > 3 ? '🟡 Moderate-High (significant price movement)' :
                     '🟢 Moderate (stable trading conditions)'
                   }</p>
                   <p><strong>Opportunity Score:</strong> {
-                    currentStock.changePercent > 2 ? '📈 High (momentum play)' :
-                    currentStock.changePercent < -2 ? '💎 High (value play)' :
+                    story ? story.opportunity :
+                    momentumSignal(currentStock) === STRONG_BULLISH ? '📈 High (momentum play)' :
+                    momentumSignal(currentStock) === STRONG_BEARISH ? '💎 High (value play)' :
                     '📊 Moderate (steady performer)'
                   }</p>
-                  <p><strong>Time Horizon:</strong> {currentStock.volume > 60000000 ? 'Short-term focus' : 'Medium-term hold'} recommended</p>
+                  <p><strong>Time Horizon:</strong> {story ? story.horizon : currentStock.volume > 60000000 ? 'Short-term focus' : 'Medium-term hold'} recommended</p>
                 </div>
               </div>
             </div>
@@ -516,35 +771,113 @@ const StockMarketDashboard = () => {
 
           {/* Comparative Analysis */}
           <div className="bg-gradient-to-r from-purple-50 to-pink-100 p-6 rounded-lg">
-            <h3 className="text-lg font-bold text-purple-800 mb-3">🏆 Comparative Market Analysis</h3>
-            <div className="grid grid-cols-1 md:grid-cols-3 gap-4">
-              {Object.entries(stockData).map(([symbol, data]) => (
-                <div key={symbol} className={`p-4 rounded-lg border-2 ${selectedStock === symbol ? 'border-purple-400 bg-purple-100' : 'border-purple-200 bg-white'}`}>
-                  <div className="flex justify-between items-center mb-2">
-                    <h4 className="font-bold text-purple-800">{symbol}</h4>
-                    <span className={`text-sm font-semibold ${data.change >= 0 ? 'text-green-600' : 'text-red-600'}`}>
-                      {data.change >= 0 ? '+' : ''}{data.changePercent}%
-                    </span>
+            <div className="flex flex-wrap items-center justify-between gap-4 mb-3">
+              <h3 className="text-lg font-bold text-purple-800">🏆 Comparative Market Analysis</h3>
+              <div className="flex gap-1">
+                {SCREEN_METRICS.map(metric => (
+                  <button
+                    key={metric}
+                    onClick={() => setScreenMetric(metric)}
+                    className={`px-3 py-1 rounded-lg text-sm ${metric === screenMetric ? 'bg-purple-600 text-white' : 'bg-white text-purple-700 hover:bg-purple-200'}`}
+                  >
+                    {METRIC_LABELS[metric]}
+                  </button>
+                ))}
+              </div>
+            </div>
+            {screen && (() => {
+              // Sorted indexes over the whole universe (screener.js): only the
+              // leaders, the laggards and the selected symbol's standing render
+              const standing = percentileOf(screen, screenMetric, selectedStock);
+              const peers = peerGroup(screen, screenMetric, selectedStock);
+              const ranked = screen.universe[screenMetric].order;
+              const leaders = topK(screen, screenMetric, COMPARISON_COUNT).map(({ symbol }) => symbol);
+              // A small universe has the same symbols at both ends; show each once
+              const laggards = bottomK(screen, screenMetric, COMPARISON_COUNT)
+                .map(({ symbol }) => symbol)
+                .filter(symbol => !leaders.includes(symbol));
+              const card = (symbol) => {
+                const data = store.meta(symbol);
+                return (
+                  <div key={symbol} className={`p-4 rounded-lg border-2 ${selectedStock === symbol ? 'border-purple-400 bg-purple-100' : 'border-purple-200 bg-white'}`}>
+                    <div className="flex justify-between items-center mb-2">
+                      <h4 className="font-bold text-purple-800">{symbol}</h4>
+                      <span className={`text-sm font-semibold ${data.change >= 0 ? 'text-green-600' : 'text-red-600'}`}>
+                        {data.change >= 0 ? '+' : ''}{data.changePercent}%
+                      </span>
+                    </div>
+                    <p className="text-sm text-purple-700 mb-1">${data.current}</p>
+                    <div className="text-xs text-purple-600">
+                      <p>Vol: {(data.volume / 1000000).toFixed(1)}M</p>
+                      <p>Cap: {formatMetric('marketCap', data.marketCap)}</p>
+                    </div>
+                    {selectedStock === symbol && (
+                      <div className="mt-2 text-xs text-purple-800 font-medium">
+                        👑 Currently Analyzing
+                      </div>
+                    )}
                   </div>
-                  <p className="text-sm text-purple-700 mb-1">${data.current}</p>
-                  <div className="text-xs text-purple-600">
-                    <p>Vol: {(data.volume / 1000000).toFixed(1)}M</p>
-                    <p>Cap: ${(data.marketCap / 1000000000000).toFixed(2)}T</p>
+                );
+              };
+
+              return (
+                <>
+                  {standing && (
+                    <p className="text-sm text-purple-700 mb-3">
+                      <strong>{selectedStock}</strong> ranks #{standing.rank} of {standing.count} by {METRIC_LABELS[screenMetric].toLowerCase()} ({standing.percentile.toFixed(0)}th percentile)
+                      {peers.standing && `, #${peers.standing.rank} of ${peers.standing.count} in ${peers.group}`}
+                    </p>
+                  )}
+                  <div className="grid grid-cols-1 md:grid-cols-3 gap-4">
+                    {leaders.map(card)}
                   </div>
-                  {selectedStock === symbol && (
-                    <div className="mt-2 text-xs text-purple-800 font-medium">
-                      👑 Currently Analyzing
-                    </div>
+                  {laggards.length > 0 && (
+                    <>
+                      <h4 className="font-semibold text-purple-800 mt-4 mb-2">Laggards</h4>
+                      <div className="grid grid-cols-1 md:grid-cols-3 gap-4">
+                        {laggards.map(card)}
+                      </div>
+                    </>
                   )}
-                </div>
-              ))}
-            </div>
+                  {ranked.length > leaders.length + laggards.length && (
+                    <>
+                      <h4 className="font-semibold text-purple-800 mt-4 mb-2">All {ranked.length} symbols by {METRIC_LABELS[screenMetric].toLowerCase()}</h4>
+                      {/* Windowed: only the rows scrolled into view are mounted */}
+                      <VirtualList
+                        itemCount={ranked.length}
+                        rowHeight={RANKING_ROW_HEIGHT}
+                        height={RANKING_HEIGHT}
+                        className="bg-white rounded-lg border border-purple-200"
+                        renderRow={(index, style) => {
+                          // Highest first
+                          const i = ranked[ranked.length - 1 - index];
+                          const symbol = screen.symbols[i];
+                          return (
+                            <div
+                              key={symbol}
+                              style={style}
+                              onClick={() => handleStockChange(symbol)}
+                              className={`px-4 flex items-center gap-3 text-sm cursor-pointer hover:bg-purple-50 ${symbol === selectedStock ? 'bg-purple-100 font-semibold' : ''}`}
+                            >
+                              <span className="w-12 text-purple-400">#{index + 1}</span>
+                              <span className="w-16 text-purple-800">{symbol}</span>
+                              <span className="flex-1 truncate text-purple-700">{store.meta(symbol).name}</span>
+                              <span className="text-purple-800">{formatMetric(screenMetric, screen.values[screenMetric][i])}</span>
+                            </div>
+                          );
+                        }}
+                      />
+                    </>
+                  )}
+                </>
+              );
+            })()}
             <div className="mt-4 p-4 bg-white rounded-lg">
               <p className="text-sm text-purple-700">
                 <strong>Cross-Stock Insight:</strong> {
                   (() => {
-                    const allStocks = Object.values(stockData);
-                    const avgChange = allStocks.reduce((sum, stock) => sum + stock.changePercent, 0) / allStocks.length;
+                    // Mean daily change across the universe, from the screen
+                    const avgChange = screen ? screen.avgChange : currentStock.changePercent;
                     const currentPerformance = currentStock.changePercent;
                     
                     if (currentPerformance > avgChange + 1) {
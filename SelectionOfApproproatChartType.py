@@ -1,9 +1,12 @@
-import React, { useState } from 'react';
+import React, { useMemo, useState } from 'react';
 import { LineChart, Line, XAxis, YAxis, CartesianGrid, Tooltip, Legend, ResponsiveContainer, AreaChart, Area, BarChart, Bar, ScatterChart, Scatter, PieChart, Pie, Cell, CandlestickChart, RadialBarChart, RadialBar } from 'recharts';
 import { TrendingUp, TrendingDown, BarChart3, PieChart, Activity, Zap } from 'lucide-react';
+import CanvasCandlestickChart from './src/js/charts/CanvasCandlestickChart';
+import { GridIndex, PLOT_MARGIN, X_AXIS_HEIGHT, Y_AXIS_WIDTH } from './src/js/utils/hitTest';
 
 const ChartSelectionGuide = () => {
   const [activeChart, setActiveChart] = useState('line');
+  const [hoveredPoint, setHoveredPoint] = useState(null);
 
   // Sample data for different chart types
   const priceData = [
@@ -47,6 +50,20 @@ const ChartSelectionGuide = () => {
     { stock1: 189.47, stock2: 138.21, name: 'May' }
   ];
 
+  // Grid index for scatter hover lookups, built once instead of scanning per mouse move
+  const correlationIndex = useMemo(() => new GridIndex(
+    Float64Array.from(correlationData, d => d.stock1),
+    Float64Array.from(correlationData, d => d.stock2)
+  ), []); // eslint-disable-line react-hooks/exhaustive-deps
+
+  const handleScatterHover = (event) => {
+    const rect = event.currentTarget.getBoundingClientRect();
+    const x = event.clientX - rect.left;
+    const y = event.clientY - rect.top;
+    const hit = correlationIndex.hitTest(x, y, rect.width, rect.height);
+    setHoveredPoint(hit < 0 ? null : { index: hit, x, y });
+  };
+
   const performanceData = [
     { stock: 'AAPL', performance: 8.1, fill: '#3B82F6' },
     { stock: 'GOOGL', performance: -2.9, fill: '#EF4444' },
@@ -114,42 +131,9 @@ const ChartSelectionGuide = () => {
     }
   ];
 
-  const CustomCandlestick = ({ data }) => {
-    return (
-      <ResponsiveContainer width="100%" height={300}>
-        <BarChart data={data}>
-          <CartesianGrid strokeDasharray="3 3" stroke="#374151" />
-          <XAxis dataKey="date" stroke="#9CA3AF" />
-          <YAxis stroke="#9CA3AF" />
-          <Tooltip 
-            content={({ active, payload, label }) => {
-              if (active && payload && payload.length) {
-                const data = payload[0].payload;
-                return (
-                  <div className="bg-gray-900 p-3 rounded-lg border border-gray-700">
-                    <p className="text-gray-300">{label}</p>
-                    <p className="text-white">Open: ${data.open}</p>
-                    <p className="text-white">High: ${data.high}</p>
-                    <p className="text-white">Low: ${data.low}</p>
-                    <p className="text-white">Close: ${data.close}</p>
-                  </div>
-                );
-              }
-              return null;
-            }}
-          />
-          {data.map((entry, index) => (
-            <Bar 
-              key={index} 
-              x={index * 100} 
-              width={20} 
-              fill={entry.close > entry.open ? '#10B981' : '#EF4444'} 
-            />
-          ))}
-        </BarChart>
-      </ResponsiveContainer>
-    );
-  };
+  const CustomCandlestick = ({ data }) => (
+    <CanvasCandlestickChart data={data} height={300} />
+  );
 
   const renderChart = () => {
     switch(activeChart) {
@@ -229,64 +213,7 @@ const ChartSelectionGuide = () => {
                 Essential for technical analysis, showing market sentiment and identifying reversal patterns.
               </p>
             </div>
-            <ResponsiveContainer width="100%" height={400}>
-              <BarChart data={candlestickData} margin={{ top: 20, right: 30, left: 20, bottom: 5 }}>
-                <CartesianGrid strokeDasharray="3 3" stroke="#374151" />
-                <XAxis dataKey="date" stroke="#9CA3AF" />
-                <YAxis stroke="#9CA3AF" />
-                <Tooltip 
-                  content={({ active, payload, label }) => {
-                    if (active && payload && payload.length) {
-                      const data = payload[0].payload;
-                      const isGreen = data.close > data.open;
-                      return (
-                        <div className="bg-gray-900 p-3 rounded-lg border border-gray-700">
-                          <p className="text-gray-300 mb-2">{label}</p>
-                          <div className="space-y-1">
-                            <p className="text-white">Open: ${data.open}</p>
-                            <p className="text-white">High: ${data.high}</p>
-                            <p className="text-white">Low: ${data.low}</p>
-                            <p className={`font-semibold ${isGreen ? 'text-green-400' : 'text-red-400'}`}>
-                              Close: ${data.close}
-                            </p>
-                          </div>
-                        </div>
-                      );
-                    }
-                    return null;
-                  }}
-                />
-                <Bar dataKey="high" fill="transparent" />
-                {candlestickData.map((entry, index) => {
-                  const isGreen = entry.close > entry.open;
-                  const bodyHeight = Math.abs(entry.close - entry.open);
-                  const bodyY = Math.max(entry.open, entry.close);
-                  
-                  return (
-                    <g key={index}>
-                      {/* Wick lines */}
-                      <line
-                        x1={50 + index * 100}
-                        y1={400 - (entry.high - 160) * 2}
-                        x2={50 + index * 100}
-                        y2={400 - (entry.low - 160) * 2}
-                        stroke={isGreen ? '#10B981' : '#EF4444'}
-                        strokeWidth={1}
-                      />
-                      {/* Body rectangle */}
-                      <rect
-                        x={35 + index * 100}
-                        y={400 - (bodyY - 160) * 2}
-                        width={30}
-                        height={bodyHeight * 2}
-                        fill={isGreen ? '#10B981' : '#EF4444'}
-                        fillOpacity={0.8}
-                      />
-                    </g>
-                  );
-                })}
-              </BarChart>
-            </ResponsiveContainer>
+            <CanvasCandlestickChart data={candlestickData} height={400} />
           </div>
         );
 
@@ -364,31 +291,42 @@ const ChartSelectionGuide = () => {
                 between stocks, risk vs return analysis, or identifying outliers in the data.
               </p>
             </div>
-            <ResponsiveContainer width="100%" height={400}>
-              <ScatterChart data={correlationData}>
-                <CartesianGrid strokeDasharray="3 3" stroke="#374151" />
-                <XAxis 
-                  type="number" 
-                  dataKey="stock1" 
-                  name="AAPL Price" 
-                  stroke="#9CA3AF"
-                  domain={['dataMin', 'dataMax']}
-                />
-                <YAxis 
-                  type="number" 
-                  dataKey="stock2" 
-                  name="GOOGL Price" 
-                  stroke="#9CA3AF"
-                  domain={['dataMin', 'dataMax']}
-                />
-                <Tooltip 
-                  cursor={{ strokeDasharray: '3 3' }}
-                  contentStyle={{ backgroundColor: '#1F2937', border: '1px solid #374151' }}
-                  formatter={(value, name) => [value, name === 'stock1' ? 'AAPL' : 'GOOGL']}
-                />
-                <Scatter dataKey="stock2" fill="#3B82F6" />
-              </ScatterChart>
-            </ResponsiveContainer>
+            <div className="relative" onMouseMove={handleScatterHover} onMouseLeave={() => setHoveredPoint(null)}>
+              <ResponsiveContainer width="100%" height={400}>
+                <ScatterChart data={correlationData} margin={PLOT_MARGIN}>
+                  <CartesianGrid strokeDasharray="3 3" stroke="#374151" />
+                  <XAxis 
+                    type="number" 
+                    dataKey="stock1" 
+                    name="AAPL Price" 
+                    stroke="#9CA3AF"
+                    domain={correlationIndex.domainX}
+                    allowDataOverflow
+                    height={X_AXIS_HEIGHT}
+                  />
+                  <YAxis 
+                    type="number" 
+                    dataKey="stock2" 
+                    name="GOOGL Price" 
+                    stroke="#9CA3AF"
+                    domain={correlationIndex.domainY}
+                    allowDataOverflow
+                    width={Y_AXIS_WIDTH}
+                  />
+                  <Scatter dataKey="stock2" fill="#3B82F6" />
+                </ScatterChart>
+              </ResponsiveContainer>
+              {hoveredPoint && (
+                <div
+                  className="absolute pointer-events-none p-3 rounded-lg"
+                  style={{ left: hoveredPoint.x + 12, top: hoveredPoint.y + 12, backgroundColor: '#1F2937', border: '1px solid #374151' }}
+                >
+                  <p className="text-gray-400">{correlationData[hoveredPoint.index].name}</p>
+                  <p className="text-white">AAPL: {correlationData[hoveredPoint.index].stock1}</p>
+                  <p className="text-white">GOOGL: {correlationData[hoveredPoint.index].stock2}</p>
+                </div>
+              )}
+            </div>
           </div>
         );
 
@@ -0,0 +1,110 @@
+"""Build daily OHLCV bars from recorded trades for the processed store.
+
+Reads tick CSVs (``Timestamp``, ``Symbol``, ``Price`` and optional ``Size``
+columns, see ``sample/ticks.csv``) in chunks, aggregates each symbol's daily
+bars with ``pipeline/bars.py`` and appends them to a raw CSV (``Date``,
+``Symbol``, ``Open``, ``High``, ``Low``, ``Close``, ``Volume``) in the raw
+directory, which the next ``process_data.py`` run appends to the columnar
+store like any other raw export. Days the output already holds for a symbol
+are skipped, so the file only grows and stays an incremental input.
+
+Usage::
+
+    cd data/
+    python aggregate_ticks.py sample/ticks.csv [--watermark 5] [--out raw/ticks.csv]
+    python process_data.py
+"""
+
+from __future__ import annotations
+
+import argparse
+import csv
+import os
+
+import numpy as np
+import pandas as pd
+
+from pipeline.bars import BarAggregator, to_records
+
+CHUNK_ROWS = 1_000_000
+
+RAW_COLUMNS = ("Date", "Symbol", "Open", "High", "Low", "Close", "Volume")
+
+
+def epoch_seconds(values: pd.Series) -> np.ndarray:
+    """Epoch seconds from numeric or ISO 8601 timestamps (naive means UTC)."""
+    if pd.api.types.is_numeric_dtype(values):
+        return values.to_numpy(np.float64)
+    stamps = pd.to_datetime(values, utc=True)
+    return stamps.to_numpy("datetime64[ns]").astype(np.int64) / 1e9
+
+
+def aggregate_files(paths: list[str], watermark: float) -> dict[str, list[dict]]:
+    """Daily bars of every symbol in the tick files ``paths``, as ``priceHistory`` rows."""
+    aggregators: dict[str, BarAggregator] = {}
+    bars: dict[str, list[dict]] = {}
+    late = 0
+    for path in paths:
+        for chunk in pd.read_csv(path, chunksize=CHUNK_ROWS):
+            size = chunk["Size"] if "Size" in chunk else pd.Series(0.0, index=chunk.index)
+            ticks = pd.DataFrame({
+                "symbol": chunk["Symbol"],
+                "timestamp": epoch_seconds(chunk["Timestamp"]),
+                "price": chunk["Price"].to_numpy(np.float64),
+                "size": size.fillna(0).to_numpy(np.float64),
+            })
+            for symbol, group in ticks.groupby("symbol", sort=False):
+                aggregator = aggregators.setdefault(symbol, BarAggregator("1d", watermark))
+                closed = aggregator.push(group["timestamp"], group["price"], group["size"])
+                bars.setdefault(symbol, []).extend(to_records(closed, "1d"))
+    for symbol, aggregator in aggregators.items():
+        bars[symbol].extend(to_records(aggregator.flush(), "1d"))
+        late += aggregator.late
+    if late:
+        print(f"dropped {late} ticks older than the {watermark}s watermark")
+    return bars
+
+
+def _last_days(path: str) -> dict[str, str]:
+    """Latest ``Date`` per symbol already in the raw CSV at ``path``."""
+    if not os.path.exists(path) or os.path.getsize(path) == 0:
+        return {}
+    frame = pd.read_csv(path, usecols=["Date", "Symbol"], dtype=str)
+    return frame.groupby("Symbol")["Date"].max().to_dict()
+
+
+def append_raw(bars: dict[str, list[dict]], path: str) -> int:
+    """Append the bars newer than ``path`` holds for their symbol; returns the rows written."""
+    last = _last_days(path)
+    rows = [
+        (bar["date"], symbol, bar["open"], bar["high"], bar["low"], bar["close"], bar["volume"])
+        for symbol, history in bars.items()
+        for bar in history
+        if bar["date"] > last.get(symbol, "")
+    ]
+    new_file = not os.path.exists(path) or os.path.getsize(path) == 0
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(path, "a", newline="") as handle:
+        writer = csv.writer(handle)
+        if new_file:
+            writer.writerow(RAW_COLUMNS)
+        writer.writerows(sorted(rows))
+    return len(rows)
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("ticks", nargs="+", help="tick CSV files, read in order")
+    parser.add_argument("--watermark", type=float, default=0.0,
+                        help="seconds an out-of-order tick may lag the newest one")
+    parser.add_argument("--out", default=os.path.join("raw", "ticks.csv"),
+                        help="raw CSV the daily bars are appended to (read by process_data.py)")
+    args = parser.parse_args(argv)
+
+    bars = aggregate_files(args.ticks, args.watermark)
+    written = append_raw(bars, args.out)
+    print(f"appended {written} daily bars for {len(bars)} symbols to {args.out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+"""Backtest the dashboard's signal strategies over the processed store.
+
+Sweeps parameter grids of the strategies in ``pipeline/backtest.py`` (MA and
+MACD crossovers, the momentum and value plays of the Predictive Insights
+panel) across every symbol at once, on a process pool, and writes one CSV row
+per parameter set with its Sharpe ratio, CAGR, maximum drawdown and turnover.
+The best sets are printed next to an equal-weight buy-and-hold benchmark.
+
+Grids default to ``DEFAULT_GRIDS``; ``--range`` overrides one parameter with
+``name=start:stop:step`` (stop exclusive) or a comma-separated list; a name
+that none of the chosen strategies takes is an error.
+
+Usage::
+
+    cd data/
+    python backtest.py [--store processed/ohlcv.bin] [--strategy ma_cross ...]
+                       [--range fast=5:60:5 ...] [--cost-bps 5] [--jobs N] [--out backtest.csv]
+"""
+
+from __future__ import annotations
+
+import argparse
+import csv
+import os
+import time
+
+import numpy as np
+
+from pipeline.backtest import DEFAULT_GRIDS, METRICS, STRATEGIES, Panel, buy_and_hold, parameter_grid, run_grid
+
+TOP = 10
+
+# Parameters that are lengths in bars: positive integers
+WINDOW_PARAMS = ("fast", "slow", "signal", "lookback")
+
+
+def parse_range(spec: str) -> tuple[str, list[float]]:
+    """``fast=5:60:5`` or ``threshold=1,2.5,4`` -> ``(name, values)``.
+
+    Values of the :data:`WINDOW_PARAMS` must be positive integers and are
+    returned as ``int``.
+    """
+    name, _, values = spec.partition("=")
+    if not name or not values:
+        raise argparse.ArgumentTypeError(f"expected name=values, got {spec!r}")
+    try:
+        if ":" in values:
+            start, stop, *step = (float(v) for v in values.split(":"))
+            values = np.arange(start, stop, step[0] if step else 1.0).tolist()
+        else:
+            values = [float(v) for v in values.split(",")]
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected numbers in {spec!r}") from None
+    if not values:
+        raise argparse.ArgumentTypeError(f"{spec!r} has no values")
+    if name in WINDOW_PARAMS:
+        bad = [v for v in values if v <= 0 or not float(v).is_integer()]
+        if bad:
+            raise argparse.ArgumentTypeError(
+                f"{name} is a window length in bars and must be a positive integer, got {bad[0]:g}")
+        values = [int(v) for v in values]
+    return name, values
+
+
+def _format_params(params: dict) -> str:
+    return " ".join(f"{name}={value:g}" for name, value in params.items())
+
+
+def write_results(path: str, rows: list[dict]) -> None:
+    with open(path, "w", newline="") as handle:
+        writer = csv.writer(handle)
+        writer.writerow(["strategy", "params", *METRICS])
+        for row in rows:
+            writer.writerow([row["strategy"], _format_params(row["params"]), *(f"{row[m]:.6g}" for m in METRICS)])
+
+
+def _summary(label: str, metrics: dict) -> str:
+    return (f"{label:<40} sharpe {metrics['sharpe']:6.2f}  cagr {metrics['cagr']:7.2%}  "
+            f"maxDD {metrics['max_drawdown']:7.2%}  turnover {metrics['turnover']:6.1f}/yr")
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--store", default=os.path.join("processed", "ohlcv.bin"), help="processed columnar store")
+    parser.add_argument("--strategy", nargs="+", choices=STRATEGIES, default=list(STRATEGIES),
+                        help="strategies to sweep (default: all)")
+    parser.add_argument("--range", dest="ranges", action="append", type=parse_range, default=[],
+                        help="override one parameter's values, e.g. slow=50:250:10")
+    parser.add_argument("--symbols", nargs="+", help="restrict the universe (default: every symbol)")
+    parser.add_argument("--cost-bps", type=float, default=0.0, help="cost per unit traded, in basis points")
+    parser.add_argument("--jobs", type=int, default=os.cpu_count(), help="worker processes (default: all cores)")
+    parser.add_argument("--out", default="backtest.csv", help="output CSV path")
+    args = parser.parse_args(argv)
+
+    overrides = dict(args.ranges)
+    known = {name for strategy in args.strategy for name in DEFAULT_GRIDS[strategy]}
+    unknown = sorted(set(overrides) - known)
+    if unknown:
+        parser.error(f"--range: no parameter {', '.join(unknown)} in {', '.join(args.strategy)} "
+                     f"(parameters: {', '.join(sorted(known))})")
+    jobs = []
+    for strategy in args.strategy:
+        grid = DEFAULT_GRIDS[strategy]
+        ranges = {name: overrides.get(name, values) for name, values in grid.items()}
+        jobs.extend((strategy, params) for params in parameter_grid(strategy, ranges))
+    cost = args.cost_bps / 10_000
+
+    started = time.perf_counter()
+    rows = run_grid(args.store, jobs, args.jobs, cost, args.symbols)
+    elapsed = time.perf_counter() - started
+    rows.sort(key=lambda row: row["sharpe"], reverse=True)
+    write_results(args.out, rows)
+
+    panel = Panel.from_store(args.store, args.symbols)
+    print(f"{len(jobs)} parameter sets over {len(panel.symbols)} symbols x {len(panel.days)} days "
+          f"in {elapsed:.1f}s -> {args.out}")
+    print(_summary("buy and hold", buy_and_hold(panel, cost)))
+    for row in rows[:TOP]:
+        print(_summary(f"{row['strategy']} {_format_params(row['params'])}", row))
+
+
+if __name__ == "__main__":
+    main()
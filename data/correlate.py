@@ -0,0 +1,176 @@
+"""Build the correlation network from the processed store.
+
+Computes the rolling ``--window``-day return correlation of every pair of
+symbols (see ``pipeline/correlation.py``) as of the store's last trading day
+and writes the pairs with ``|correlation| >= --threshold`` to
+``processed/correlation.json`` for the network view
+(``src/js/utils/correlationNetwork.js``)::
+
+    {"version": 2, "asOf": "2024-01-08", "window": 60, "threshold": 0.5,
+     "symbols": [...], "sectors": [...],
+     "edges": {"source": [...], "target": [...], "correlation": [...]},
+     "layouts": [{"threshold": 0.5, "x": [...], "y": [...], "cluster": [...]}, ...]}
+
+Edges are sorted by descending absolute correlation, so any stricter
+threshold is a prefix. For each of ``--layout-thresholds`` the network view
+also gets a precomputed force-directed layout and the cluster of every
+symbol (see ``pipeline/layout.py``); each layout starts from the previous
+one, and the first from the last run's, so nodes stay put between runs.
+
+The window's cross products are kept in ``processed/correlation_state.npz``;
+when the store has only gained days since (e.g. after an incremental
+``process_data.py`` run) the window slides over the new days instead of being
+recomputed.
+
+Usage::
+
+    cd data/
+    python correlate.py [--store processed/ohlcv.bin] [--window 60] [--threshold 0.5]
+                        [--layout-thresholds 0.5 0.6 0.7 0.8] [--full]
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+
+import numpy as np
+
+from pipeline.columnar import ColumnarStore, from_epoch_days
+from pipeline.correlation import BLOCK, DEFAULT_THRESHOLD, DEFAULT_WINDOW, RollingCorrelation
+from pipeline.layout import ITERATIONS, force_layout, initial_positions, threshold_clusters
+
+NETWORK_NAME = "correlation.json"
+STATE_NAME = "correlation_state.npz"
+NETWORK_VERSION = 2
+LAYOUT_THRESHOLDS = (0.5, 0.6, 0.7, 0.8)
+# Iterations of a layout that starts from an earlier one
+REFINE_ITERATIONS = ITERATIONS // 3
+
+
+def daily_returns(close: np.ndarray) -> np.ndarray:
+    """Close-to-close returns of ``(symbols, days)`` closes; NaN unless both days traded."""
+    returns = np.full(close.shape, np.nan)
+    returns[:, 1:] = close[:, 1:] / close[:, :-1] - 1.0
+    return returns
+
+
+def _resume(state_path: str, symbols: list[str], days: np.ndarray, returns: np.ndarray,
+            window: int, block: int) -> RollingCorrelation | None:
+    """The saved window slid forward to ``days[-1]``, or ``None`` if it cannot be reused."""
+    try:
+        state = np.load(state_path)
+    except (OSError, ValueError):
+        return None
+    if list(state["symbols"]) != symbols or int(state["window"]) != window:
+        return None
+    last = np.searchsorted(days, state["last_day"])
+    if last >= len(days) or days[last] != state["last_day"]:
+        return None
+    # The saved window must still match the store (no backfilled or edited bars)
+    if not np.array_equal(state["returns"], returns[:, last + 1 - window:last + 1], equal_nan=True):
+        return None
+    rolling = RollingCorrelation.from_state(state["returns"], state["sums"], state["cross"], block)
+    rolling.push(returns[:, last + 1:])
+    return rolling
+
+
+def _save_state(state_path: str, symbols: list[str], last_day: int, rolling: RollingCorrelation) -> None:
+    tmp = f"{state_path}.tmp.npz"
+    np.savez(tmp, symbols=np.array(symbols), window=rolling.window, last_day=last_day,
+             returns=rolling.returns, sums=rolling.sums, cross=rolling.cross)
+    os.replace(tmp, state_path)
+
+
+def _previous_layout(path: str, symbols: list[str]) -> np.ndarray | None:
+    try:
+        with open(path) as handle:
+            previous = json.load(handle)
+    except (OSError, ValueError):
+        return None
+    if previous.get("version") != NETWORK_VERSION or previous["symbols"] != symbols or not previous["layouts"]:
+        return None
+    first = previous["layouts"][0]
+    return np.stack([first["x"], first["y"]], axis=1)
+
+
+def layouts(source: np.ndarray, target: np.ndarray, value: np.ndarray, sectors: list,
+            thresholds: list[float], seed: np.ndarray | None = None) -> list[dict]:
+    """Layout and clusters of the edges at or above each threshold, each seeded by the last."""
+    n = len(sectors)
+    clusters = threshold_clusters(n, source, target, value, thresholds)
+    pos = initial_positions(sectors) if seed is None else seed
+    iterations = ITERATIONS if seed is None else REFINE_ITERATIONS
+    result = []
+    for threshold, cluster in zip(thresholds, clusters):
+        keep = value >= threshold
+        pos = force_layout(source[keep], target[keep], value[keep], pos, iterations)
+        iterations = REFINE_ITERATIONS
+        result.append({
+            "threshold": threshold,
+            "x": np.round(pos[:, 0], 3).tolist(),
+            "y": np.round(pos[:, 1], 3).tolist(),
+            "cluster": cluster.tolist(),
+        })
+    return result
+
+
+def build_network(store_path: str, window: int, threshold: float, layout_thresholds: list[float],
+                  full: bool = False, block: int = BLOCK) -> dict:
+    store = ColumnarStore(store_path)
+    symbols = store.symbols
+    days, close = store.aligned("close", symbols)
+    returns = daily_returns(close)
+    out_dir = os.path.dirname(store_path)
+    state_path = os.path.join(out_dir, STATE_NAME)
+
+    rolling = None if full else _resume(state_path, symbols, days, returns, window, block)
+    if rolling is None:
+        rolling = RollingCorrelation(returns, window, block)
+    _save_state(state_path, symbols, int(days[-1]), rolling)
+
+    source, target, value = rolling.edges(threshold)
+    order = np.argsort(-np.abs(value), kind="stable")
+    source, target, value = source[order], target[order], value[order]
+    sectors = [store.meta(symbol).get("sector") for symbol in symbols]
+    thresholds = sorted({threshold, *(t for t in layout_thresholds if t >= threshold)})
+    seed = None if full else _previous_layout(os.path.join(out_dir, NETWORK_NAME), symbols)
+    return {
+        "version": NETWORK_VERSION,
+        "asOf": str(from_epoch_days(days[-1:])[0]),
+        "window": window,
+        "threshold": threshold,
+        "symbols": symbols,
+        "sectors": sectors,
+        "edges": {
+            "source": source.tolist(),
+            "target": target.tolist(),
+            "correlation": np.round(value, 4).tolist(),
+        },
+        "layouts": layouts(source, target, value, sectors, thresholds, seed),
+    }
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--store", default=os.path.join("processed", "ohlcv.bin"), help="processed columnar store")
+    parser.add_argument("--window", type=int, default=DEFAULT_WINDOW, help="trailing days of returns")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="minimum absolute correlation kept as an edge")
+    parser.add_argument("--layout-thresholds", type=float, nargs="+", default=list(LAYOUT_THRESHOLDS),
+                        help="thresholds to precompute layouts and clusters for")
+    parser.add_argument("--full", action="store_true", help="ignore the saved window and layout and recompute them")
+    args = parser.parse_args(argv)
+
+    network = build_network(args.store, args.window, args.threshold, args.layout_thresholds, args.full)
+    path = os.path.join(os.path.dirname(args.store), NETWORK_NAME)
+    tmp = f"{path}.tmp"
+    with open(tmp, "w") as handle:
+        json.dump(network, handle, separators=(",", ":"))
+    os.replace(tmp, path)
+    print(f"wrote {len(network['edges']['source'])} edges between {len(network['symbols'])} symbols to {path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,34 @@
+"""Export the processed store as Apache Arrow IPC streams.
+
+Writes ``processed/arrow/1d.arrows``, ``1w.arrows`` and ``1mo.arrows`` (see
+``pipeline/arrow.py``): the bars and daily indicators of every symbol as Arrow
+tables, for pandas, polars, DuckDB or any other Arrow reader, and for
+dashboards that load them with ``loadArrowStore`` (``src/js/utils/arrowStore.js``).
+
+Usage::
+
+    cd data/
+    python export_arrow.py [--store processed/ohlcv.bin] [--out processed/arrow]
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+
+from pipeline.arrow import export_arrow
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--store", default=os.path.join("processed", "ohlcv.bin"), help="processed columnar store")
+    parser.add_argument("--out", default=None, help="output directory (default: arrow/ next to the store)")
+    args = parser.parse_args(argv)
+
+    out_dir = args.out or os.path.join(os.path.dirname(args.store), "arrow")
+    rows = export_arrow(args.store, out_dir)
+    print(", ".join(f"{resolution}: {count} rows" for resolution, count in rows.items()) + f" to {out_dir}")
+
+
+if __name__ == "__main__":
+    main()
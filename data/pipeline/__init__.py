@@ -0,0 +1 @@
+"""Preprocessing pipeline that turns ``data/raw`` into the ``data/processed`` store."""
@@ -0,0 +1,109 @@
+"""Apache Arrow IPC export of the processed store.
+
+Writes one Arrow IPC stream per bar resolution (``1d.arrows``, ``1w.arrows``,
+``1mo.arrows``) holding the same bars as the columnar store: a
+dictionary-encoded ``symbol`` column, ``date`` as ``date32`` (epoch days,
+like the store), the OHLCV :data:`~pipeline.columnar.FIELDS` and any derived
+columns (the daily indicators), NaN where a symbol lacks one. Each symbol is
+one record batch, so a reader can take a symbol's bars as zero-copy views of
+one batch's buffers; ``pyarrow.ipc.open_stream(path).read_pandas()`` gives
+the long table.
+
+The schema metadata key ``ohlcv`` carries the JSON the dashboard needs to
+rebuild its store (``src/js/utils/arrowStore.js``)::
+
+    {"version": 1, "resolution": "1d", "symbols": [...],
+     "dictionaries": {...}, "meta": {"AAPL": {...}, ...}}
+
+``symbols`` lists the batches in order and ``meta`` is encoded against
+``dictionaries`` exactly as in the columnar store header.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+
+import numpy as np
+import pyarrow as pa
+
+from pipeline.columnar import FIELDS, PRICE_FIELDS, ColumnarStore, public_meta
+
+ARROW_VERSION = 1
+METADATA_KEY = b"ohlcv"
+RESOLUTIONS = ("1d", "1w", "1mo")
+
+
+def stream_name(resolution: str) -> str:
+    return f"{resolution}.arrows"
+
+
+def _schema(store: ColumnarStore, symbols: list[str], resolution: str) -> pa.Schema:
+    """Schema covering every symbol's columns at ``resolution``."""
+    derived = {}
+    wide_volume = False
+    for symbol in symbols:
+        columns = store.series(symbol, resolution)
+        wide_volume |= columns["volume"].dtype != np.uint32
+        for field, values in columns.items():
+            if field not in FIELDS:
+                derived.setdefault(field, values.dtype)
+    fields = [
+        pa.field("symbol", pa.dictionary(pa.int32(), pa.string()), nullable=False),
+        pa.field("date", pa.date32(), nullable=False),
+        *(pa.field(field, pa.float64(), nullable=False) for field in PRICE_FIELDS),
+        pa.field("volume", pa.float64() if wide_volume else pa.uint32(), nullable=False),
+        *(pa.field(field, pa.from_numpy_dtype(dtype)) for field, dtype in derived.items()),
+    ]
+    metadata = {
+        "version": ARROW_VERSION,
+        "resolution": resolution,
+        "symbols": symbols,
+        "dictionaries": store.dictionaries,
+        "meta": {symbol: public_meta(store.encoded_meta(symbol)) for symbol in symbols},
+    }
+    return pa.schema(fields, metadata={METADATA_KEY: json.dumps(metadata, separators=(",", ":"))})
+
+
+def _batch(store: ColumnarStore, schema: pa.Schema, names: pa.Array, code: int,
+           symbol: str, resolution: str) -> pa.RecordBatch:
+    """``symbol``'s bars as one batch; store columns are wrapped, not copied, where the types agree."""
+    columns = store.series(symbol, resolution)
+    rows = len(columns["date"])
+    arrays = [
+        pa.DictionaryArray.from_arrays(pa.array(np.full(rows, code, dtype=np.int32)), names),
+        pa.Array.from_buffers(pa.date32(), rows, [None, pa.py_buffer(columns["date"])]),
+    ]
+    for field in schema.names[2:]:
+        dtype = schema.field(field).type.to_pandas_dtype()
+        values = columns.get(field)
+        if values is None:
+            values = np.full(rows, np.nan, dtype=dtype)
+        arrays.append(pa.array(np.asarray(values, dtype=dtype)))
+    return pa.RecordBatch.from_arrays(arrays, schema=schema)
+
+
+def write_stream(store: ColumnarStore, path: str | os.PathLike, resolution: str) -> int:
+    """Write the ``resolution`` bars of every symbol in ``store`` to ``path`` atomically; returns the rows."""
+    symbols = [symbol for symbol in store.symbols if resolution in store.resolutions(symbol)]
+    schema = _schema(store, symbols, resolution)
+    names = pa.array(symbols, type=pa.string())
+    rows = 0
+    tmp = f"{os.fspath(path)}.tmp"
+    with pa.OSFile(tmp, "wb") as sink, pa.ipc.new_stream(sink, schema) as writer:
+        for code, symbol in enumerate(symbols):
+            batch = _batch(store, schema, names, code, symbol, resolution)
+            writer.write_batch(batch)
+            rows += batch.num_rows
+    os.replace(tmp, path)
+    return rows
+
+
+def export_arrow(store_path: str | os.PathLike, out_dir: str | os.PathLike) -> dict[str, int]:
+    """Write a stream per resolution of the store at ``store_path`` into ``out_dir``; rows per resolution."""
+    store = ColumnarStore(store_path)
+    os.makedirs(out_dir, exist_ok=True)
+    return {
+        resolution: write_stream(store, os.path.join(out_dir, stream_name(resolution)), resolution)
+        for resolution in RESOLUTIONS
+    }
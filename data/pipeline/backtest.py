@@ -0,0 +1,239 @@
+"""Vectorised backtests of the dashboard's signal strategies.
+
+Every symbol of the processed store is aligned on one trading calendar into a
+``(symbols, days)`` :class:`Panel`. A strategy turns the panel into a position
+array of the same shape in a handful of array operations (no loop over bars or
+symbols), so each parameter set is evaluated over the whole universe at once:
+
+``ma_cross``
+    Long while the ``fast`` SMA is above the ``slow`` SMA.
+``macd_cross``
+    Long while the MACD line (``fast``/``slow`` EMAs) is above its
+    ``signal`` EMA.
+``momentum``
+    The "momentum play" of the Predictive Insights panel: enter long when the
+    ``lookback``-day change exceeds ``+threshold`` percent, exit when it falls
+    below ``-threshold``, hold in between.
+``reversal``
+    The "value play": enter after a drop below ``-threshold`` percent, exit
+    after a rise above ``+threshold``.
+
+A position decided on day ``t``'s close earns day ``t + 1``'s return, less
+``cost`` per unit traded. The portfolio holds the live symbols in equal
+weight; :func:`evaluate` reports its Sharpe ratio, compound annual return,
+maximum drawdown and annual turnover. :func:`run_grid` spreads parameter sets
+over a process pool whose workers each map the store once.
+"""
+
+from __future__ import annotations
+
+import itertools
+import os
+from collections.abc import Iterable, Iterator, Mapping
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from pipeline import indicators
+from pipeline.columnar import ColumnarStore
+
+TRADING_DAYS = indicators.TRADING_DAYS
+
+STRATEGIES = ("ma_cross", "macd_cross", "momentum", "reversal")
+
+# strategy -> parameter name -> values swept by default
+DEFAULT_GRIDS = {
+    "ma_cross": {"fast": range(5, 55, 5), "slow": range(20, 220, 10)},
+    "macd_cross": {"fast": range(6, 20, 2), "slow": range(20, 40, 2), "signal": range(5, 13, 2)},
+    "momentum": {"lookback": range(1, 21), "threshold": (1.0, 2.0, 3.0, 5.0, 8.0)},
+    "reversal": {"lookback": range(1, 21), "threshold": (1.0, 2.0, 3.0, 5.0, 8.0)},
+}
+
+METRICS = ("sharpe", "cagr", "total_return", "max_drawdown", "turnover")
+
+# Parameter sets handed to a worker at a time
+CHUNK_SIZE = 16
+
+
+class Panel:
+    """Daily closes of a universe aligned on the union of its trading days.
+
+    Closes are forward-filled across gaps and back-filled before a symbol's
+    first bar, so recursive indicators start from the first real close;
+    ``age`` (bars since listing) masks positions until an indicator has warmed
+    up and ``live`` marks the days a symbol trades.
+    """
+
+    def __init__(self, symbols: list[str], days: np.ndarray, close: np.ndarray):
+        self.symbols = symbols
+        self.days = days
+        valid = np.isfinite(close)
+        index = np.where(valid, np.arange(close.shape[1]), -1)
+        np.maximum.accumulate(index, axis=1, out=index)
+        first = valid.argmax(axis=1)
+        last = close.shape[1] - 1 - valid[:, ::-1].argmax(axis=1)
+        rows = np.arange(len(symbols))[:, None]
+        filled = close[rows, np.maximum(index, first[:, None])]
+        self.close = filled
+        columns = np.arange(close.shape[1])
+        self.live = (columns >= first[:, None]) & (columns <= last[:, None])
+        self.age = np.cumsum(valid, axis=1)
+        self.returns = np.zeros_like(filled)
+        self.returns[:, 1:] = filled[:, 1:] / filled[:, :-1] - 1.0
+        self.returns[~self.live] = 0.0
+        self._csum = np.zeros((len(symbols), close.shape[1] + 1))
+        np.cumsum(filled, axis=1, out=self._csum[:, 1:])
+        # indicator -> {parameters: (symbols, days) array}, most recently used last
+        self._memo: dict[str, dict] = {}
+
+    @classmethod
+    def from_store(cls, path: str | os.PathLike, symbols: Iterable[str] | None = None) -> Panel:
+        store = ColumnarStore(path)
+        symbols = list(store.symbols if symbols is None else symbols)
+        days, close = store.aligned("close", symbols)
+        return cls(symbols, days, close)
+
+    def sma(self, window: int) -> np.ndarray:
+        """Trailing mean from the shared cumulative sum; NaN for the first ``window - 1`` days."""
+        out = np.full(self.close.shape, np.nan)
+        out[:, window - 1:] = (self._csum[:, window:] - self._csum[:, :-window]) / window
+        return out
+
+    def _cached(self, name: str, limit: int, key: tuple, compute) -> np.ndarray:
+        """``compute()`` memoised on this panel, keeping the ``limit`` most recent results of ``name``.
+
+        Each entry is a full (symbols, days) array, so the caches stay small
+        and go away with the panel.
+        """
+        cache = self._memo.setdefault(name, {})
+        if key in cache:
+            cache[key] = cache.pop(key)
+        else:
+            cache[key] = compute()
+            if len(cache) > limit:
+                del cache[next(iter(cache))]
+        return cache[key]
+
+    def ema(self, span: int) -> np.ndarray:
+        return self._cached("ema", 12, (span,), lambda: indicators.ema(self.close, span))
+
+    def macd(self, fast: int, slow: int) -> np.ndarray:
+        return self._cached("macd", 4, (fast, slow), lambda: self.ema(fast) - self.ema(slow))
+
+    def change(self, lookback: int) -> np.ndarray:
+        """Percentage change over ``lookback`` days, like the dashboard's ``changePercent``."""
+        def compute() -> np.ndarray:
+            out = np.full(self.close.shape, np.nan)
+            out[:, lookback:] = (self.close[:, lookback:] / self.close[:, :-lookback] - 1.0) * 100
+            return out
+
+        return self._cached("change", 4, (lookback,), compute)
+
+
+def _hold(enter: np.ndarray, leave: np.ndarray) -> np.ndarray:
+    """True from an ``enter`` day until the next ``leave`` day (forward-filled)."""
+    event = enter | leave
+    index = np.where(event, np.arange(event.shape[1]), 0)
+    np.maximum.accumulate(index, axis=1, out=index)
+    state = np.take_along_axis(enter, index, axis=1)
+    # Days before the first event are flat
+    state &= np.maximum.accumulate(event, axis=1)
+    return state
+
+
+def positions(panel: Panel, strategy: str, params: Mapping[str, float]) -> np.ndarray:
+    """Target position (0 or 1) per symbol and day for one parameter set."""
+    if strategy == "ma_cross":
+        fast, slow = int(params["fast"]), int(params["slow"])
+        signal = panel.sma(fast) > panel.sma(slow)
+        warmup = slow
+    elif strategy == "macd_cross":
+        fast, slow, span = int(params["fast"]), int(params["slow"]), int(params["signal"])
+        macd = panel.macd(fast, slow)
+        signal = macd > indicators.ema(macd, span)
+        warmup = slow + span
+    elif strategy in ("momentum", "reversal"):
+        lookback, threshold = int(params["lookback"]), float(params["threshold"])
+        change = panel.change(lookback)
+        with np.errstate(invalid="ignore"):
+            up, down = change > threshold, change < -threshold
+        signal = _hold(up, down) if strategy == "momentum" else _hold(down, up)
+        warmup = lookback + 1
+    else:
+        raise ValueError(f"unknown strategy {strategy!r}")
+    return (signal & panel.live & (panel.age >= warmup)).astype(np.float64)
+
+
+def evaluate(panel: Panel, position: np.ndarray, cost: float = 0.0) -> dict[str, float]:
+    """Portfolio metrics of a position array (see the module docstring for the conventions)."""
+    # Summed over symbols without materialising the lagged (symbols, days) arrays
+    pnl = np.zeros(position.shape[1])
+    pnl[1:] = np.einsum("ij,ij->j", position[:, :-1], panel.returns[:, 1:])
+    traded = np.zeros(position.shape[1])
+    traded[1:] = np.abs(np.diff(position, axis=1, prepend=0.0)).sum(axis=0)[:-1]
+    live = panel.live.sum(axis=0)
+    count = np.maximum(live, 1)
+    daily = (pnl - cost * traded) / count
+    days = int((live > 0).sum())
+    equity = np.cumprod(1.0 + daily)
+    total = float(equity[-1] - 1.0) if len(equity) else 0.0
+    years = days / TRADING_DAYS
+    std = daily.std()
+    return {
+        "sharpe": float(daily.mean() / std * np.sqrt(TRADING_DAYS)) if std > 0 else 0.0,
+        "cagr": float((1.0 + total) ** (1.0 / years) - 1.0) if years > 0 and total > -1 else -1.0,
+        "total_return": total,
+        "max_drawdown": float((1.0 - equity / np.maximum.accumulate(equity)).max()) if len(equity) else 0.0,
+        "turnover": float((traded / count).sum() / years) if years > 0 else 0.0,
+    }
+
+
+def parameter_grid(strategy: str, ranges: Mapping[str, Iterable] | None = None) -> list[dict]:
+    """Every combination of ``ranges`` (default :data:`DEFAULT_GRIDS`), skipping ``fast >= slow``."""
+    ranges = DEFAULT_GRIDS[strategy] if ranges is None else ranges
+    names = list(ranges)
+    grid = [dict(zip(names, values)) for values in itertools.product(*(ranges[name] for name in names))]
+    return [params for params in grid if not ("fast" in params and params["fast"] >= params["slow"])]
+
+
+_panel: Panel | None = None
+_cost = 0.0
+
+
+def _init_worker(path: str, symbols: list[str] | None, cost: float) -> None:
+    global _panel, _cost
+    _panel = Panel.from_store(path, symbols)
+    _cost = cost
+
+
+def _run_chunk(jobs: list[tuple[str, dict]]) -> list[dict]:
+    return [
+        {"strategy": strategy, "params": params, **evaluate(_panel, positions(_panel, strategy, params), _cost)}
+        for strategy, params in jobs
+    ]
+
+
+def _chunks(jobs: list[tuple[str, dict]], size: int) -> Iterator[list[tuple[str, dict]]]:
+    for start in range(0, len(jobs), size):
+        yield jobs[start:start + size]
+
+
+def run_grid(
+    path: str | os.PathLike,
+    jobs: list[tuple[str, dict]],
+    workers: int | None = None,
+    cost: float = 0.0,
+    symbols: list[str] | None = None,
+) -> list[dict]:
+    """Metrics of every ``(strategy, params)`` in ``jobs``, in order.
+
+    Jobs are sent in chunks of neighbouring parameter sets, so a worker's
+    cached EMAs and changes are reused across a chunk.
+    """
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(os.fspath(path), symbols, cost)) as pool:
+        return [row for rows in pool.map(_run_chunk, _chunks(jobs, CHUNK_SIZE)) for row in rows]
+
+
+def buy_and_hold(panel: Panel, cost: float = 0.0) -> dict[str, float]:
+    return evaluate(panel, panel.live.astype(np.float64), cost)
@@ -0,0 +1,209 @@
+"""Tick-to-bar aggregation.
+
+Trades (timestamp, price, size) become OHLCV bars on fixed intervals, with
+every step vectorised: ticks are ordered by a stable argsort (skipped when the
+batch is already in time order) and each bar's high, low and volume come from
+``reduceat`` over its run of ticks.
+
+:func:`aggregate` handles one complete batch. :class:`BarAggregator` consumes
+a stream in batches and tolerates out-of-order ticks up to ``watermark``
+seconds late: open bars are kept as partial aggregates and only emitted once
+the watermark has passed their end, and ticks for bars already emitted are
+counted in :attr:`BarAggregator.late` and dropped.
+"""
+
+from __future__ import annotations
+
+import time
+
+import numpy as np
+
+# Bar interval name -> length in seconds
+INTERVALS = {"1s": 1, "1m": 60, "5m": 300, "1h": 3600, "1d": 86400}
+
+BAR_FIELDS = ("start", "open", "high", "low", "close", "volume")
+
+
+def interval_seconds(interval: str | int) -> int:
+    if isinstance(interval, str):
+        if interval not in INTERVALS:
+            raise ValueError(f"unknown interval {interval!r}")
+        return INTERVALS[interval]
+    if interval <= 0:
+        raise ValueError("interval must be positive")
+    return int(interval)
+
+
+def _empty() -> dict[str, np.ndarray]:
+    bars = {field: np.empty(0) for field in BAR_FIELDS}
+    bars["start"] = np.empty(0, dtype=np.int64)
+    return bars
+
+
+def _time_order(timestamps: np.ndarray) -> np.ndarray | None:
+    """Stable sort order of ``timestamps``, or ``None`` if already sorted."""
+    if len(timestamps) < 2 or not (timestamps[1:] < timestamps[:-1]).any():
+        return None
+    return np.argsort(timestamps, kind="stable")
+
+
+def _runs(ts: np.ndarray, price: np.ndarray, size: np.ndarray, seconds: int) -> dict[str, np.ndarray]:
+    """Bars of time-ordered ticks, with the first and last tick time of each."""
+    bucket = np.floor_divide(ts, seconds).astype(np.int64)
+    starts = np.concatenate(([0], np.flatnonzero(bucket[1:] != bucket[:-1]) + 1))
+    ends = np.append(starts[1:], len(ts)) - 1
+    return {
+        "start": bucket[starts] * seconds,
+        "open": price[starts],
+        "high": np.maximum.reduceat(price, starts),
+        "low": np.minimum.reduceat(price, starts),
+        "close": price[ends],
+        "volume": np.add.reduceat(size, starts),
+        "first": ts[starts],
+        "last": ts[ends],
+    }
+
+
+def _ticks(timestamps, prices, sizes) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    return (
+        np.asarray(timestamps, dtype=np.float64),
+        np.asarray(prices, dtype=np.float64),
+        np.asarray(sizes, dtype=np.float64),
+    )
+
+
+def aggregate(timestamps, prices, sizes, interval: str | int = "1m") -> dict[str, np.ndarray]:
+    """OHLCV bars of one batch of ticks, keyed by bar ``start`` in epoch seconds.
+
+    Ticks may arrive in any order; open and close are the prices of the
+    earliest and latest tick of each bar (arrival order breaks ties).
+    """
+    seconds = interval_seconds(interval)
+    ts, price, size = _ticks(timestamps, prices, sizes)
+    if not len(ts):
+        return _empty()
+    order = _time_order(ts)
+    if order is not None:
+        ts, price, size = ts[order], price[order], size[order]
+    bars = _runs(ts, price, size, seconds)
+    return {field: bars[field] for field in BAR_FIELDS}
+
+
+def _take(columns: dict[str, np.ndarray], index) -> dict[str, np.ndarray]:
+    return {field: values[index] for field, values in columns.items()}
+
+
+def _concat(a: dict[str, np.ndarray], b: dict[str, np.ndarray]) -> dict[str, np.ndarray]:
+    return {field: np.concatenate((a[field], b[field])) for field in a}
+
+
+class BarAggregator:
+    """Streaming bar builder for one symbol with a lateness ``watermark`` in seconds."""
+
+    def __init__(self, interval: str | int = "1m", watermark: float = 0.0):
+        self.seconds = interval_seconds(interval)
+        self.watermark = float(watermark)
+        # Bars starting before this (epoch seconds) have been emitted
+        self.emitted_until = -np.inf
+        self.max_timestamp = -np.inf
+        self.late = 0
+        # Partial bars still open: bar columns plus first/last tick times
+        self._open = {**_empty(), "first": np.empty(0), "last": np.empty(0)}
+
+    def _merge(self, bars: dict[str, np.ndarray]) -> dict[str, np.ndarray]:
+        """Combine partial bars that share a start (first open, last close)."""
+        if len(bars["start"]) < 2:
+            return bars
+        by_first = np.lexsort((bars["first"], bars["start"]))
+        start = bars["start"][by_first]
+        groups = np.concatenate(([0], np.flatnonzero(start[1:] != start[:-1]) + 1))
+        if len(groups) == len(start):
+            return _take(bars, by_first)
+        by_last = np.lexsort((bars["last"], bars["start"]))
+        ends = np.append(groups[1:], len(start)) - 1
+        first = _take(bars, by_first)
+        return {
+            "start": start[groups],
+            "open": first["open"][groups],
+            "high": np.maximum.reduceat(first["high"], groups),
+            "low": np.minimum.reduceat(first["low"], groups),
+            "close": bars["close"][by_last][ends],
+            "volume": np.add.reduceat(first["volume"], groups),
+            "first": first["first"][groups],
+            "last": bars["last"][by_last][ends],
+        }
+
+    def push(self, timestamps, prices, sizes) -> dict[str, np.ndarray]:
+        """Add a batch of ticks and return the bars the watermark has closed."""
+        ts, price, size = _ticks(timestamps, prices, sizes)
+        if len(ts):
+            on_time = ts >= self.emitted_until
+            if not on_time.all():
+                self.late += int(len(ts) - on_time.sum())
+                ts, price, size = ts[on_time], price[on_time], size[on_time]
+        if len(ts):
+            self.max_timestamp = max(self.max_timestamp, float(ts.max()))
+            order = _time_order(ts)
+            if order is not None:
+                ts, price, size = ts[order], price[order], size[order]
+            self._open = self._merge(_concat(self._open, _runs(ts, price, size, self.seconds)))
+        return self._emit(self.max_timestamp - self.watermark)
+
+    def advance(self, now: float | None = None) -> dict[str, np.ndarray]:
+        """Close bars by wall-clock time when no ticks arrive (``now`` defaults to the clock)."""
+        now = time.time() if now is None else now
+        self.max_timestamp = max(self.max_timestamp, now)
+        return self._emit(self.max_timestamp - self.watermark)
+
+    def flush(self) -> dict[str, np.ndarray]:
+        """Emit every open bar, e.g. at the end of a replay."""
+        return self._emit(np.inf)
+
+    @property
+    def pending(self) -> dict[str, np.ndarray]:
+        """Open bars as they stand, for live display before they close."""
+        return {field: self._open[field] for field in BAR_FIELDS}
+
+    def _emit(self, horizon: float) -> dict[str, np.ndarray]:
+        # A bar is closed once the watermark horizon reaches its end; from then
+        # on its bucket is final, whether or not it had any ticks
+        closed = self._open["start"] + self.seconds <= horizon
+        if np.isfinite(horizon):
+            boundary = np.floor(horizon / self.seconds) * self.seconds
+            self.emitted_until = max(self.emitted_until, boundary)
+        if not closed.any():
+            return _empty()
+        out = {field: self._open[field][closed] for field in BAR_FIELDS}
+        self._open = _take(self._open, ~closed)
+        if not np.isfinite(horizon):
+            self.emitted_until = max(self.emitted_until, float(out["start"][-1] + self.seconds))
+        return out
+
+
+def _format_start(start: int, seconds: int) -> str:
+    if seconds % INTERVALS["1d"] == 0:
+        return time.strftime("%Y-%m-%d", time.gmtime(start))
+    return time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(start))
+
+
+def to_records(bars: dict[str, np.ndarray], interval: str | int = "1m") -> list[dict]:
+    """Bars as dashboard ``priceHistory`` rows.
+
+    Daily bars are dated ``YYYY-MM-DD`` like the processed store; intraday bars
+    carry a UTC ISO timestamp.
+    """
+    seconds = interval_seconds(interval)
+    return [
+        {
+            "date": _format_start(int(start), seconds),
+            "price": float(close),
+            "volume": int(volume),
+            "high": float(high),
+            "low": float(low),
+            "open": float(open_),
+            "close": float(close),
+        }
+        for start, open_, high, low, close, volume in zip(
+            bars["start"], bars["open"], bars["high"], bars["low"], bars["close"], bars["volume"]
+        )
+    ]
@@ -0,0 +1,122 @@
+"""Bounded LRU/TTL cache of encoded API responses.
+
+The data server (``server.py``) keeps the final response bytes of popular
+queries - the default tickers and timeframes most dashboards open with - so
+a repeat is a dictionary lookup instead of a slice, an encode and a gzip.
+
+Keys include the data version of every symbol in the response (see
+``ColumnarStore.data_version``), so an entry can never be served after its
+symbols' data changed. When the server notices new versions it also drops
+the affected entries straight away through :meth:`QueryCache.invalidate`,
+leaving everything else cached. Entries are evicted least recently used
+first once ``max_bytes`` is exceeded and expire after ``ttl`` seconds.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable, Hashable, Iterable
+from typing import NamedTuple
+
+DEFAULT_MAX_BYTES = 64 << 20
+DEFAULT_TTL = 300.0
+
+
+class _Entry(NamedTuple):
+    value: bytes
+    symbols: tuple[str, ...]
+    expires: float
+
+
+class QueryCache:
+    """Thread-safe map from query keys to response bytes with hit and eviction counters."""
+
+    def __init__(self, max_bytes: int = DEFAULT_MAX_BYTES, ttl: float = DEFAULT_TTL,
+                 clock: Callable[[], float] = time.monotonic):
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self._clock = clock
+        self._entries: OrderedDict[Hashable, _Entry] = OrderedDict()
+        # symbol -> keys of the entries holding its data
+        self._by_symbol: dict[str, set[Hashable]] = {}
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+
+    def get(self, key: Hashable) -> bytes | None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry.expires <= self._clock():
+                self._remove(key)
+                self.expirations += 1
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry.value
+
+    def put(self, key: Hashable, value: bytes, symbols: Iterable[str]) -> None:
+        """Cache ``value`` under ``key`` as depending on ``symbols``' data."""
+        if len(value) > self.max_bytes:
+            return
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            entry = _Entry(value, tuple(symbols), self._clock() + self.ttl)
+            self._entries[key] = entry
+            self._bytes += len(value)
+            for symbol in entry.symbols:
+                self._by_symbol.setdefault(symbol, set()).add(key)
+            while self._bytes > self.max_bytes:
+                self._remove(next(iter(self._entries)))
+                self.evictions += 1
+
+    def invalidate(self, symbols: Iterable[str]) -> int:
+        """Drop every entry that holds data of ``symbols``; returns how many."""
+        with self._lock:
+            keys = set()
+            for symbol in symbols:
+                keys |= self._by_symbol.get(symbol, set())
+            for key in keys:
+                self._remove(key)
+            self.invalidations += len(keys)
+            return len(keys)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._by_symbol.clear()
+            self._bytes = 0
+
+    def _remove(self, key: Hashable) -> None:
+        entry = self._entries.pop(key)
+        self._bytes -= len(entry.value)
+        for symbol in entry.symbols:
+            keys = self._by_symbol[symbol]
+            keys.discard(key)
+            if not keys:
+                del self._by_symbol[symbol]
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "maxBytes": self.max_bytes,
+                "ttl": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hitRate": round(self.hits / lookups, 4) if lookups else 0.0,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "invalidations": self.invalidations,
+            }
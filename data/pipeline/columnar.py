@@ -0,0 +1,314 @@
+"""Columnar OHLCV store shared by the pipeline and the dashboard.
+
+The store is a single little-endian binary file::
+
+    0   magic    b"OHLCVCOL"
+    8   uint32   format version
+    12  uint32   header length in bytes
+    16  header   UTF-8 JSON, space-padded to an 8-byte boundary
+    ..  columns  raw typed arrays, each starting on an 8-byte boundary
+
+The JSON header lists every symbol with its display metadata and, per bar
+resolution (``1d``, ``1w``, ``1mo``; see ``pyramid.py``), the row count and the
+dtype/offset/length of each column. Dates are int32 days since 1970-01-01.
+Metadata strings shared by many symbols (:data:`DICTIONARY_FIELDS`) are stored
+once per file in ``dictionaries`` and referenced by index from each symbol's
+metadata; readers decode them only where they are displayed. Besides the OHLCV
+:data:`FIELDS` a level may carry derived series (e.g. the daily indicators of
+``indicators.py``), stored as float32. Offsets are absolute, so a reader can
+map the file once and take zero-copy views: ``np.frombuffer`` on the Python
+side and ``new Float64Array(buffer, offset, length)`` in the browser.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import struct
+from collections.abc import Mapping
+
+import numpy as np
+
+MAGIC = b"OHLCVCOL"
+VERSION = 4
+ALIGNMENT = 8
+
+PRICE_FIELDS = ("open", "high", "low", "close")
+FIELDS = ("date",) + PRICE_FIELDS + ("volume",)
+
+# dtype codes understood by the JS reader (src/js/utils/ohlcvStore.js).
+DTYPES = {"i4": np.dtype("<i4"), "u4": np.dtype("<u4"), "f4": np.dtype("<f4"), "f8": np.dtype("<f8")}
+
+_PREAMBLE = struct.Struct("<8sII")
+
+# Metadata fields dictionary-encoded in the header
+DICTIONARY_FIELDS = ("sector", "industry")
+
+
+def _pad(n: int) -> int:
+    return -n % ALIGNMENT
+
+
+def to_epoch_days(dates) -> np.ndarray:
+    """Convert anything ``np.asarray`` accepts as dates into int32 epoch days."""
+    return np.asarray(dates, dtype="datetime64[D]").astype(np.int64).astype("<i4")
+
+
+def from_epoch_days(days: np.ndarray) -> np.ndarray:
+    """Inverse of :func:`to_epoch_days`."""
+    return np.asarray(days, dtype=np.int64).astype("datetime64[D]")
+
+
+def _column_dtype(field: str, values: np.ndarray) -> str:
+    if field == "date":
+        return "i4"
+    if field == "volume":
+        # Share counts fit in uint32 for almost every listing; fall back to
+        # float64, which is still exact for integers below 2**53.
+        if values.size == 0 or (values.min() >= 0 and values.max() < 2**32):
+            return "u4"
+        return "f8"
+    if field in PRICE_FIELDS:
+        return "f8"
+    # Derived series are for display and screening; single precision halves them
+    return "f4"
+
+
+def _encode_level(name: str, columns: Mapping[str, np.ndarray], blocks: list, required: tuple[str, ...]) -> dict:
+    missing = [f for f in required if f not in columns]
+    if missing:
+        raise ValueError(f"{name}: missing columns {missing}")
+    rows = len(columns["date"])
+    cols = {}
+    for field in tuple(f for f in FIELDS if f in columns) + tuple(f for f in columns if f not in FIELDS):
+        values = np.asarray(columns[field])
+        if len(values) != rows:
+            raise ValueError(f"{name}.{field}: expected {rows} rows, got {len(values)}")
+        code = _column_dtype(field, values)
+        cols[field] = {"dtype": code, "length": rows}
+        blocks.append((cols[field], np.ascontiguousarray(values, dtype=DTYPES[code])))
+    return {"rows": rows, "columns": cols}
+
+
+def write_store(
+    path: str | os.PathLike,
+    series: Mapping[str, Mapping[str, Mapping[str, np.ndarray]]],
+    meta: Mapping[str, Mapping] | None = None,
+) -> None:
+    """Write ``series`` (symbol -> resolution -> field -> array) to ``path`` atomically.
+
+    Every level must provide all of :data:`FIELDS` with equal lengths; any
+    further columns are written after them.
+    ``meta`` holds per-symbol JSON-serialisable display data (name, market
+    cap, latest quote, ...) that the dashboard shows without touching columns.
+    """
+    header, blocks = _encode(series, meta, FIELDS)
+    tmp = f"{os.fspath(path)}.tmp"
+    with open(tmp, "wb") as fh:
+        fh.write(_PREAMBLE.pack(MAGIC, VERSION, len(header)))
+        fh.write(header)
+        for _, data in blocks:
+            fh.write(data.tobytes())
+            fh.write(b"\0" * _pad(data.nbytes))
+    os.replace(tmp, path)
+
+
+def encode_store(
+    series: Mapping[str, Mapping[str, Mapping[str, np.ndarray]]],
+    meta: Mapping[str, Mapping] | None = None,
+    dictionaries: Mapping[str, list[str]] | None = None,
+) -> bytes:
+    """:func:`write_store` into memory, for slices served over HTTP.
+
+    Levels need only a ``date`` column, so a slice may carry a subset of the
+    fields; readers see the same layout as a full store. With
+    ``dictionaries`` (those of the store being sliced) ``meta`` is taken as
+    already encoded against them, so a slice's codes match the full store's.
+    """
+    header, blocks = _encode(series, meta, ("date",), dictionaries)
+    parts = [_PREAMBLE.pack(MAGIC, VERSION, len(header)), header]
+    for _, data in blocks:
+        parts.append(data.tobytes())
+        parts.append(b"\0" * _pad(data.nbytes))
+    return b"".join(parts)
+
+
+def _encode(series: Mapping, meta: Mapping | None, required: tuple[str, ...],
+            dictionaries: Mapping[str, list[str]] | None = None) -> tuple[bytes, list]:
+    """Header and ``(column spec, array)`` blocks of a store holding ``series``."""
+    meta = meta or {}
+    entries = []
+    blocks = []
+    for symbol, levels in series.items():
+        encoded = {res: _encode_level(f"{symbol}@{res}", columns, blocks, required) for res, columns in levels.items()}
+        entries.append({"symbol": symbol, "meta": dict(meta.get(symbol, {})), "levels": encoded})
+    if dictionaries is None:
+        dictionaries = _intern(entries)
+    return _layout(entries, [(col, data.nbytes) for col, data in blocks], dictionaries), blocks
+
+
+def _intern(entries: list[dict]) -> dict[str, list[str]]:
+    """Replace the :data:`DICTIONARY_FIELDS` strings in ``entries``' meta by codes; returns the dictionaries."""
+    dictionaries = {field: [] for field in DICTIONARY_FIELDS}
+    codes: dict[str, dict[str, int]] = {field: {} for field in DICTIONARY_FIELDS}
+    for entry in entries:
+        meta = entry["meta"]
+        for field in DICTIONARY_FIELDS:
+            value = meta.get(field)
+            if isinstance(value, str):
+                if value not in codes[field]:
+                    codes[field][value] = len(dictionaries[field])
+                    dictionaries[field].append(value)
+                meta[field] = codes[field][value]
+    return dictionaries
+
+
+def _decode(meta: dict, dictionaries: Mapping[str, list[str]]) -> dict:
+    """``meta`` with its dictionary codes replaced by the strings."""
+    decoded = dict(meta)
+    for field in DICTIONARY_FIELDS:
+        if isinstance(decoded.get(field), int):
+            decoded[field] = dictionaries[field][decoded[field]]
+    return decoded
+
+
+def public_meta(meta: dict) -> dict:
+    """``meta`` without the pipeline's indicator recursion state."""
+    if "state" not in meta.get("indicators", {}):
+        return meta
+    indicators = {key: value for key, value in meta["indicators"].items() if key != "state"}
+    return {**meta, "indicators": indicators}
+
+
+def _layout(entries: list[dict], columns: list[tuple[dict, int]], dictionaries: Mapping[str, list[str]]) -> bytes:
+    """Assign absolute offsets to ``(column spec, nbytes)`` pairs and return the padded header."""
+    # Offsets depend on the header length, which depends on the offsets'
+    # digits; iterate until the padded header size stops changing.
+    header_size = 0
+    while True:
+        offset = _PREAMBLE.size + header_size
+        for col, nbytes in columns:
+            col["offset"] = offset
+            offset += nbytes + _pad(nbytes)
+        header = json.dumps({"version": VERSION, "dictionaries": dictionaries, "symbols": entries},
+                            separators=(",", ":")).encode()
+        padded = len(header) + _pad(_PREAMBLE.size + len(header))
+        if padded == header_size:
+            return header.ljust(header_size, b" ")
+        header_size = padded
+
+
+def _read_header(fh, path: str) -> dict:
+    magic, version, header_len = _PREAMBLE.unpack(fh.read(_PREAMBLE.size))
+    if magic != MAGIC:
+        raise ValueError(f"{path}: not an OHLCV columnar store")
+    if version != VERSION:
+        raise ValueError(f"{path}: unsupported store version {version}")
+    return json.loads(fh.read(header_len))
+
+
+def merge_stores(
+    paths: list[str | os.PathLike], path: str | os.PathLike, data_versions: Mapping[str, str] | None = None
+) -> None:
+    """Concatenate stores (e.g. per-symbol partitions) into ``path`` atomically.
+
+    Column bytes are copied one column at a time, so merging thousands of
+    partitions needs neither their combined memory nor an open file each.
+    ``data_versions`` (symbol -> opaque string) is recorded per symbol as
+    ``dataVersion``, for readers that cache per symbol (see ``server.py``).
+    """
+    entries = []
+    copies = []  # (column spec, source path, source offset, nbytes)
+    for source in map(os.fspath, paths):
+        with open(source, "rb") as fh:
+            header = _read_header(fh, source)
+        for entry in header["symbols"]:
+            for level in entry["levels"].values():
+                for col in level["columns"].values():
+                    copies.append((col, source, col["offset"], col["length"] * DTYPES[col["dtype"]].itemsize))
+            if data_versions and entry["symbol"] in data_versions:
+                entry["dataVersion"] = data_versions[entry["symbol"]]
+            # Codes are per file; re-encode against the merged dictionaries
+            entry["meta"] = _decode(entry["meta"], header["dictionaries"])
+            entries.append(entry)
+
+    header = _layout(entries, [(col, nbytes) for col, _, _, nbytes in copies], _intern(entries))
+    tmp = f"{os.fspath(path)}.tmp"
+    with open(tmp, "wb") as fh:
+        fh.write(_PREAMBLE.pack(MAGIC, VERSION, len(header)))
+        fh.write(header)
+        src, src_path = None, None
+        try:
+            for _, source, offset, nbytes in copies:
+                if source != src_path:
+                    if src is not None:
+                        src.close()
+                    src, src_path = open(source, "rb"), source
+                src.seek(offset)
+                fh.write(src.read(nbytes))
+                fh.write(b"\0" * _pad(nbytes))
+        finally:
+            if src is not None:
+                src.close()
+    os.replace(tmp, path)
+
+
+class ColumnarStore:
+    """Read-only, memory-mapped view over a file written by :func:`write_store`."""
+
+    def __init__(self, path: str | os.PathLike):
+        self.path = os.fspath(path)
+        self._buffer = np.memmap(self.path, dtype=np.uint8, mode="r")
+        with open(self.path, "rb") as fh:
+            header = _read_header(fh, self.path)
+        self.dictionaries: dict[str, list[str]] = header["dictionaries"]
+        self._entries = {entry["symbol"]: entry for entry in header["symbols"]}
+        self._decoded: dict[str, dict] = {}
+
+    @property
+    def symbols(self) -> list[str]:
+        return list(self._entries)
+
+    def __contains__(self, symbol: str) -> bool:
+        return symbol in self._entries
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def meta(self, symbol: str) -> dict:
+        """Display metadata with dictionary-encoded fields decoded to strings."""
+        if symbol not in self._decoded:
+            self._decoded[symbol] = _decode(self._entries[symbol]["meta"], self.dictionaries)
+        return self._decoded[symbol]
+
+    def encoded_meta(self, symbol: str) -> dict:
+        """Metadata as stored: :data:`DICTIONARY_FIELDS` as codes into :attr:`dictionaries`."""
+        return self._entries[symbol]["meta"]
+
+    def data_version(self, symbol: str) -> str | None:
+        """Changes whenever the symbol's bars or metadata do; ``None`` if not recorded."""
+        return self._entries[symbol].get("dataVersion")
+
+    def resolutions(self, symbol: str) -> list[str]:
+        return list(self._entries[symbol]["levels"])
+
+    def column(self, symbol: str, field: str, resolution: str = "1d") -> np.ndarray:
+        col = self._entries[symbol]["levels"][resolution]["columns"][field]
+        return np.frombuffer(self._buffer, dtype=DTYPES[col["dtype"]], count=col["length"], offset=col["offset"])
+
+    def series(self, symbol: str, resolution: str = "1d") -> dict[str, np.ndarray]:
+        columns = self._entries[symbol]["levels"][resolution]["columns"]
+        return {field: self.column(symbol, field, resolution) for field in columns}
+
+    def aligned(self, field: str, symbols: list[str] | None = None, resolution: str = "1d") -> tuple[np.ndarray, np.ndarray]:
+        """``(days, values)``: ``field`` of ``symbols`` (default all) on the union of their dates.
+
+        ``values`` is a float64 ``(symbols, days)`` array, NaN where a symbol has no bar.
+        """
+        symbols = self.symbols if symbols is None else symbols
+        dates = [self.column(symbol, "date", resolution) for symbol in symbols]
+        days = np.unique(np.concatenate(dates)) if dates else np.empty(0, dtype="<i4")
+        values = np.full((len(symbols), len(days)), np.nan)
+        for row, (symbol, date) in enumerate(zip(symbols, dates)):
+            values[row, np.searchsorted(days, date)] = self.column(symbol, field, resolution)
+        return days, values
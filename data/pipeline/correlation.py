@@ -0,0 +1,149 @@
+"""Rolling return correlations of a whole universe.
+
+:class:`RollingCorrelation` keeps, for the trailing ``window`` days, the sum of
+each symbol's returns and the ``(N, N)`` matrix of cross products
+``R @ R.T``, from which every pairwise Pearson correlation follows. The cross
+products are built and updated with blocked matrix multiplication, so
+temporaries stay ``block x block`` however many symbols there are, and only the
+upper triangle is multiplied. Sliding the window by ``k`` days is a rank-``2k``
+update (add the new days' products, subtract the dropped ones) instead of a
+recomputation over the whole window.
+
+:meth:`RollingCorrelation.edges` turns the matrix into a sparse edge list,
+again block by block, keeping only pairs whose absolute correlation reaches a
+threshold. Symbols missing any day of the window have no edges.
+"""
+
+from __future__ import annotations
+
+import numpy as np
+
+DEFAULT_WINDOW = 60
+DEFAULT_THRESHOLD = 0.5
+BLOCK = 512
+
+
+def _blocks(n: int, block: int):
+    for lo in range(0, n, block):
+        yield lo, min(lo + block, n)
+
+
+def cross_products(returns: np.ndarray, block: int = BLOCK, out: np.ndarray | None = None) -> np.ndarray:
+    """``returns @ returns.T`` for ``(N, days)`` returns, one upper-triangle block at a time."""
+    n = returns.shape[0]
+    out = np.empty((n, n)) if out is None else out
+    for i0, i1 in _blocks(n, block):
+        for j0, j1 in _blocks(n, block):
+            if j0 < i0:
+                continue
+            out[i0:i1, j0:j1] = returns[i0:i1] @ returns[j0:j1].T
+            if j0 != i0:
+                out[j0:j1, i0:i1] = out[i0:i1, j0:j1].T
+    return out
+
+
+class RollingCorrelation:
+    """Correlation matrix of the last ``window`` columns pushed, updated incrementally.
+
+    Missing returns (NaN) count as zero in the sums and mark the symbol as
+    incomplete until the day leaves the window.
+    """
+
+    def __init__(self, returns: np.ndarray, window: int = DEFAULT_WINDOW, block: int = BLOCK):
+        returns = np.asarray(returns, dtype=np.float64)
+        if returns.shape[1] < window:
+            raise ValueError(f"need {window} days of returns, got {returns.shape[1]}")
+        self.window = window
+        self.block = block
+        recent = returns[:, -window:]
+        self._missing = np.isnan(recent)
+        self._returns = np.where(self._missing, 0.0, recent)
+        self.sums = self._returns.sum(axis=1)
+        self.cross = cross_products(self._returns, block)
+
+    @classmethod
+    def from_state(cls, returns: np.ndarray, sums: np.ndarray, cross: np.ndarray, block: int = BLOCK) -> RollingCorrelation:
+        """Resume from saved ``sums`` and ``cross`` products; ``returns`` is the window they cover."""
+        self = cls.__new__(cls)
+        returns = np.asarray(returns, dtype=np.float64)
+        self.window = returns.shape[1]
+        self.block = block
+        self._missing = np.isnan(returns)
+        self._returns = np.where(self._missing, 0.0, returns)
+        self.sums = np.asarray(sums, dtype=np.float64)
+        self.cross = np.asarray(cross, dtype=np.float64)
+        return self
+
+    def push(self, returns: np.ndarray) -> None:
+        """Slide the window over ``(N, k)`` new days of returns."""
+        returns = np.asarray(returns, dtype=np.float64)
+        k = returns.shape[1]
+        if k == 0:
+            return
+        if k >= self.window:
+            self.__init__(returns, self.window, self.block)
+            return
+        missing = np.isnan(returns)
+        new = np.where(missing, 0.0, returns)
+        old = self._returns[:, :k]
+        self.sums += new.sum(axis=1) - old.sum(axis=1)
+        # One multiplication covers both halves: [new, old] @ [new, -old].T
+        stacked = np.concatenate((new, old), axis=1)
+        signed = np.concatenate((new, -old), axis=1)
+        n = len(self.sums)
+        for i0, i1 in _blocks(n, self.block):
+            for j0, j1 in _blocks(n, self.block):
+                if j0 < i0:
+                    continue
+                update = stacked[i0:i1] @ signed[j0:j1].T
+                self.cross[i0:i1, j0:j1] += update
+                if j0 != i0:
+                    self.cross[j0:j1, i0:i1] += update.T
+        self._returns = np.concatenate((self._returns[:, k:], new), axis=1)
+        self._missing = np.concatenate((self._missing[:, k:], missing), axis=1)
+
+    @property
+    def complete(self) -> np.ndarray:
+        """Symbols with a return on every day of the window."""
+        return ~self._missing.any(axis=1)
+
+    @property
+    def returns(self) -> np.ndarray:
+        """The window's returns, NaN where missing (what :meth:`from_state` expects)."""
+        return np.where(self._missing, np.nan, self._returns)
+
+    def _scale(self) -> tuple[np.ndarray, np.ndarray]:
+        mean = self.sums / self.window
+        var = np.diagonal(self.cross) / self.window - mean * mean
+        with np.errstate(divide="ignore"):
+            inv_std = np.where((var > 0) & self.complete, 1.0 / np.sqrt(np.maximum(var, 0.0)), 0.0)
+        return mean, inv_std
+
+    def matrix(self) -> np.ndarray:
+        """The dense correlation matrix (0 for incomplete or constant symbols)."""
+        mean, inv_std = self._scale()
+        corr = (self.cross / self.window - np.outer(mean, mean)) * np.outer(inv_std, inv_std)
+        np.fill_diagonal(corr, np.where(inv_std > 0, 1.0, 0.0))
+        return np.clip(corr, -1.0, 1.0)
+
+    def edges(self, threshold: float = DEFAULT_THRESHOLD) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """``(source, target, correlation)`` of every pair ``source < target`` with ``|corr| >= threshold``."""
+        mean, inv_std = self._scale()
+        sources, targets, values = [], [], []
+        n = len(mean)
+        for i0, i1 in _blocks(n, self.block):
+            for j0, j1 in _blocks(n, self.block):
+                if j0 < i0:
+                    continue
+                corr = self.cross[i0:i1, j0:j1] / self.window - np.outer(mean[i0:i1], mean[j0:j1])
+                corr *= np.outer(inv_std[i0:i1], inv_std[j0:j1])
+                keep = (np.abs(corr) >= threshold) & np.outer(inv_std[i0:i1] > 0, inv_std[j0:j1] > 0)
+                if j0 == i0:
+                    keep &= np.triu(np.ones(keep.shape, dtype=bool), 1)
+                rows, cols = np.nonzero(keep)
+                sources.append(rows + i0)
+                targets.append(cols + j0)
+                values.append(np.clip(corr[rows, cols], -1.0, 1.0))
+        if not values:
+            return np.empty(0, dtype=np.intp), np.empty(0, dtype=np.intp), np.empty(0)
+        return np.concatenate(sources), np.concatenate(targets), np.concatenate(values)
@@ -0,0 +1,176 @@
+"""Sector aggregation cube for the performance heatmap.
+
+Rolls every symbol of the processed store up a market > sector > industry >
+symbol hierarchy and, for each node and each of :data:`PERIODS`, stores the
+period return, the traded volume and the node's market capitalisation with
+its weight within its parent. Returns of a group are weighted by market cap
+(equal weights when the store has no caps at all).
+
+Nodes are numbered level by level with each node's children contiguous and
+ordered by weight, so a drill-down is a slice ``firstChild[i]`` ..
+``firstChild[i] + childCount[i]`` of precomputed arrays; the dashboard never
+touches bars to expand a sector. :func:`write_cube` writes
+``processed/sectors.json``::
+
+    {"version": 1, "asOf": "2024-01-08", "periods": ["1D", ...],
+     "levels": ["market", "sector", "industry", "symbol"],
+     "nodes": {"name": [...], "level": [...], "parent": [...],
+               "firstChild": [...], "childCount": [...],
+               "marketCap": [...], "weight": [...]},
+     "returns": {"1D": [...], ...}, "volume": {"1D": [...], ...}}
+
+Returns are fractions (``null`` when a symbol has no bar before the period).
+"""
+
+from __future__ import annotations
+
+import json
+import os
+
+import numpy as np
+
+from pipeline.columnar import ColumnarStore, from_epoch_days, to_epoch_days
+
+CUBE_NAME = "sectors.json"
+CUBE_VERSION = 1
+
+PERIODS = ("1D", "1W", "1M", "3M", "1Y", "YTD")
+# Calendar days covered by each period, as TIMEFRAME_DAYS in src/js/utils/barPyramid.js;
+# YTD runs from the last close of the previous year
+PERIOD_DAYS = {"1D": 1, "1W": 7, "1M": 30, "3M": 91, "1Y": 365}
+LEVELS = ("market", "sector", "industry", "symbol")
+MARKET = "Market"
+OTHER = "Other"
+
+
+def period_starts(as_of: int) -> np.ndarray:
+    """Epoch day of each period's base close: the period covers ``(start, as_of]``."""
+    year_end = int(to_epoch_days(from_epoch_days(as_of).astype("datetime64[Y]"))) - 1
+    return np.array([year_end if period == "YTD" else as_of - PERIOD_DAYS[period] for period in PERIODS])
+
+
+def symbol_measures(date: np.ndarray, close: np.ndarray, volume: np.ndarray,
+                    as_of: int, starts: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """``(returns, volume)`` of one symbol over each period ending ``as_of``."""
+    end = np.searchsorted(date, as_of, side="right")
+    first = np.searchsorted(date[:end], starts, side="right")
+    returns = np.full(len(starts), np.nan)
+    has_base = (first > 0) & (end > 0)
+    if end:
+        returns[has_base] = close[end - 1] / close[first[has_base] - 1] - 1.0
+    volumes = np.array([volume[i:end].sum() for i in first], dtype=np.float64)
+    return returns, volumes
+
+
+def _hierarchy(keys: list[tuple[str, str, str]], caps: np.ndarray) -> tuple[list, np.ndarray, list[np.ndarray]]:
+    """Nodes of the market > sector > industry > symbol tree, level by level.
+
+    ``keys`` are ``(sector, industry, symbol)`` per symbol. Returns the node
+    ``(name, level)`` of every node, their parents and, per level, the node
+    each symbol belongs to at that level (in symbol order).
+    """
+    names = [MARKET]
+    levels = [0]
+    parents = [-1]
+    ancestors = [np.zeros(len(keys), dtype=np.int64)]
+    # Groups of the previous level: node index -> member symbol rows
+    groups = {0: np.arange(len(keys))}
+    for depth in range(1, len(LEVELS)):
+        ancestor = np.empty(len(keys), dtype=np.int64)
+        next_groups = {}
+        for parent, rows in groups.items():
+            children: dict[str, list[int]] = {}
+            for row in rows:
+                children.setdefault(keys[row][depth - 1], []).append(row)
+            # Heaviest first, ties by name, so the top of a drill-down is a prefix
+            order = sorted(children, key=lambda name: (-caps[children[name]].sum(), name))
+            for name in order:
+                node = len(names)
+                names.append(name)
+                levels.append(depth)
+                parents.append(parent)
+                members = np.array(children[name])
+                ancestor[members] = node
+                next_groups[node] = members
+        groups = next_groups
+        ancestors.append(ancestor)
+    return list(zip(names, levels)), np.array(parents), ancestors
+
+
+def build_cube(store: ColumnarStore) -> dict:
+    symbols = store.symbols
+    as_of = int(max(store.column(symbol, "date")[-1] for symbol in symbols))
+    starts = period_starts(as_of)
+    metas = [store.meta(symbol) for symbol in symbols]
+    keys = [(meta.get("sector") or OTHER, meta.get("industry") or OTHER, symbol) for symbol, meta in zip(symbols, metas)]
+    caps = np.array([meta.get("marketCap") or 0.0 for meta in metas])
+    weights = caps if caps.any() else np.ones(len(symbols))
+
+    symbol_returns = np.empty((len(symbols), len(PERIODS)))
+    symbol_volume = np.empty((len(symbols), len(PERIODS)))
+    for row, symbol in enumerate(symbols):
+        series = store.series(symbol)
+        symbol_returns[row], symbol_volume[row] = symbol_measures(
+            series["date"], series["close"], series["volume"], as_of, starts)
+
+    nodes, parents, ancestors = _hierarchy(keys, weights)
+    n = len(nodes)
+    returns = np.full((n, len(PERIODS)), np.nan)
+    volume = np.zeros((n, len(PERIODS)))
+    node_caps = np.zeros(n)
+    node_weights = np.zeros(n)
+    # Every level, the symbols themselves included, aggregates straight from
+    # the symbols; those without a return for a period drop out of its weighting
+    # (a group whose members all lack a cap falls back to equal weights)
+    valid = np.isfinite(symbol_returns)
+    plain = np.where(valid, symbol_returns, 0.0)
+    for ancestor in ancestors:
+        node_caps += np.bincount(ancestor, caps, minlength=n)
+        node_weights += np.bincount(ancestor, weights, minlength=n)
+        for p in range(len(PERIODS)):
+            count = np.bincount(ancestor, valid[:, p], minlength=n)
+            mass = np.bincount(ancestor, weights * valid[:, p], minlength=n)
+            total = np.bincount(ancestor, plain[:, p] * weights, minlength=n)
+            mean = np.bincount(ancestor, plain[:, p], minlength=n)
+            have = count > 0
+            returns[have, p] = np.where(mass[have] > 0, total[have] / np.maximum(mass[have], 1e-300),
+                                        mean[have] / count[have])
+            volume[:, p] += np.bincount(ancestor, symbol_volume[:, p], minlength=n)
+
+    share = np.ones(n)
+    share[1:] = node_weights[1:] / np.where(node_weights[parents[1:]] > 0, node_weights[parents[1:]], np.nan)
+    first_child = np.full(n, -1)
+    child_count = np.bincount(parents[1:], minlength=n)
+    # Children are contiguous and numbered in parent order
+    first_child[child_count > 0] = np.searchsorted(parents[1:], np.flatnonzero(child_count > 0)) + 1
+    return {
+        "version": CUBE_VERSION,
+        "asOf": str(from_epoch_days(as_of)),
+        "periods": list(PERIODS),
+        "levels": list(LEVELS),
+        "nodes": {
+            "name": [name for name, _ in nodes],
+            "level": [level for _, level in nodes],
+            "parent": parents.tolist(),
+            "firstChild": first_child.tolist(),
+            "childCount": child_count.tolist(),
+            "marketCap": node_caps.tolist(),
+            "weight": _json_floats(share, 6),
+        },
+        "returns": {period: _json_floats(returns[:, p], 6) for p, period in enumerate(PERIODS)},
+        "volume": {period: volume[:, p].astype(np.int64).tolist() for p, period in enumerate(PERIODS)},
+    }
+
+
+def _json_floats(values: np.ndarray, decimals: int) -> list:
+    """Rounded floats with NaN as ``None`` (JSON ``null``)."""
+    return [None if np.isnan(v) else v for v in np.round(values, decimals).tolist()]
+
+
+def write_cube(store_path: str, path: str) -> dict:
+    cube = build_cube(ColumnarStore(store_path))
+    tmp = f"{path}.tmp"
+    with open(tmp, "w") as fh:
+        json.dump(cube, fh, separators=(",", ":"))
+    os.replace(tmp, path)
+    return cube
@@ -0,0 +1,126 @@
+"""Pixel-aware downsampling shared with the dashboard (src/js/utils/downsample.js).
+
+* :func:`lttb` keeps the shape of a price line with Largest-Triangle-Three-Buckets.
+* :func:`minmax_indices` keeps the smallest and largest value of every bucket,
+  which is what a volume bar chart needs to keep its spikes.
+* :func:`ohlc_buckets` merges each bucket into one OHLCV bar, so highs and lows
+  survive in candlestick exports.
+
+All functions return row indices (or rolled-up columns) so the caller can
+gather any other field for the surviving rows. :func:`downsample_columns`
+applies one of them to a level of the store; the data server uses it for the
+``points`` parameter of ``/api/bars``.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Mapping
+
+import numpy as np
+
+from pipeline.columnar import FIELDS
+from pipeline.pyramid import rollup
+
+# Methods of downsample_columns
+MODES = ("ohlc", "lttb", "minmax")
+
+
+def bucket_edges(start: int, stop: int, buckets: int) -> np.ndarray:
+    """``buckets + 1`` increasing edges splitting ``[start, stop)`` evenly.
+
+    Integer division, exactly as ``bucketEdge`` in the JS module; rounding
+    float edges would put a few rows in neighbouring buckets.
+    """
+    return (start + (stop - start) * np.arange(buckets + 1) // buckets).astype(np.intp)
+
+
+def lttb(x: np.ndarray, y: np.ndarray, threshold: int) -> np.ndarray:
+    """Indices of the ``threshold`` points LTTB keeps from ``(x, y)``.
+
+    The first and last points are always kept. Bucket averages are computed
+    in one vectorised pass; the per-bucket triangle areas are vectorised over
+    each bucket, leaving a loop over output points only.
+    """
+    n = len(y)
+    if threshold >= n or threshold < 3:
+        return np.arange(n)
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+
+    edges = bucket_edges(1, n - 1, threshold - 2)
+    sizes = np.diff(edges)
+    cx = np.concatenate(([0.0], np.cumsum(x)))
+    cy = np.concatenate(([0.0], np.cumsum(y)))
+    avg_x = (cx[edges[1:]] - cx[edges[:-1]]) / sizes
+    avg_y = (cy[edges[1:]] - cy[edges[:-1]]) / sizes
+    # Each bucket looks ahead to the next bucket's centroid; the last one to the final point.
+    next_x = np.append(avg_x[1:], x[-1])
+    next_y = np.append(avg_y[1:], y[-1])
+
+    out = np.empty(threshold, dtype=np.intp)
+    out[0], out[-1] = 0, n - 1
+    a = 0
+    for i in range(threshold - 2):
+        lo, hi = edges[i], edges[i + 1]
+        area = np.abs((x[a] - next_x[i]) * (y[lo:hi] - y[a]) - (x[a] - x[lo:hi]) * (next_y[i] - y[a]))
+        a = lo + int(area.argmax())
+        out[i + 1] = a
+    return out
+
+
+def _bucket_matrix(n: int, buckets: int) -> tuple[np.ndarray, np.ndarray]:
+    edges = bucket_edges(0, n, buckets)
+    sizes = np.diff(edges)
+    idx = edges[:-1, None] + np.arange(sizes.max())
+    valid = idx < edges[1:, None]
+    return np.minimum(idx, n - 1), valid
+
+
+def minmax_indices(values: np.ndarray, buckets: int) -> np.ndarray:
+    """Sorted indices of the min and max of each of ``buckets`` equal buckets.
+
+    The result has at most ``2 * buckets`` entries and always includes the
+    first and last rows.
+    """
+    values = np.asarray(values)
+    n = len(values)
+    if buckets <= 0 or 2 * buckets >= n:
+        return np.arange(n)
+    idx, valid = _bucket_matrix(n, buckets)
+    grid = values[idx].astype(np.float64)
+    rows = np.arange(len(idx))
+    lo = idx[rows, np.where(valid, grid, np.inf).argmin(axis=1)]
+    hi = idx[rows, np.where(valid, grid, -np.inf).argmax(axis=1)]
+    return np.unique(np.concatenate(([0, n - 1], lo, hi)))
+
+
+def ohlc_buckets(columns: Mapping[str, np.ndarray], buckets: int) -> dict[str, np.ndarray]:
+    """Merge OHLCV ``columns`` into at most ``buckets`` bars.
+
+    Other columns (indicators) take their value at each bucket's last bar.
+    """
+    n = len(columns["date"])
+    if buckets <= 0 or buckets >= n:
+        return dict(columns)
+    starts = np.unique(bucket_edges(0, n, buckets)[:-1])
+    ends = np.append(starts[1:], n) - 1
+    derived = {field: np.asarray(values)[ends] for field, values in columns.items() if field not in FIELDS}
+    return {**rollup(columns, starts), **derived}
+
+
+def downsample_columns(columns: Mapping[str, np.ndarray], points: int, mode: str = "ohlc") -> dict[str, np.ndarray]:
+    """About ``points`` rows of a store level, picked by ``mode`` (one of :data:`MODES`).
+
+    ``ohlc`` merges buckets of bars (:func:`ohlc_buckets`); ``lttb`` and
+    ``minmax`` keep rows chosen on the close (:func:`lttb`, at most
+    ``points + 2`` rows for :func:`minmax_indices`) with all their columns.
+    """
+    if mode == "ohlc":
+        return ohlc_buckets(columns, points)
+    if mode == "lttb":
+        keep = lttb(columns["date"], columns["close"], points)
+    elif mode == "minmax":
+        keep = minmax_indices(columns["close"], points // 2)
+    else:
+        raise ValueError(f"unknown downsampling mode {mode!r}")
+    return {field: np.asarray(values)[keep] for field, values in columns.items()}
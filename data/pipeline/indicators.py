@@ -0,0 +1,233 @@
+"""Vectorised technical indicators.
+
+Every function works along the last axis, so the same code computes one
+symbol's 1-D history or a (symbols, days) panel such as the backtester's
+(see ``backtest.py``). Rolling indicators come from cumulative sums.
+Exponential ones (EMA, Wilder smoothing) use a blocked closed form,
+``ema[k] = d**(k+1) * s + a * d**k * cumsum(x[j] * d**-j)``, with blocks
+short enough for ``d**-j`` to stay well conditioned and the state ``s``
+carried from block to block. No Python loop runs per bar.
+
+The pipeline stores :data:`INDICATOR_FIELDS` as extra daily columns of the
+processed store and :func:`summary` in each symbol's metadata, including the
+recursion state that lets :func:`extend` add new bars without recomputing
+history.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Mapping
+
+import numpy as np
+
+SMA_WINDOWS = (20, 50)
+MACD_SPANS = (12, 26, 9)  # fast, slow, signal
+RSI_PERIOD = 14
+BOLLINGER = (20, 2.0)  # window, standard deviations
+ATR_PERIOD = 14
+VOLATILITY_WINDOW = 20
+TRADING_DAYS = 252
+
+INDICATOR_FIELDS = (
+    "sma20", "sma50", "ema12", "ema26", "macd", "macdSignal", "macdHist",
+    "rsi14", "bbUpper", "bbLower", "atr14", "volatility20",
+)
+
+# Recursive indicators resume from these values (see extend)
+STATE_FIELDS = ("ema12", "ema26", "macdSignal", "rsiGain", "rsiLoss", "atr14")
+
+# Relative growth of d**-j tolerated inside one closed-form block
+_BLOCK_GROWTH = 1e3
+
+
+def _nan_like(x: np.ndarray) -> np.ndarray:
+    return np.full(x.shape, np.nan)
+
+
+def _shift_cumsum(x: np.ndarray) -> np.ndarray:
+    out = np.zeros(x.shape[:-1] + (x.shape[-1] + 1,))
+    np.cumsum(x, axis=-1, out=out[..., 1:])
+    return out
+
+
+def sma(x, window: int) -> np.ndarray:
+    """Trailing mean; the first ``window - 1`` values are NaN."""
+    x = np.asarray(x, dtype=np.float64)
+    out = _nan_like(x)
+    if x.shape[-1] >= window:
+        csum = _shift_cumsum(x)
+        out[..., window - 1:] = (csum[..., window:] - csum[..., :-window]) / window
+    return out
+
+
+def rolling_std(x, window: int) -> np.ndarray:
+    """Trailing population standard deviation, NaN-padded like :func:`sma`."""
+    x = np.asarray(x, dtype=np.float64)
+    out = _nan_like(x)
+    if x.shape[-1] >= window:
+        # Centre on the first value so the sums of squares do not cancel
+        centred = x - x[..., :1]
+        s1 = _shift_cumsum(centred)
+        s2 = _shift_cumsum(centred * centred)
+        mean = (s1[..., window:] - s1[..., :-window]) / window
+        var = (s2[..., window:] - s2[..., :-window]) / window - mean * mean
+        out[..., window - 1:] = np.sqrt(np.maximum(var, 0.0))
+    return out
+
+
+def ewm(x, alpha: float, seed=None) -> np.ndarray:
+    """Exponential smoothing ``s = alpha * x + (1 - alpha) * s``.
+
+    Without ``seed`` the first value seeds the recursion; with one (an array
+    shaped like ``x`` without its last axis) every value is smoothed on top of it.
+    """
+    x = np.asarray(x, dtype=np.float64)
+    out = _nan_like(x)
+    n = x.shape[-1]
+    if n == 0:
+        return out
+    decay = 1.0 - alpha
+    if seed is None:
+        state = x[..., 0].copy()
+        out[..., 0] = state
+        first = 1
+    else:
+        state = np.asarray(seed, dtype=np.float64).copy()
+        first = 0
+    block = max(1, int(np.log(_BLOCK_GROWTH) / -np.log(decay))) if decay > 0 else n
+    powers = decay ** np.arange(block + 1)
+    for lo in range(first, n, block):
+        hi = min(lo + block, n)
+        k = hi - lo
+        scaled = np.cumsum(x[..., lo:hi] / powers[:k], axis=-1)
+        out[..., lo:hi] = powers[1:k + 1] * state[..., None] + alpha * powers[:k] * scaled
+        state = out[..., hi - 1]
+    return out
+
+
+def ema(x, span: int, seed=None) -> np.ndarray:
+    return ewm(x, 2.0 / (span + 1), seed)
+
+
+def wilder(x, period: int, seed=None) -> np.ndarray:
+    """Wilder's smoothing: the mean of the first ``period`` values, then ``alpha = 1 / period``."""
+    x = np.asarray(x, dtype=np.float64)
+    if seed is not None:
+        return ewm(x, 1.0 / period, seed)
+    out = _nan_like(x)
+    if x.shape[-1] >= period:
+        start = x[..., :period].mean(axis=-1)
+        out[..., period - 1] = start
+        out[..., period:] = ewm(x[..., period:], 1.0 / period, start)
+    return out
+
+
+def true_range(high, low, close) -> np.ndarray:
+    high, low, close = (np.asarray(a, dtype=np.float64) for a in (high, low, close))
+    tr = high - low
+    prev = close[..., :-1]
+    tr[..., 1:] = np.maximum(tr[..., 1:], np.maximum(np.abs(high[..., 1:] - prev), np.abs(low[..., 1:] - prev)))
+    return tr
+
+
+def _rsi(gain: np.ndarray, loss: np.ndarray) -> np.ndarray:
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(loss > 0, 100.0 - 100.0 / (1.0 + gain / loss), np.where(gain > 0, 100.0, 50.0))
+
+
+def _pad_front(x: np.ndarray) -> np.ndarray:
+    """Prepend one NaN along the last axis (diff-based series align to closes)."""
+    return np.concatenate((np.full(x.shape[:-1] + (1,), np.nan), x), axis=-1)
+
+
+def indicators(high, low, close) -> tuple[dict[str, np.ndarray], dict[str, np.ndarray]]:
+    """All :data:`INDICATOR_FIELDS` for full histories, plus the final recursion state."""
+    high, low, close = (np.asarray(a, dtype=np.float64) for a in (high, low, close))
+    fast, slow, signal = MACD_SPANS
+    window, width = BOLLINGER
+    out = {f"sma{w}": sma(close, w) for w in SMA_WINDOWS}
+    out["ema12"] = ema(close, fast)
+    out["ema26"] = ema(close, slow)
+    out["macd"] = out["ema12"] - out["ema26"]
+    out["macdSignal"] = ema(out["macd"], signal)
+    out["macdHist"] = out["macd"] - out["macdSignal"]
+
+    delta = np.diff(close, axis=-1)
+    gain = wilder(np.maximum(delta, 0.0), RSI_PERIOD)
+    loss = wilder(np.maximum(-delta, 0.0), RSI_PERIOD)
+    out["rsi14"] = _pad_front(np.where(np.isnan(gain), np.nan, _rsi(gain, loss)))
+
+    mid = out[f"sma{window}"] if window in SMA_WINDOWS else sma(close, window)
+    band = width * rolling_std(close, window)
+    out["bbUpper"] = mid + band
+    out["bbLower"] = mid - band
+    out["atr14"] = wilder(true_range(high, low, close), ATR_PERIOD)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        returns = np.diff(np.log(close), axis=-1)
+    out["volatility20"] = _pad_front(rolling_std(returns, VOLATILITY_WINDOW) * np.sqrt(TRADING_DAYS))
+
+    state = {
+        "ema12": out["ema12"][..., -1],
+        "ema26": out["ema26"][..., -1],
+        "macdSignal": out["macdSignal"][..., -1],
+        "rsiGain": gain[..., -1] if gain.shape[-1] else np.full(close.shape[:-1], np.nan),
+        "rsiLoss": loss[..., -1] if loss.shape[-1] else np.full(close.shape[:-1], np.nan),
+        "atr14": out["atr14"][..., -1],
+    }
+    return out, state
+
+
+def extend(
+    columns: Mapping[str, np.ndarray], previous: Mapping[str, np.ndarray], state: Mapping[str, float | None]
+) -> tuple[dict[str, np.ndarray], dict[str, np.ndarray]]:
+    """Indicators of 1-D ``columns`` whose first ``len(previous[...])`` bars were already computed.
+
+    Rolling indicators are evaluated over just enough trailing history to fill
+    the new bars; recursive ones continue from ``state``. Histories too short
+    for a state to exist yet are recomputed in full.
+    """
+    high, low, close = (np.asarray(columns[f], dtype=np.float64) for f in ("high", "low", "close"))
+    start = len(previous["macd"])
+    if start == 0 or any(state.get(field) is None for field in STATE_FIELDS):
+        return indicators(high, low, close)
+
+    fast, slow, signal = MACD_SPANS
+    window, width = BOLLINGER
+    lookback = max(SMA_WINDOWS + (window, VOLATILITY_WINDOW + 1))
+    lo = max(0, start - lookback)
+    tail, _ = indicators(high[lo:], low[lo:], close[lo:])
+    new = {field: tail[field][start - lo:] for field in ("sma20", "sma50", "bbUpper", "bbLower", "volatility20")}
+
+    new["ema12"] = ema(close[start:], fast, state["ema12"])
+    new["ema26"] = ema(close[start:], slow, state["ema26"])
+    new["macd"] = new["ema12"] - new["ema26"]
+    new["macdSignal"] = ema(new["macd"], signal, state["macdSignal"])
+    new["macdHist"] = new["macd"] - new["macdSignal"]
+
+    delta = np.diff(close[start - 1:])
+    gain = wilder(np.maximum(delta, 0.0), RSI_PERIOD, state["rsiGain"])
+    loss = wilder(np.maximum(-delta, 0.0), RSI_PERIOD, state["rsiLoss"])
+    new["rsi14"] = _rsi(gain, loss)
+    new["atr14"] = wilder(true_range(high, low, close)[start:], ATR_PERIOD, state["atr14"])
+
+    out = {field: np.concatenate((np.asarray(previous[field], dtype=np.float64), new[field])) for field in INDICATOR_FIELDS}
+    new_state = {
+        "ema12": new["ema12"][-1],
+        "ema26": new["ema26"][-1],
+        "macdSignal": new["macdSignal"][-1],
+        "rsiGain": gain[-1],
+        "rsiLoss": loss[-1],
+        "atr14": new["atr14"][-1],
+    }
+    return out, new_state
+
+
+def _finite(value) -> float | None:
+    value = float(value)
+    return value if np.isfinite(value) else None
+
+
+def summary(values: Mapping[str, np.ndarray], state: Mapping[str, np.ndarray]) -> dict:
+    """JSON-safe metadata for one symbol: the latest value of every indicator and the state."""
+    latest = {field: _finite(values[field][-1]) if len(values[field]) else None for field in INDICATOR_FIELDS}
+    return {**latest, "state": {field: _finite(state[field]) for field in STATE_FIELDS}}
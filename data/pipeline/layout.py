@@ -0,0 +1,217 @@
+"""Force-directed layout and clusters of the correlation network.
+
+:func:`force_layout` runs a Fruchterman–Reingold simulation whose all-pairs
+repulsion is approximated Barnes–Hut style on a quadtree, so each iteration
+costs O(n log n) rather than O(n²). The tree is a stack of regular grids
+(level ``d`` splits the bounding square into ``2**d`` cells a side, indexed
+with ``bincount``): a node feels the nodes of its own and neighbouring leaf
+cells exactly, and everything farther away through the centres of mass of the
+largest cells that are still well separated from it, i.e. the children of
+its parent's neighbours that are not its own neighbours. Every step is
+vectorised over all nodes.
+
+Edges pull in proportion to their (positive) correlation; a weak gravity keeps
+disconnected components on screen.
+
+:func:`threshold_clusters` labels the connected components of the edges at
+or above each threshold. A component at a higher threshold always lies
+inside one at a lower threshold, so the labels form a hierarchy that the
+network view can expand level by level.
+"""
+
+from __future__ import annotations
+
+import numpy as np
+
+ITERATIONS = 300
+GRAVITY = 0.05
+# Target nodes per leaf cell, and the deepest quadtree level
+LEAF_SIZE = 4
+MAX_DEPTH = 10
+
+_EPS = 1e-9
+
+
+def _cells(pos: np.ndarray, lo: np.ndarray, size: float, grid: int) -> tuple[np.ndarray, np.ndarray]:
+    cell = np.floor((pos - lo) / size * grid).astype(np.int64)
+    np.clip(cell, 0, grid - 1, out=cell)
+    return cell[:, 0], cell[:, 1]
+
+
+def _depth(pos: np.ndarray, lo: np.ndarray, size: float) -> int:
+    """Shallowest level whose leaves hold about :data:`LEAF_SIZE` nodes, even where nodes cluster."""
+    n = len(pos)
+    depth = int(np.clip(np.ceil(np.log(max(n, 1) / LEAF_SIZE) / np.log(4)), 1, MAX_DEPTH))
+    while depth < MAX_DEPTH:
+        grid = 1 << depth
+        cx, cy = _cells(pos, lo, size, grid)
+        count = np.bincount(cx * grid + cy)
+        # Near-field pairs grow with the sum of squared occupancies
+        if (count * count).sum() <= 2 * LEAF_SIZE * n:
+            break
+        depth += 1
+    return depth
+
+
+def _pull(delta: np.ndarray, mass: np.ndarray, k2: float) -> np.ndarray:
+    """Repulsion ``k² m / d`` along ``delta`` (pointing away from the source)."""
+    dist2 = np.maximum((delta * delta).sum(axis=-1), _EPS)
+    return delta * (k2 * mass / dist2)[..., None]
+
+
+# Children of the parent's 3x3 neighbourhood: offsets 0..5 from the corner child
+_SPAN = np.arange(6)
+
+
+def _far_field(pos: np.ndarray, lo: np.ndarray, size: float, depth: int, k2: float) -> np.ndarray:
+    """Repulsion from cells well separated from each node, summed over quadtree levels."""
+    n = len(pos)
+    force = np.zeros_like(pos)
+    for level in range(1, depth + 1):
+        grid = 1 << level
+        cx, cy = _cells(pos, lo, size, grid)
+        ids = cx * grid + cy
+        mass = np.bincount(ids, minlength=grid * grid).astype(np.float64)
+        com = np.stack([np.bincount(ids, pos[:, axis], grid * grid) for axis in (0, 1)], axis=1)
+        com /= np.maximum(mass, 1.0)[:, None]
+        # Candidate cells: a 6x6 block of children around each node's parent
+        x = (cx // 2 - 1)[:, None, None] * 2 + _SPAN[None, :, None]
+        y = (cy // 2 - 1)[:, None, None] * 2 + _SPAN[None, None, :]
+        x, y = np.broadcast_arrays(x, y)
+        far = (np.abs(x - cx[:, None, None]) > 1) | (np.abs(y - cy[:, None, None]) > 1)
+        far &= (x >= 0) & (x < grid) & (y >= 0) & (y < grid)
+        node = np.broadcast_to(np.arange(n)[:, None, None], far.shape)[far]
+        cell = (x * grid + y)[far]
+        cell_mass = mass[cell]
+        occupied = cell_mass > 0
+        node, cell, cell_mass = node[occupied], cell[occupied], cell_mass[occupied]
+        push = _pull(pos[node] - com[cell], cell_mass, k2)
+        force[:, 0] += np.bincount(node, push[:, 0], n)
+        force[:, 1] += np.bincount(node, push[:, 1], n)
+    return force
+
+
+def _near_field(pos: np.ndarray, lo: np.ndarray, size: float, depth: int, k2: float) -> np.ndarray:
+    """Exact repulsion between nodes in the same or neighbouring leaf cells."""
+    n = len(pos)
+    grid = 1 << depth
+    cx, cy = _cells(pos, lo, size, grid)
+    ids = cx * grid + cy
+    order = np.argsort(ids, kind="stable")
+    count = np.bincount(ids, minlength=grid * grid)
+    start = np.concatenate(([0], np.cumsum(count)[:-1]))
+    sources, targets = [], []
+    for dx in (-1, 0, 1):
+        for dy in (-1, 0, 1):
+            nx, ny = cx + dx, cy + dy
+            inside = (nx >= 0) & (nx < grid) & (ny >= 0) & (ny < grid)
+            node = np.flatnonzero(inside)
+            cell = nx[inside] * grid + ny[inside]
+            counts = count[cell]
+            total = int(counts.sum())
+            if not total:
+                continue
+            # Every (node, member of the neighbouring cell) pair, without a loop
+            first = np.repeat(start[cell] - (np.cumsum(counts) - counts), counts)
+            sources.append(np.repeat(node, counts))
+            targets.append(order[first + np.arange(total)])
+    force = np.zeros_like(pos)
+    if not sources:
+        return force
+    source, target = np.concatenate(sources), np.concatenate(targets)
+    keep = source != target
+    source, target = source[keep], target[keep]
+    push = _pull(pos[source] - pos[target], 1.0, k2)
+    force[:, 0] = np.bincount(source, push[:, 0], n)
+    force[:, 1] = np.bincount(source, push[:, 1], n)
+    return force
+
+
+def repulsion(pos: np.ndarray, k: float) -> np.ndarray:
+    """Barnes–Hut approximation of the all-pairs repulsion ``k² / d`` on every node."""
+    pos = np.asarray(pos, dtype=np.float64)
+    if len(pos) < 2:
+        return np.zeros_like(pos)
+    lo = pos.min(axis=0)
+    size = float((pos.max(axis=0) - lo).max()) * (1 + 1e-6) + _EPS
+    depth = _depth(pos, lo, size)
+    k2 = k * k
+    return _far_field(pos, lo, size, depth, k2) + _near_field(pos, lo, size, depth, k2)
+
+
+def _attraction(pos: np.ndarray, source: np.ndarray, target: np.ndarray, weight: np.ndarray, k: float) -> np.ndarray:
+    delta = pos[target] - pos[source]
+    dist = np.sqrt((delta * delta).sum(axis=1))
+    pull = delta * (weight * dist / k)[:, None]
+    n = len(pos)
+    force = np.zeros_like(pos)
+    for axis in (0, 1):
+        force[:, axis] = np.bincount(source, pull[:, axis], n) - np.bincount(target, pull[:, axis], n)
+    return force
+
+
+def initial_positions(groups: list, seed: int = 0) -> np.ndarray:
+    """Nodes of each group (e.g. sector) scattered around their own point on a circle."""
+    rng = np.random.default_rng(seed)
+    labels, group = np.unique(np.array([str(g) for g in groups]), return_inverse=True)
+    n = len(groups)
+    radius = np.sqrt(max(n, 1))
+    angle = 2 * np.pi * group / max(len(labels), 1)
+    centre = np.stack([np.cos(angle), np.sin(angle)], axis=1) * radius * (len(labels) > 1)
+    return centre + rng.normal(scale=radius / 4, size=(n, 2))
+
+
+def force_layout(
+    source: np.ndarray,
+    target: np.ndarray,
+    weight: np.ndarray,
+    initial: np.ndarray,
+    iterations: int = ITERATIONS,
+) -> np.ndarray:
+    """Positions of the ``(n, 2)`` ``initial`` nodes after the simulation.
+
+    Only edges with positive ``weight`` attract. The layout is centred on the
+    origin with about one unit of area per node.
+    """
+    pos = np.array(initial, dtype=np.float64)
+    n = len(pos)
+    if n < 2:
+        return pos
+    pos -= pos.mean(axis=0)
+    attract = weight > 0
+    source, target, weight = source[attract], target[attract], weight[attract]
+    k = 1.0
+    temperature = np.sqrt(n) / 10
+    for step in range(iterations):
+        force = repulsion(pos, k) + _attraction(pos, source, target, weight, k) - GRAVITY * pos
+        length = np.sqrt((force * force).sum(axis=1))
+        cool = temperature * (1 - step / iterations)
+        pos += force * (np.minimum(length, cool) / np.maximum(length, _EPS))[:, None]
+    return pos - pos.mean(axis=0)
+
+
+def connected_components(n: int, source: np.ndarray, target: np.ndarray) -> np.ndarray:
+    """Component label of each node, numbered by decreasing component size."""
+    labels = np.arange(n)
+    while True:
+        low = np.minimum(labels[source], labels[target])
+        previous = labels.copy()
+        np.minimum.at(labels, source, low)
+        np.minimum.at(labels, target, low)
+        # Pointer jumping: follow labels to their roots
+        labels = labels[labels]
+        if np.array_equal(labels, previous):
+            break
+    _, label, size = np.unique(labels, return_inverse=True, return_counts=True)
+    rank = np.empty(len(size), dtype=np.int64)
+    rank[np.argsort(-size, kind="stable")] = np.arange(len(size))
+    return rank[label]
+
+
+def threshold_clusters(n: int, source: np.ndarray, target: np.ndarray, correlation: np.ndarray,
+                       thresholds: list[float]) -> list[np.ndarray]:
+    """Components of the positively correlated edges at or above each threshold."""
+    return [
+        connected_components(n, source[keep], target[keep])
+        for keep in (correlation >= threshold for threshold in thresholds)
+    ]
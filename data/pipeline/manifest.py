@@ -0,0 +1,147 @@
+"""Checkpoint manifest for incremental preprocessing.
+
+``processed/manifest.json`` records, for every raw CSV, the byte size that
+was processed with hashes of the first and last 64 KiB of it, and for every
+symbol partition its last bar date, bar count, file size and modification
+time and a content digest. The next run compares against it: a raw file that
+only grew is read from its old end onwards, unchanged files are not read at
+all, and partitions are extended with just the new bars. Anything else (a
+raw file that shrank or changed at either end of its processed bytes, a
+deleted raw file, a partition touched since it was recorded, bars older
+than a partition's last date) calls for a full rebuild. Edits in the middle
+of an already processed raw file go unnoticed; ``--full`` picks those up.
+
+None of these checks reads more than the edges of a file, so a nightly run
+costs what was appended, not the history. A partition's digest is a hash of
+the whole file when it is built and is chained over each batch of appended
+bars after that (:func:`chain_digest`); it changes whenever the symbol's data
+does, which the data server relies on for cache invalidation.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+
+from pipeline.columnar import VERSION as STORE_VERSION
+
+MANIFEST_NAME = "manifest.json"
+MANIFEST_VERSION = 2
+
+_BLOCK = 1 << 20
+# Bytes hashed at each end of the processed part of a raw file
+_EDGE = 1 << 16
+
+
+def file_digest(path: str) -> str:
+    """SHA-256 of the whole file at ``path``."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as fh:
+        for block in iter(lambda: fh.read(_BLOCK), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def edge_digests(path: str, size: int) -> tuple[str, str]:
+    """SHA-256 of the first and of the last ``_EDGE`` bytes of the first ``size`` bytes of ``path``."""
+    with open(path, "rb") as fh:
+        head = hashlib.sha256(fh.read(min(size, _EDGE))).hexdigest()
+        fh.seek(max(0, size - _EDGE))
+        tail = hashlib.sha256(fh.read(min(size, _EDGE))).hexdigest()
+    return head, tail
+
+
+def chain_digest(previous: str, arrays) -> str:
+    """Digest following ``previous`` once the bytes of ``arrays`` are appended."""
+    digest = hashlib.sha256(previous.encode())
+    for values in arrays:
+        digest.update(memoryview(values).cast("B"))
+    return digest.hexdigest()
+
+
+def _fingerprint(path: str) -> dict:
+    stat = os.stat(path)
+    return {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+
+
+def _ends_with_newline(path: str, size: int) -> bool:
+    if size == 0:
+        return True
+    with open(path, "rb") as fh:
+        fh.seek(size - 1)
+        return fh.read(1) == b"\n"
+
+
+class Manifest:
+    """Processed state of the raw files and partitions of one output directory."""
+
+    def __init__(self, out_dir: str, files: dict | None = None, partitions: dict | None = None):
+        self.path = os.path.join(out_dir, MANIFEST_NAME)
+        # raw file name -> {"size", "head", "tail"}
+        self.files: dict[str, dict] = files or {}
+        # symbol -> {"last_date", "rows", "sha256", "size", "mtime_ns"}
+        self.partitions: dict[str, dict] = partitions or {}
+
+    @classmethod
+    def load(cls, out_dir: str) -> Manifest | None:
+        try:
+            with open(os.path.join(out_dir, MANIFEST_NAME)) as fh:
+                data = json.load(fh)
+        except (OSError, ValueError):
+            return None
+        # Partitions written in an older store format are rebuilt, not extended
+        if data.get("version") != MANIFEST_VERSION or data.get("storeVersion") != STORE_VERSION:
+            return None
+        return cls(out_dir, data["files"], data["partitions"])
+
+    def save(self) -> None:
+        tmp = f"{self.path}.tmp"
+        with open(tmp, "w") as fh:
+            json.dump({
+                "version": MANIFEST_VERSION,
+                "storeVersion": STORE_VERSION,
+                "files": self.files,
+                "partitions": self.partitions,
+            }, fh, indent=1)
+        os.replace(tmp, self.path)
+
+    def record_file(self, path: str, size: int) -> None:
+        """Mark the first ``size`` bytes of ``path`` as processed."""
+        head, tail = edge_digests(path, size)
+        self.files[os.path.basename(path)] = {"size": size, "head": head, "tail": tail}
+
+    def record_partition(self, symbol: str, path: str, last_date: str, rows: int, sha256: str) -> None:
+        """Record the partition just written to ``path``, stamped with its current size and mtime."""
+        self.partitions[symbol] = {"last_date": last_date, "rows": rows, "sha256": sha256, **_fingerprint(path)}
+
+    def unread(self, paths: list[str]) -> list[tuple[str, int]] | None:
+        """``(path, offset)`` of the raw bytes not yet processed, or ``None`` if a rebuild is needed.
+
+        Unchanged files are omitted, grown files start at their old size and
+        new files at 0.
+        """
+        names = {os.path.basename(path) for path in paths}
+        if any(name not in names for name in self.files):
+            return None
+        pending = []
+        for path in paths:
+            seen = self.files.get(os.path.basename(path))
+            size = os.path.getsize(path)
+            if seen is None:
+                pending.append((path, 0))
+                continue
+            if size < seen["size"] or not _ends_with_newline(path, seen["size"]):
+                return None
+            if edge_digests(path, seen["size"]) != (seen["head"], seen["tail"]):
+                return None
+            if size > seen["size"]:
+                pending.append((path, seen["size"]))
+        return pending
+
+    def partition_intact(self, symbol: str, path: str) -> bool:
+        """True when ``path`` is still the file recorded for ``symbol`` (same size and mtime)."""
+        entry = self.partitions.get(symbol)
+        if entry is None or not os.path.exists(path):
+            return False
+        return _fingerprint(path) == {"size": entry["size"], "mtime_ns": entry["mtime_ns"]}
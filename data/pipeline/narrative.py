@@ -0,0 +1,342 @@
+"""Rule-compiled narratives for the dashboard's "Data Story" section.
+
+The narrative texts are declared in :data:`RULES`: per section an ordered
+list of rules, each a few threshold conditions on a symbol's latest quote
+(see :func:`features`) and the text shown when it is the first rule to
+match. :func:`compile_section` turns a section into a decision tree once,
+testing each threshold at most once per path and skipping tests an earlier
+branch already decided, and :func:`evaluate` routes every symbol through
+the tree together as index arrays. A nightly run over thousands of symbols
+is a handful of vectorised comparisons per section plus the string
+formatting of the chosen templates.
+
+A section may feed later ones: the ``value`` of the rule that matched
+becomes a feature named after the section (``momentum`` drives the outlook
+and the opportunity score). :func:`write_stories` writes
+``processed/stories/<asOf>.json`` and the same as ``processed/stories.json``::
+
+    {"version": 2, "asOf": "2024-03-01", "sections": ["performance", ...],
+     "symbols": ["AAPL", ...], "symbolAsOf": ["2024-03-01", ...],
+     "text": {"performance": [...], ...}, "opportunity": [...], "ranking": [...]}
+
+``asOf`` is the latest bar date in the store; ``symbolAsOf`` is the date of
+each symbol's own latest bar, which its texts describe and which lags
+``asOf`` for symbols that stopped trading or were not updated.
+
+``ranking`` lists symbol indexes by opportunity score, highest first, ties
+broken by the size of the day's move.
+"""
+
+from __future__ import annotations
+
+import json
+import operator
+import os
+import string
+from typing import NamedTuple
+
+import numpy as np
+
+from pipeline.columnar import ColumnarStore, from_epoch_days
+
+STORIES_NAME = "stories.json"
+STORIES_DIR = "stories"
+STORIES_VERSION = 2
+
+# Values of the momentum section, as the classes of src/js/utils/signals.js
+STRONG_BEARISH, MILD_BEARISH, MILD_BULLISH, STRONG_BULLISH = range(4)
+
+OPS = {">": operator.gt, ">=": operator.ge, "<": operator.lt, "<=": operator.le, "==": operator.eq}
+NEGATED = {">": "<=", ">=": "<", "<": ">=", "<=": ">"}
+
+
+class Condition(NamedTuple):
+    feature: str
+    op: str
+    value: float
+
+
+class Rule(NamedTuple):
+    when: tuple
+    text: str
+    value: float = 0.0
+
+
+class Section(NamedTuple):
+    name: str
+    rules: tuple[Rule, ...]
+
+
+RULES = (
+    Section("momentum", (
+        Rule((("hasIndicators", "==", 1), ("macdHist", ">", 0), ("macd", ">", 0), ("rsi14", ">=", 55)),
+             "🚀 Strong bullish", STRONG_BULLISH),
+        Rule((("hasIndicators", "==", 1), ("macdHist", ">", 0)), "📈 Mild bullish", MILD_BULLISH),
+        Rule((("hasIndicators", "==", 1), ("macd", "<", 0), ("rsi14", "<=", 45)), "⚠️ Strong bearish", STRONG_BEARISH),
+        Rule((("hasIndicators", "==", 1),), "📉 Mild bearish", MILD_BEARISH),
+        # Without indicators, the day's change decides
+        Rule((("changePercent", ">", 2),), "🚀 Strong bullish", STRONG_BULLISH),
+        Rule((("changePercent", ">", 0),), "📈 Mild bullish", MILD_BULLISH),
+        Rule((("changePercent", ">", -2),), "📉 Mild bearish", MILD_BEARISH),
+        Rule((), "⚠️ Strong bearish", STRONG_BEARISH),
+    )),
+    Section("performance", (
+        Rule((("change", ">=", 0),),
+             "{name} is currently trading at ${current:.2f}, showing bullish momentum with a {changePercent:.2f}% "
+             "gain (+{change:.2f}). This upward trajectory suggests strong investor confidence and potential "
+             "continued growth."),
+        Rule((),
+             "{name} is currently trading at ${current:.2f}, facing bearish pressure with a {absChangePercent:.2f}% "
+             "decline (-{absChange:.2f}). This dip could represent a strategic entry point for value-oriented "
+             "investors."),
+    )),
+    Section("volume", (
+        Rule((("volume", ">", 70e6),),
+             "Today's trading volume of {volumeM:.1f}M shares indicates exceptional market interest - nearly double "
+             "the typical volume. This surge suggests significant news or institutional activity driving price "
+             "action."),
+        Rule((("volume", ">", 40e6),),
+             "Today's trading volume of {volumeM:.1f}M shares represents above-average market participation, "
+             "signaling heightened investor attention and potential volatility ahead."),
+        Rule((),
+             "Today's trading volume of {volumeM:.1f}M shares shows steady, controlled trading conditions with "
+             "balanced buyer-seller dynamics typical of stable market periods."),
+    )),
+    Section("context", (
+        # Same sentence as missingMarketCapText in src/js/utils/screener.js
+        Rule((("marketCap", "<=", 0),), "{name} reports no market capitalization."),
+        Rule((("marketCap", ">", 2e12),),
+             "With a market capitalization of ${marketCapT:.2f}T, this stock commands significant market influence "
+             "as a mega-cap leader, often serving as a market bellwether."),
+        Rule((("marketCap", ">", 1e12),),
+             "With a market capitalization of ${marketCapT:.2f}T, this represents a large-cap stalwart with "
+             "substantial institutional ownership and lower volatility profile."),
+        Rule((),
+             "With a market capitalization of ${marketCapT:.2f}T, this mid-to-large cap position offers growth "
+             "potential while maintaining relative stability."),
+    )),
+    # One line per bullet
+    Section("outlook", (
+        Rule((("momentum", "==", STRONG_BULLISH),),
+             "🎯 Strong momentum may continue short-term\n⚠️ Watch for profit-taking at resistance levels\n"
+             "📈 Consider position sizing on pullbacks"),
+        Rule((("momentum", "==", MILD_BULLISH),),
+             "📈 Modest uptrend with room for growth\n✅ Stable foundation for continued gains\n"
+             "🎯 Monitor volume for confirmation"),
+        Rule((),
+             "📉 Potential oversold conditions emerging\n💡 Value opportunity for patient investors\n"
+             "🔍 Watch for reversal signals"),
+    )),
+    Section("risk", (
+        Rule((("volume", ">", 80e6),), "🔴 High (elevated volume suggests volatility)"),
+        Rule((("absChangePercent", ">", 3),), "🟡 Moderate-High (significant price movement)"),
+        Rule((), "🟢 Moderate (stable trading conditions)"),
+    )),
+    Section("opportunity", (
+        Rule((("momentum", "==", STRONG_BULLISH),), "📈 High (momentum play)", 2),
+        Rule((("momentum", "==", STRONG_BEARISH),), "💎 High (value play)", 2),
+        Rule((), "📊 Moderate (steady performer)", 1),
+    )),
+    Section("horizon", (
+        Rule((("volume", ">", 60e6),), "Short-term focus"),
+        Rule((), "Medium-term hold"),
+    )),
+)
+
+
+class Split(NamedTuple):
+    condition: Condition
+    true: object
+    false: object
+
+
+class CompiledSection(NamedTuple):
+    name: str
+    tree: object
+    texts: tuple[str, ...]
+    values: np.ndarray
+    fields: tuple[tuple[str, ...], ...]
+
+
+# Known range of a feature on a tree path: (low, low inclusive, high, high inclusive)
+_ANY = (-np.inf, False, np.inf, False)
+
+
+def _interval(op: str, value: float) -> tuple:
+    return {
+        ">": (value, False, np.inf, False),
+        ">=": (value, True, np.inf, False),
+        "<": (-np.inf, False, value, False),
+        "<=": (-np.inf, False, value, True),
+        "==": (value, True, value, True),
+    }[op]
+
+
+def _intersect(a: tuple, b: tuple) -> tuple:
+    # On equal bounds the exclusive one is the tighter
+    if a[0] == b[0]:
+        low = (a[0], a[1] and b[1])
+    else:
+        low = a[:2] if a[0] > b[0] else b[:2]
+    if a[2] == b[2]:
+        high = (a[2], a[3] and b[3])
+    else:
+        high = a[2:] if a[2] < b[2] else b[2:]
+    return (*low, *high)
+
+
+def _empty(interval: tuple) -> bool:
+    low, low_in, high, high_in = interval
+    return low > high or (low == high and not (low_in and high_in))
+
+
+def _decided(condition: Condition, known: tuple, excluded: frozenset) -> bool | None:
+    """True or False when ``known`` (and the values ``excluded``) settle ``condition``, None when not."""
+    cond = _interval(condition.op, condition.value)
+    if _empty(_intersect(known, cond)) or (condition.op == "==" and condition.value in excluded):
+        return False
+    if condition.op in NEGATED and _empty(_intersect(known, _interval(NEGATED[condition.op], condition.value))):
+        return True
+    if condition.op == "==" and known[0] == known[2] == condition.value:
+        return True
+    return None
+
+
+def _build(rules: list[tuple[int, tuple[Condition, ...]]], known: dict[str, tuple], excluded: dict[str, frozenset]):
+    live = []
+    for index, when in rules:
+        pending = []
+        for condition in when:
+            state = _decided(condition, known.get(condition.feature, _ANY), excluded.get(condition.feature, frozenset()))
+            if state is False:
+                break
+            if state is None:
+                pending.append(condition)
+        else:
+            live.append((index, tuple(pending)))
+    index, pending = live[0]
+    if not pending:
+        return index
+    condition = pending[0]
+    feature = condition.feature
+    current = known.get(feature, _ANY)
+    yes = {**known, feature: _intersect(current, _interval(condition.op, condition.value))}
+    if condition.op in NEGATED:
+        no = {**known, feature: _intersect(current, _interval(NEGATED[condition.op], condition.value))}
+        return Split(condition, _build(live, yes, excluded), _build(live[1:], no, excluded))
+    # The negation of an equality is no interval; remember the value instead
+    no_excluded = {**excluded, feature: excluded.get(feature, frozenset()) | {condition.value}}
+    return Split(condition, _build(live, yes, excluded), _build(live[1:], known, no_excluded))
+
+
+def compile_section(section: Section) -> CompiledSection:
+    """Decision tree choosing the first matching rule; leaves are rule indexes."""
+    rules = [(index, tuple(Condition(*c) for c in rule.when)) for index, rule in enumerate(section.rules)]
+    if not rules or rules[-1][1]:
+        raise ValueError(f"section {section.name!r} must end with an unconditional rule")
+    for _, when in rules:
+        for condition in when:
+            if condition.op not in OPS:
+                raise ValueError(f"section {section.name!r}: unknown operator {condition.op!r}")
+    fields = tuple(
+        tuple(name for _, name, _, _ in string.Formatter().parse(rule.text) if name)
+        for rule in section.rules
+    )
+    return CompiledSection(
+        section.name, _build(rules, {}, {}), tuple(rule.text for rule in section.rules),
+        np.array([rule.value for rule in section.rules], dtype=np.float64), fields,
+    )
+
+
+def compile_rules(rules: tuple[Section, ...] = RULES) -> list[CompiledSection]:
+    return [compile_section(section) for section in rules]
+
+
+def evaluate(tree, features: dict[str, np.ndarray], n: int) -> np.ndarray:
+    """Index of the matching rule for each of ``n`` symbols."""
+    out = np.empty(n, dtype=np.int64)
+    stack = [(tree, np.arange(n))]
+    while stack:
+        node, rows = stack.pop()
+        if not isinstance(node, Split):
+            out[rows] = node
+            continue
+        condition = node.condition
+        mask = OPS[condition.op](features[condition.feature][rows], condition.value)
+        stack.append((node.true, rows[mask]))
+        stack.append((node.false, rows[~mask]))
+    return out
+
+
+def _meta_field(metas: list[dict], field: str) -> np.ndarray:
+    return np.array([meta.get(field) if meta.get(field) is not None else np.nan for meta in metas], dtype=np.float64)
+
+
+def features(store: ColumnarStore, symbols: list[str]) -> dict[str, np.ndarray]:
+    """Per-symbol inputs of the rules, all finite so a branch's negation is exact."""
+    metas = [store.meta(symbol) for symbol in symbols]
+    quotes = {field: _meta_field(metas, field) for field in ("current", "change", "changePercent", "volume", "marketCap")}
+    signals = [meta.get("indicators") or {} for meta in metas]
+    values = {field: _meta_field(signals, field) for field in ("macd", "macdSignal", "macdHist", "rsi14")}
+    has_indicators = np.isfinite(values["macdHist"]) & np.isfinite(values["rsi14"])
+    out = {field: np.nan_to_num(column) for field, column in {**quotes, **values}.items()}
+    out.update(
+        hasIndicators=has_indicators.astype(np.float64),
+        absChange=np.abs(out["change"]),
+        absChangePercent=np.abs(out["changePercent"]),
+        volumeM=out["volume"] / 1e6,
+        marketCapT=out["marketCap"] / 1e12,
+    )
+    return out
+
+
+def narrate(store: ColumnarStore, compiled: list[CompiledSection] | None = None) -> dict:
+    """Texts of every section for every symbol, with the opportunity ranking."""
+    compiled = compiled if compiled is not None else compile_rules()
+    symbols = store.symbols
+    n = len(symbols)
+    values = features(store, symbols)
+    names = np.array([store.meta(symbol).get("name") or symbol for symbol in symbols], dtype=object)
+    text = {}
+    for section in compiled:
+        chosen = evaluate(section.tree, values, n)
+        values[section.name] = section.values[chosen]
+        lines = [""] * n
+        for index, template in enumerate(section.texts):
+            rows = np.flatnonzero(chosen == index)
+            fields = section.fields[index]
+            for row in rows.tolist():
+                row_values = {field: names[row] if field == "name" else values[field][row] for field in fields}
+                lines[row] = template.format_map(row_values)
+        text[section.name] = lines
+
+    opportunity = values["opportunity"]
+    ranking = np.lexsort((-values["absChangePercent"], -opportunity))
+    last_days = np.array([store.column(symbol, "date")[-1] for symbol in symbols], dtype=np.int64)
+    symbol_as_of = from_epoch_days(last_days).astype(str)
+    return {
+        "version": STORIES_VERSION,
+        "asOf": str(from_epoch_days(last_days.max())),
+        "sections": [section.name for section in compiled],
+        "symbols": symbols,
+        "symbolAsOf": symbol_as_of.tolist(),
+        "text": text,
+        "opportunity": opportunity.tolist(),
+        "ranking": ranking.tolist(),
+    }
+
+
+def _write_json(value: dict, path: str) -> None:
+    tmp = f"{path}.tmp"
+    with open(tmp, "w") as fh:
+        json.dump(value, fh, separators=(",", ":"), ensure_ascii=False)
+    os.replace(tmp, path)
+
+
+def write_stories(store_path: str, out_dir: str) -> dict:
+    """Narrate the store into ``stories/<asOf>.json`` and the latest ``stories.json``."""
+    stories = narrate(ColumnarStore(store_path))
+    os.makedirs(os.path.join(out_dir, STORIES_DIR), exist_ok=True)
+    _write_json(stories, os.path.join(out_dir, STORIES_DIR, f"{stories['asOf']}.json"))
+    _write_json(stories, os.path.join(out_dir, STORIES_NAME))
+    return stories
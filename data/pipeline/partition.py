@@ -0,0 +1,56 @@
+"""Per-symbol partitioning of the raw exports.
+
+Raw CSVs are read in chunks and split by symbol into pickled shards, so no
+file is ever loaded whole and every symbol can then be cleaned and built on
+its own worker. Each symbol's result is a one-symbol columnar store under
+``partitions/`` (written atomically by :func:`pipeline.columnar.write_store`);
+:func:`pipeline.columnar.merge_stores` concatenates them into the store the
+dashboard fetches.
+"""
+
+from __future__ import annotations
+
+import os
+
+import pandas as pd
+
+PARTITION_DIR = "partitions"
+SHARD_DIR = ".shards"
+
+
+def partition_path(out_dir: str, symbol: str) -> str:
+    return os.path.join(out_dir, PARTITION_DIR, f"{symbol}.bin")
+
+
+def _read_chunks(path: str, chunk_rows: int, offset: int):
+    if not offset:
+        yield from pd.read_csv(path, chunksize=chunk_rows)
+        return
+    # Rows appended after byte ``offset``: reuse the file's header line for names
+    with open(path, "rb") as fh:
+        names = pd.read_csv(fh, nrows=0).columns
+        fh.seek(offset)
+        yield from pd.read_csv(fh, names=names, header=None, chunksize=chunk_rows)
+
+
+def shard_raw_file(
+    path: str, shard_dir: str, index: int, chunk_rows: int, offset: int = 0
+) -> dict[str, list[str]]:
+    """Split one raw CSV (from byte ``offset``) by ``Symbol`` into ``shard_dir/<symbol>/<index>-<chunk>.pkl``.
+
+    Piece names sort in file and chunk order, so reading a symbol's pieces in
+    sorted order preserves the row order of the raw exports.
+    """
+    pieces: dict[str, list[str]] = {}
+    for chunk_no, chunk in enumerate(_read_chunks(path, chunk_rows, offset)):
+        for symbol, rows in chunk.groupby("Symbol", sort=False):
+            folder = os.path.join(shard_dir, str(symbol))
+            os.makedirs(folder, exist_ok=True)
+            piece = os.path.join(folder, f"{index:06d}-{chunk_no:06d}.pkl")
+            rows.to_pickle(piece)
+            pieces.setdefault(str(symbol), []).append(piece)
+    return pieces
+
+
+def read_shards(pieces: list[str]) -> pd.DataFrame:
+    return pd.concat((pd.read_pickle(piece) for piece in sorted(pieces)), ignore_index=True)
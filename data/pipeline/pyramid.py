@@ -0,0 +1,84 @@
+"""Multi-resolution OHLCV bar pyramid.
+
+Daily bars are rolled up into weekly and monthly bars so the dashboard can
+draw long timeframes from a few hundred pre-aggregated bars instead of
+decades of daily rows. Each coarser bar takes the first open, the highest
+high, the lowest low, the last close and the summed volume of its bucket, and
+is dated by its first trading day.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Mapping
+
+import numpy as np
+
+from pipeline.columnar import FIELDS
+
+# Ordered finest to coarsest; the dashboard relies on this order.
+RESOLUTIONS = ("1d", "1w", "1mo")
+
+
+def _bucket_keys(dates: np.ndarray, resolution: str) -> np.ndarray:
+    days = np.asarray(dates, dtype=np.int64)
+    if resolution == "1d":
+        return days
+    if resolution == "1w":
+        # Epoch day 0 is a Thursday; shift so weeks start on Monday.
+        return (days + 3) // 7
+    if resolution == "1mo":
+        return days.astype("datetime64[D]").astype("datetime64[M]").astype(np.int64)
+    raise ValueError(f"unknown resolution {resolution!r}")
+
+
+def bucket_starts(dates: np.ndarray, resolution: str) -> np.ndarray:
+    """Index of the first bar of every bucket in sorted ``dates``."""
+    keys = _bucket_keys(dates, resolution)
+    if keys.size == 0:
+        return np.empty(0, dtype=np.intp)
+    return np.concatenate(([0], np.flatnonzero(np.diff(keys)) + 1))
+
+
+def rollup(columns: Mapping[str, np.ndarray], starts: np.ndarray) -> dict[str, np.ndarray]:
+    """Aggregate consecutive runs of bars beginning at ``starts``."""
+    if len(starts) == 0:
+        return {field: np.asarray(columns[field])[:0] for field in FIELDS}
+    n = len(columns["date"])
+    ends = np.append(starts[1:], n) - 1
+    return {
+        "date": np.asarray(columns["date"])[starts],
+        "open": np.asarray(columns["open"])[starts],
+        "high": np.maximum.reduceat(columns["high"], starts),
+        "low": np.minimum.reduceat(columns["low"], starts),
+        "close": np.asarray(columns["close"])[ends],
+        "volume": np.add.reduceat(np.asarray(columns["volume"], dtype=np.int64), starts),
+    }
+
+
+def build_pyramid(daily: Mapping[str, np.ndarray]) -> dict[str, dict[str, np.ndarray]]:
+    """Return ``{resolution: columns}`` for every level in :data:`RESOLUTIONS`."""
+    levels = {"1d": dict(daily)}
+    for resolution in RESOLUTIONS[1:]:
+        levels[resolution] = rollup(daily, bucket_starts(daily["date"], resolution))
+    return levels
+
+
+def extend_pyramid(
+    levels: Mapping[str, Mapping[str, np.ndarray]], daily: Mapping[str, np.ndarray]
+) -> dict[str, dict[str, np.ndarray]]:
+    """Pyramid of ``daily``, which extends the daily level of ``levels`` with newer bars.
+
+    Only the last bucket of each coarser level can change, so just the daily
+    bars from its first day onwards are rolled up again.
+    """
+    out = {"1d": dict(daily)}
+    for resolution in RESOLUTIONS[1:]:
+        old = levels[resolution]
+        if not len(old["date"]):
+            out[resolution] = rollup(daily, bucket_starts(daily["date"], resolution))
+            continue
+        first = int(np.searchsorted(daily["date"], old["date"][-1]))
+        tail = {field: np.asarray(daily[field])[first:] for field in FIELDS}
+        fresh = rollup(tail, bucket_starts(tail["date"], resolution))
+        out[resolution] = {field: np.concatenate((np.asarray(old[field])[:-1], fresh[field])) for field in FIELDS}
+    return out
@@ -0,0 +1,41 @@
+"""Rolling-window price statistics.
+
+:func:`latest_stats` produces the per-window summary stored in each symbol's
+metadata, which the dashboard narrative reads instead of rescanning history;
+as live bars arrive the browser keeps it current with the incremental engine
+in ``src/js/utils/rollingStats.js``, which returns summaries in the same
+shape. Rolling series over whole histories live in ``indicators.py``.
+"""
+
+from __future__ import annotations
+
+import numpy as np
+
+WINDOWS = (5, 20, 50)
+
+
+def window_summary(values: np.ndarray) -> dict:
+    """Statistics of one window: ``count``, ``first``, ``last``, ``mean``, ``std``, ``min``, ``max``, ``range``."""
+    values = np.asarray(values, dtype=np.float64)
+    if not len(values):
+        return {"count": 0}
+    low, high = float(values.min()), float(values.max())
+    return {
+        "count": int(len(values)),
+        "first": float(values[0]),
+        "last": float(values[-1]),
+        "mean": float(values.mean()),
+        "std": float(values.std()),
+        "min": low,
+        "max": high,
+        "range": high - low,
+    }
+
+
+def latest_stats(close: np.ndarray, windows: tuple[int, ...] = WINDOWS) -> dict[str, dict]:
+    """Summary of the trailing ``window`` closes for every window size.
+
+    Histories shorter than a window are summarised over the bars available;
+    ``count`` says how many that was.
+    """
+    return {str(window): window_summary(close[-window:]) for window in windows}
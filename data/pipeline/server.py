@@ -0,0 +1,446 @@
+"""HTTP server for the dashboard and range queries over the processed store.
+
+One asyncio event loop serves many keep-alive connections at once; slicing
+and compressing run in worker threads so a large response does not hold up
+the others. Routes:
+
+``GET /api/symbols``
+    Every symbol's metadata and its last :data:`LATEST_BARS` daily bars, as
+    a columnar store (see ``columnar.py``), for the cards and the selector.
+``GET /api/bars?symbol=AAPL&from=2023-01-01&to=2023-12-31&resolution=1d,1w&fields=close,volume``
+    One or more symbols (comma separated) cut to the bars dated within
+    ``[from, to]`` (both optional, ISO dates) at the given resolutions
+    (default all) with the given columns (default all; ``date`` is always
+    included), again as a columnar store. ``points=500`` thins every level
+    to about that many bars (see ``downsample.py``), by merging buckets of
+    bars (``downsample=ohlc``, the default) or keeping the rows LTTB
+    (``lttb``) or the bucket extremes (``minmax``) pick on the close.
+``GET /api/cache``
+    Size, hit rate and eviction counters of the response cache, as JSON.
+anything else
+    A static file below the app root, so the dashboard is served from the
+    same origin as the API.
+
+Responses carry an ``ETag`` derived from the data versions of the symbols
+involved (or the static file's identity) and the normalised query, so a
+matching ``If-None-Match`` is answered with ``304 Not Modified`` before any
+data is read, and are gzip compressed when the client accepts it. Encoded
+API responses are cached in memory until their symbols' data changes (see
+``cache.py``). The store is reopened whenever ``process_data.py`` replaces it.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import gzip
+import hashlib
+import json
+import logging
+import mimetypes
+import os
+import threading
+from collections import OrderedDict
+from collections.abc import Callable
+from typing import NamedTuple
+from urllib.parse import parse_qs, unquote, urlsplit
+
+import numpy as np
+
+from pipeline.cache import QueryCache
+from pipeline.columnar import ColumnarStore, encode_store, public_meta, to_epoch_days
+from pipeline.downsample import MODES, downsample_columns
+
+# Daily bars per symbol in /api/symbols: enough for the latest change
+LATEST_BARS = 2
+# Static files smaller than this are sent uncompressed
+MIN_COMPRESS_BYTES = 1024
+COMPRESS_LEVEL = 6
+# An idle keep-alive connection is closed after this many seconds
+KEEPALIVE_TIMEOUT = 15.0
+MAX_HEADER_LINES = 100
+# Compressed static files kept in memory, keyed by path and file identity
+STATIC_CACHE_SIZE = 32
+
+STORE_CONTENT_TYPE = "application/octet-stream"
+_COMPRESSIBLE = ("text/", "application/json", "application/javascript", "image/svg+xml", STORE_CONTENT_TYPE)
+
+_REASONS = {
+    200: "OK",
+    304: "Not Modified",
+    400: "Bad Request",
+    404: "Not Found",
+    405: "Method Not Allowed",
+    500: "Internal Server Error",
+    503: "Service Unavailable",
+}
+
+log = logging.getLogger(__name__)
+
+
+class HTTPError(Exception):
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+
+
+class Request(NamedTuple):
+    method: str
+    path: str
+    query: dict[str, list[str]]
+    headers: dict[str, str]
+    keep_alive: bool
+
+
+class Response(NamedTuple):
+    status: int
+    body: bytes
+    content_type: str
+    encoding: str | None = None
+
+
+def file_stamp(path: str) -> str:
+    """Identity of a file's current contents as far as ``stat`` can tell."""
+    st = os.stat(path)
+    return f"{st.st_ino:x}-{st.st_mtime_ns:x}-{st.st_size:x}"
+
+
+class StoreHandle:
+    """The processed store, reopened when the file on disk is replaced.
+
+    Each symbol's data version comes from the store (``dataVersion``, written
+    by ``process_data.py``) or, for stores without one, from the file
+    identity. ``on_change`` is called with the symbols whose version changed
+    (or that were added or removed) whenever the store is reopened.
+    """
+
+    def __init__(self, path: str, on_change: Callable[[set[str]], object] | None = None):
+        self.path = path
+        self.on_change = on_change
+        self._store: ColumnarStore | None = None
+        self._stamp: str | None = None
+        self._versions: dict[str, str] = {}
+        self._catalog_version = ""
+        # Requests are answered on worker threads
+        self._lock = threading.Lock()
+
+    def current(self) -> tuple[ColumnarStore, dict[str, str], str]:
+        """``(store, symbol -> data version, version of the whole symbol list)``."""
+        with self._lock:
+            try:
+                stamp = file_stamp(self.path)
+            except OSError:
+                raise HTTPError(503, f"{self.path} has not been built yet") from None
+            if stamp != self._stamp:
+                store = ColumnarStore(self.path)
+                versions = {symbol: store.data_version(symbol) or stamp for symbol in store.symbols}
+                changed = {symbol for symbol in versions.keys() | self._versions.keys()
+                           if versions.get(symbol) != self._versions.get(symbol)}
+                self._store, self._stamp, self._versions = store, stamp, versions
+                self._catalog_version = hashlib.sha1(json.dumps(sorted(versions.items())).encode()).hexdigest()
+                if changed and self.on_change is not None:
+                    self.on_change(changed)
+            return self._store, self._versions, self._catalog_version
+
+
+def _list(query: dict[str, list[str]], name: str) -> list[str] | None:
+    if name not in query:
+        return None
+    return [item for value in query[name] for item in value.split(",") if item]
+
+
+def _day(query: dict[str, list[str]], name: str) -> int | None:
+    if name not in query:
+        return None
+    try:
+        return int(to_epoch_days(query[name][-1]))
+    except ValueError:
+        raise HTTPError(400, f"{name}: expected an ISO date, got {query[name][-1]!r}") from None
+
+
+def bars_query(store: ColumnarStore, query: dict[str, list[str]]) -> dict:
+    """Validated, normalised ``/api/bars`` parameters."""
+    symbols = _list(query, "symbol")
+    if not symbols:
+        raise HTTPError(400, "symbol is required")
+    unknown = [symbol for symbol in symbols if symbol not in store]
+    if unknown:
+        raise HTTPError(404, f"unknown symbols {unknown}")
+    start, end = _day(query, "from"), _day(query, "to")
+    if start is not None and end is not None and start > end:
+        raise HTTPError(400, "from is after to")
+    resolutions = _list(query, "resolution")
+    if resolutions is not None:
+        available = {res for symbol in symbols for res in store.resolutions(symbol)}
+        missing = sorted(set(resolutions) - available)
+        if missing:
+            raise HTTPError(400, f"unknown resolutions {missing}")
+    fields = _list(query, "fields")
+    points = None
+    if "points" in query:
+        try:
+            points = int(query["points"][-1])
+        except ValueError:
+            points = 0
+        if points < 3:
+            raise HTTPError(400, f"points: expected an integer of at least 3, got {query['points'][-1]!r}")
+    mode = query.get("downsample", ["ohlc"])[-1]
+    if mode not in MODES:
+        raise HTTPError(400, f"downsample: expected one of {list(MODES)}, got {mode!r}")
+    return {
+        "symbols": symbols,
+        "from": start,
+        "to": end,
+        "resolutions": resolutions,
+        "fields": None if fields is None else sorted(set(fields) | {"date"}),
+        "points": points,
+        "downsample": mode,
+    }
+
+
+def slice_store(store: ColumnarStore, symbols: list[str], start: int | None = None, end: int | None = None,
+                resolutions: list[str] | None = None, fields: list[str] | None = None,
+                tail: int | None = None, points: int | None = None, downsample: str = "ohlc") -> bytes:
+    """Encode ``symbols`` cut to ``[start, end]`` (epoch days) as a columnar store.
+
+    ``tail`` keeps only the last bars of each level instead. ``points``
+    thins each level of the cut to about that many bars with the
+    ``downsample`` mode of :func:`~pipeline.downsample.downsample_columns`.
+    Missing resolutions or fields of a symbol are skipped rather than rejected.
+    """
+    series = {}
+    for symbol in symbols:
+        levels = {}
+        for res in store.resolutions(symbol):
+            if resolutions is not None and res not in resolutions:
+                continue
+            date = store.column(symbol, "date", res)
+            lo = 0 if start is None else int(np.searchsorted(date, start))
+            hi = len(date) if end is None else int(np.searchsorted(date, end, side="right"))
+            if tail is not None:
+                lo = max(lo, hi - tail)
+            columns = {field: values[lo:hi] for field, values in store.series(symbol, res).items()}
+            if points is not None:
+                columns = downsample_columns(columns, points, downsample)
+            levels[res] = {field: values for field, values in columns.items() if fields is None or field in fields}
+        series[symbol] = levels
+    # Codes of the full store's dictionaries, so slices and the symbol list agree
+    meta = {symbol: public_meta(store.encoded_meta(symbol)) for symbol in symbols}
+    return encode_store(series, meta, store.dictionaries)
+
+
+def _etag(*parts: str) -> str:
+    return '"' + hashlib.sha1("\0".join(parts).encode()).hexdigest()[:20] + '"'
+
+
+def _key(values: list[str] | None) -> tuple[str, ...] | None:
+    return None if values is None else tuple(values)
+
+
+class DataServer:
+    """Routes requests to the API or the static files below ``root``.
+
+    API responses are built, encoded and kept in ``cache`` (see ``cache.py``)
+    under their query and the data versions of their symbols.
+    """
+
+    def __init__(self, store_path: str, root: str, cache: QueryCache | None = None):
+        self.cache = QueryCache() if cache is None else cache
+        self.store = StoreHandle(store_path, self.cache.invalidate)
+        self.root = os.path.realpath(root)
+        self._static: OrderedDict[tuple[str, str], bytes] = OrderedDict()
+
+    def etag(self, request: Request, encoding: str) -> str | None:
+        """ETag of the response to ``request``, computed without reading any bars.
+
+        Each content ``encoding`` is a different representation, so it is
+        part of the tag. ``/api/bars`` tags depend only on the requested
+        symbols' versions and survive ingestion of other symbols.
+        """
+        if request.path == "/api/cache":
+            return None
+        if request.path.startswith("/api/"):
+            _, versions, catalog = self.store.current()
+            symbols = _list(request.query, "symbol") if request.path == "/api/bars" else None
+            state = catalog if symbols is None else ",".join(versions.get(symbol, "") for symbol in symbols)
+            return _etag(request.path, state, json.dumps(sorted(request.query.items())), encoding)
+        path = self._static_path(request.path)
+        return _etag(path, file_stamp(path), encoding) if path else None
+
+    def respond(self, request: Request, encoding: str) -> Response:
+        """The response to ``request``, already in ``encoding`` where it applies."""
+        if request.path == "/api/cache":
+            return Response(200, json.dumps(self.cache.stats()).encode(), "application/json")
+        if request.path == "/api/symbols":
+            store, _, catalog = self.store.current()
+            return self._cached(("symbols", catalog, encoding), store.symbols, encoding,
+                                lambda: slice_store(store, store.symbols, resolutions=["1d"], tail=LATEST_BARS))
+        if request.path == "/api/bars":
+            store, versions, _ = self.store.current()
+            q = bars_query(store, request.query)
+            key = ("bars", tuple(q["symbols"]), q["from"], q["to"], _key(q["resolutions"]), _key(q["fields"]),
+                   q["points"], q["downsample"], tuple(versions[symbol] for symbol in q["symbols"]), encoding)
+            return self._cached(key, q["symbols"], encoding, lambda: slice_store(
+                store, q["symbols"], q["from"], q["to"], q["resolutions"], q["fields"],
+                points=q["points"], downsample=q["downsample"]))
+        if request.path.startswith("/api/"):
+            raise HTTPError(404, f"no such endpoint {request.path}")
+        path = self._static_path(request.path)
+        if path is None:
+            raise HTTPError(404, f"{request.path} not found")
+        content_type = mimetypes.guess_type(path)[0] or "application/octet-stream"
+        with open(path, "rb") as fh:
+            body = fh.read()
+        if encoding == "gzip" and len(body) >= MIN_COMPRESS_BYTES and content_type.startswith(_COMPRESSIBLE):
+            return Response(200, self._compress_static(path, body), content_type, "gzip")
+        return Response(200, body, content_type)
+
+    def _cached(self, key: tuple, symbols: list[str], encoding: str, build: Callable[[], bytes]) -> Response:
+        body = self.cache.get(key)
+        if body is None:
+            body = build()
+            if encoding == "gzip":
+                body = gzip.compress(body, COMPRESS_LEVEL)
+            self.cache.put(key, body, symbols)
+        return Response(200, body, STORE_CONTENT_TYPE, encoding if encoding == "gzip" else None)
+
+    def _static_path(self, url_path: str) -> str | None:
+        relative = unquote(url_path).lstrip("/")
+        path = os.path.realpath(os.path.join(self.root, relative))
+        if path != self.root and not path.startswith(self.root + os.sep):
+            return None
+        if os.path.isdir(path):
+            path = os.path.join(path, "index.html")
+        return path if os.path.isfile(path) else None
+
+    def _compress_static(self, path: str, body: bytes) -> bytes:
+        """``body`` gzipped, compressed once per version of the file."""
+        key = (path, file_stamp(path))
+        if key in self._static:
+            self._static.move_to_end(key)
+            return self._static[key]
+        compressed = self._static[key] = gzip.compress(body, COMPRESS_LEVEL)
+        if len(self._static) > STATIC_CACHE_SIZE:
+            self._static.popitem(last=False)
+        return compressed
+
+
+async def read_request(reader: asyncio.StreamReader) -> Request | None:
+    """The next request on a connection, or ``None`` once the client is done."""
+    line = await reader.readline()
+    if not line.strip():
+        return None
+    parts = line.decode("latin-1").split()
+    if len(parts) != 3:
+        raise HTTPError(400, "malformed request line")
+    method, target, version = parts
+    headers = {}
+    for _ in range(MAX_HEADER_LINES):
+        header = await reader.readline()
+        if header in (b"\r\n", b"\n", b""):
+            break
+        name, _, value = header.decode("latin-1").partition(":")
+        headers[name.strip().lower()] = value.strip()
+    else:
+        raise HTTPError(400, "too many headers")
+    # Request bodies are not used; skip any so the next request parses
+    try:
+        length = int(headers.get("content-length", "0"))
+    except ValueError:
+        raise HTTPError(400, "invalid Content-Length") from None
+    if length < 0:
+        raise HTTPError(400, "invalid Content-Length")
+    if length:
+        await reader.readexactly(length)
+    connection = headers.get("connection", "").lower()
+    keep_alive = connection != "close" if version == "HTTP/1.1" else connection == "keep-alive"
+    url = urlsplit(target)
+    return Request(method, url.path, parse_qs(url.query), headers, keep_alive)
+
+
+def _head(status: int, headers: dict[str, str]) -> bytes:
+    lines = [f"HTTP/1.1 {status} {_REASONS[status]}"]
+    lines += [f"{name}: {value}" for name, value in headers.items()]
+    return ("\r\n".join(lines) + "\r\n\r\n").encode("latin-1")
+
+
+def _accepts_gzip(request: Request) -> bool:
+    return any(part.split(";")[0].strip() == "gzip" for part in request.headers.get("accept-encoding", "").split(","))
+
+
+async def _answer(server: DataServer, request: Request) -> tuple[int, dict[str, str], bytes]:
+    headers = {
+        "Access-Control-Allow-Origin": "*",
+        "Cache-Control": "no-cache",
+        "Connection": "keep-alive" if request.keep_alive else "close",
+    }
+    try:
+        if request.method not in ("GET", "HEAD"):
+            raise HTTPError(405, f"{request.method} is not supported")
+        encoding = "gzip" if _accepts_gzip(request) else "identity"
+        etag = await asyncio.to_thread(server.etag, request, encoding)
+        if etag is not None:
+            headers["ETag"] = etag
+            # The encoding is negotiated, so caches must key on it
+            headers["Vary"] = "Accept-Encoding"
+            if etag in (tag.strip() for tag in request.headers.get("if-none-match", "").split(",")):
+                return 304, headers, b""
+        response = await asyncio.to_thread(server.respond, request, encoding)
+        if response.encoding:
+            headers["Content-Encoding"] = response.encoding
+        headers["Content-Type"] = response.content_type
+        status, body = response.status, response.body
+    except HTTPError as exc:
+        status, body = exc.status, json.dumps({"error": str(exc)}).encode()
+        headers.pop("ETag", None)
+        headers.pop("Vary", None)
+        headers["Content-Type"] = "application/json"
+    headers["Content-Length"] = str(len(body))
+    return status, headers, b"" if request.method == "HEAD" else body
+
+
+async def _fail(writer: asyncio.StreamWriter, status: int, message: str) -> None:
+    """Answer with an error and ``Connection: close``; the connection is dropped next."""
+    body = json.dumps({"error": message}).encode()
+    writer.write(_head(status, {"Content-Length": str(len(body)), "Connection": "close"}) + body)
+    await writer.drain()
+
+
+async def handle(server: DataServer, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+    """Serve requests on one connection until the client closes it or goes idle.
+
+    A request that cannot be parsed is answered with its ``HTTPError``, and
+    any other failure is logged and answered with ``500``, before the
+    connection is closed.
+    """
+    try:
+        while True:
+            try:
+                request = await asyncio.wait_for(read_request(reader), KEEPALIVE_TIMEOUT)
+            except HTTPError as exc:
+                await _fail(writer, exc.status, str(exc))
+                return
+            if request is None:
+                return
+            status, headers, body = await _answer(server, request)
+            writer.write(_head(status, headers) + body)
+            await writer.drain()
+            if not request.keep_alive:
+                return
+    except (ConnectionError, asyncio.IncompleteReadError, asyncio.TimeoutError):
+        pass
+    except Exception:
+        log.exception("request failed")
+        try:
+            await _fail(writer, 500, "internal server error")
+        except ConnectionError:
+            pass
+    finally:
+        writer.close()
+
+
+async def serve(store_path: str, root: str, host: str, port: int, cache: QueryCache | None = None) -> None:
+    """Serve the API for ``store_path`` and the files below ``root`` until cancelled."""
+    server = DataServer(store_path, root, cache)
+    listener = await asyncio.start_server(lambda r, w: handle(server, r, w), host, port)
+    async with listener:
+        await listener.serve_forever()
@@ -0,0 +1,243 @@
+"""Live quote streaming over Server-Sent Events.
+
+Trades (timestamp, symbol, price, size) are folded into the current daily bar
+of their symbol by a daily :class:`~pipeline.bars.BarAggregator` and pushed to
+every connected dashboard as bar deltas. Each
+client keeps only the latest pending bar per symbol, so a slow client receives
+fewer, fresher updates instead of an unbounded backlog, and a burst of ticks
+costs one message per symbol per flush.
+
+The tick source is any async iterator of :class:`Tick`; :func:`replay` reads a
+recorded tick file so the whole path can be exercised without a market feed.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import csv
+import json
+import time
+from collections.abc import AsyncIterator, Iterable, Iterator
+from datetime import datetime, timezone
+from typing import NamedTuple
+from urllib.parse import parse_qs, urlsplit
+
+import numpy as np
+
+from pipeline.bars import BarAggregator
+
+SECONDS_PER_DAY = 86400
+
+# Minimum gap between two messages to one client; ticks in between coalesce.
+FLUSH_INTERVAL = 0.1
+# An SSE comment is sent when nothing traded for this long, to keep proxies open.
+KEEPALIVE_INTERVAL = 15.0
+
+
+class Tick(NamedTuple):
+    timestamp: float  # epoch seconds, UTC
+    symbol: str
+    price: float
+    size: float
+
+
+def parse_timestamp(text: str) -> float:
+    """Epoch seconds from a number or an ISO 8601 string (naive means UTC)."""
+    try:
+        return float(text)
+    except ValueError:
+        moment = datetime.fromisoformat(text.strip().replace("Z", "+00:00"))
+        if moment.tzinfo is None:
+            moment = moment.replace(tzinfo=timezone.utc)
+        return moment.timestamp()
+
+
+def read_ticks(path: str) -> Iterator[Tick]:
+    """Ticks from a CSV with ``Timestamp``, ``Symbol``, ``Price`` and optional ``Size`` columns."""
+    with open(path, newline="") as handle:
+        for row in csv.DictReader(handle):
+            yield Tick(
+                parse_timestamp(row["Timestamp"]),
+                row["Symbol"],
+                float(row["Price"]),
+                float(row.get("Size") or 0),
+            )
+
+
+async def replay(path: str, speed: float = 1.0, loop: bool = False) -> AsyncIterator[Tick]:
+    """Yield the ticks of ``path`` paced by their timestamps.
+
+    ``speed`` multiplies the recorded pace; ``0`` replays as fast as the
+    consumer reads. With ``loop`` the file restarts when it runs out, each
+    pass moved on by the whole days the recording spans, so every pass
+    trades on new days instead of adding to the bars of the last one.
+    """
+    shift = 0.0
+    while True:
+        started = recorded_start = None
+        first = last = None
+        for tick in read_ticks(path):
+            first = tick.timestamp if first is None else min(first, tick.timestamp)
+            last = tick.timestamp if last is None else max(last, tick.timestamp)
+            tick = tick._replace(timestamp=tick.timestamp + shift)
+            if speed > 0:
+                if started is None:
+                    started, recorded_start = time.monotonic(), tick.timestamp
+                delay = (tick.timestamp - recorded_start) / speed - (time.monotonic() - started)
+                if delay > 0:
+                    await asyncio.sleep(delay)
+            else:
+                await asyncio.sleep(0)
+            yield tick
+        if not loop or first is None:
+            return
+        shift += (last // SECONDS_PER_DAY - first // SECONDS_PER_DAY + 1) * SECONDS_PER_DAY
+
+
+def _iso_day(epoch_day: int) -> str:
+    return time.strftime("%Y-%m-%d", time.gmtime(epoch_day * SECONDS_PER_DAY))
+
+
+class DayBars:
+    """Current daily OHLCV bar per symbol, in the dashboard ``priceHistory`` shape.
+
+    Each symbol's ticks go through a daily :class:`~pipeline.bars.BarAggregator`:
+    a tick up to ``watermark`` seconds older than the newest one still reaches
+    its day's bar, older ones are dropped.
+    """
+
+    def __init__(self, watermark: float = 0.0):
+        self.watermark = watermark
+        self._aggregators: dict[str, BarAggregator] = {}
+        # symbol -> the bar of its latest day
+        self._bars: dict[str, dict] = {}
+
+    def update(self, tick: Tick) -> dict | None:
+        """Fold ``tick`` into its symbol's bar; ``None`` if its day has closed."""
+        aggregator = self._aggregators.get(tick.symbol)
+        if aggregator is None:
+            aggregator = self._aggregators[tick.symbol] = BarAggregator("1d", self.watermark)
+        late = aggregator.late
+        aggregator.push((tick.timestamp,), (tick.price,), (tick.size,))
+        if aggregator.late > late:
+            return None
+        day = int(tick.timestamp // SECONDS_PER_DAY)
+        open_bars = aggregator.pending
+        i = int(np.searchsorted(open_bars["start"], day * SECONDS_PER_DAY))
+        bar = {
+            "symbol": tick.symbol,
+            "date": _iso_day(day),
+            **{field: float(open_bars[field][i]) for field in ("open", "high", "low", "close", "volume")},
+        }
+        latest = self._bars.get(tick.symbol)
+        if latest is None or bar["date"] >= latest["date"]:
+            self._bars[tick.symbol] = bar
+        return bar
+
+    def snapshot(self) -> list[dict]:
+        return [dict(bar) for bar in self._bars.values()]
+
+
+class _Client:
+    def __init__(self, symbols: set[str] | None):
+        self.symbols = symbols
+        self.pending: dict[str, dict] = {}
+        self.ready = asyncio.Event()
+
+    def offer(self, bars: Iterable[dict]) -> None:
+        for bar in bars:
+            if self.symbols is None or bar["symbol"] in self.symbols:
+                self.pending[bar["symbol"]] = dict(bar)
+        if self.pending:
+            self.ready.set()
+
+    def take(self) -> list[dict]:
+        bars = list(self.pending.values())
+        self.pending.clear()
+        self.ready.clear()
+        return bars
+
+
+class QuoteHub:
+    """Fans bar updates out to the connected clients."""
+
+    def __init__(self, watermark: float = 0.0):
+        self.bars = DayBars(watermark)
+        self._clients: set[_Client] = set()
+
+    def publish(self, tick: Tick) -> None:
+        bar = self.bars.update(tick)
+        if bar is not None:
+            for client in self._clients:
+                client.offer((bar,))
+
+    async def pump(self, source: AsyncIterator[Tick]) -> None:
+        async for tick in source:
+            self.publish(tick)
+
+    async def stream(self, writer: asyncio.StreamWriter, symbols: set[str] | None) -> None:
+        """Write SSE ``bars`` events to ``writer`` until the client disconnects."""
+        client = _Client(symbols)
+        client.offer(self.bars.snapshot())
+        self._clients.add(client)
+        try:
+            while True:
+                try:
+                    await asyncio.wait_for(client.ready.wait(), KEEPALIVE_INTERVAL)
+                except asyncio.TimeoutError:
+                    writer.write(b": keepalive\n\n")
+                else:
+                    payload = json.dumps(client.take(), separators=(",", ":"))
+                    writer.write(f"event: bars\ndata: {payload}\n\n".encode())
+                await writer.drain()
+                await asyncio.sleep(FLUSH_INTERVAL)
+        finally:
+            self._clients.discard(client)
+
+
+_SSE_HEADERS = (
+    "HTTP/1.1 200 OK\r\n"
+    "Content-Type: text/event-stream\r\n"
+    "Cache-Control: no-cache\r\n"
+    "Connection: keep-alive\r\n"
+    "Access-Control-Allow-Origin: *\r\n"
+    "\r\n"
+)
+
+
+async def _respond(writer: asyncio.StreamWriter, status: str) -> None:
+    writer.write(f"HTTP/1.1 {status}\r\nContent-Length: 0\r\nConnection: close\r\n\r\n".encode())
+    await writer.drain()
+
+
+async def handle(hub: QuoteHub, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+    """Serve ``GET /quotes[?symbols=A,B]`` as an event stream."""
+    try:
+        request = (await reader.readline()).decode("latin-1").split()
+        while (await reader.readline()) not in (b"\r\n", b"\n", b""):
+            pass
+        if len(request) < 2 or request[0] != "GET":
+            await _respond(writer, "405 Method Not Allowed")
+            return
+        url = urlsplit(request[1])
+        if url.path != "/quotes":
+            await _respond(writer, "404 Not Found")
+            return
+        wanted = parse_qs(url.query).get("symbols")
+        symbols = {s for value in wanted for s in value.split(",") if s} if wanted else None
+        writer.write(_SSE_HEADERS.encode())
+        await hub.stream(writer, symbols)
+    except (ConnectionError, asyncio.IncompleteReadError):
+        pass
+    finally:
+        writer.close()
+
+
+async def serve(source: AsyncIterator[Tick], host: str, port: int, watermark: float = 0.0) -> None:
+    """Publish ``source`` to SSE clients on ``host:port`` until cancelled."""
+    hub = QuoteHub(watermark)
+    server = await asyncio.start_server(lambda r, w: handle(hub, r, w), host, port)
+    async with server:
+        await hub.pump(source)
+        # Keep serving the final bars to late subscribers
+        await server.serve_forever()
@@ -0,0 +1,282 @@
+"""Clean the raw exchange exports in ``data/raw`` and build ``data/processed``.
+
+Raw files are CSVs with the columns documented in the README (``Date``,
+``Symbol``, ``Open``, ``High``, ``Low``, ``Close``, ``Volume``, ``Sector``,
+``Market_Cap``, ``Dividend_Yield``) plus optional ``Name`` and ``Industry``.
+The output is a columnar OHLCV store (see ``pipeline/columnar.py``) holding
+daily, weekly and monthly bars per symbol (see ``pipeline/pyramid.py``) plus
+daily technical indicators (see ``pipeline/indicators.py``), which the
+dashboard fetches as a single ArrayBuffer, the sector aggregation cube
+behind the heatmap drill-down (see ``pipeline/cube.py``) and the narrative
+texts of the data story, per symbol and date (see ``pipeline/narrative.py``).
+
+The work is sharded by symbol over a process pool: raw files are split into
+per-symbol shards in chunks, each symbol is built into its own partition under
+``processed/partitions/`` and the partitions are merged into the final store
+(see ``pipeline/partition.py``).
+
+Runs are incremental: ``processed/manifest.json`` (see ``pipeline/manifest.py``)
+records what was processed, so a nightly run only reads the rows appended to
+the raw files and extends the partitions they touch. ``--full`` rebuilds.
+
+Usage::
+
+    cd data/
+    python process_data.py [--raw raw] [--out processed] [--jobs N] [--chunk-rows N] [--full]
+"""
+
+from __future__ import annotations
+
+import argparse
+import glob
+import os
+import shutil
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from itertools import repeat
+
+import numpy as np
+import pandas as pd
+
+from pipeline import indicators
+from pipeline.columnar import FIELDS, ColumnarStore, merge_stores, write_store, to_epoch_days
+from pipeline.cube import CUBE_NAME, write_cube
+from pipeline.manifest import Manifest, chain_digest, file_digest
+from pipeline.narrative import write_stories
+from pipeline.partition import PARTITION_DIR, SHARD_DIR, partition_path, read_shards, shard_raw_file
+from pipeline.pyramid import build_pyramid, extend_pyramid
+from pipeline.rolling import latest_stats
+
+STORE_NAME = "ohlcv.bin"
+
+REQUIRED_COLUMNS = ["Date", "Symbol", "Open", "High", "Low", "Close", "Volume"]
+
+CHUNK_ROWS = 250_000
+
+# Trailing daily bars behind ``avgVolume``, the base of the dashboard's volume ratio
+VOLUME_DAYS = 5
+
+
+def raw_paths(raw_dir: str) -> list[str]:
+    paths = sorted(glob.glob(os.path.join(raw_dir, "*.csv")))
+    if not paths:
+        raise SystemExit(f"no CSV files found in {raw_dir}")
+    return paths
+
+
+def clean(frame: pd.DataFrame) -> pd.DataFrame:
+    """Drop incomplete rows and duplicate bars, keeping the last report per day."""
+    frame = frame.dropna(subset=REQUIRED_COLUMNS)
+    frame = frame[(frame["High"] >= frame["Low"]) & (frame["Volume"] >= 0)]
+    frame = frame.sort_values(["Symbol", "Date"])
+    return frame.drop_duplicates(subset=["Symbol", "Date"], keep="last")
+
+
+def symbol_columns(group: pd.DataFrame) -> dict[str, np.ndarray]:
+    return {
+        "date": to_epoch_days(group["Date"].to_numpy()),
+        "open": group["Open"].to_numpy(np.float64),
+        "high": group["High"].to_numpy(np.float64),
+        "low": group["Low"].to_numpy(np.float64),
+        "close": group["Close"].to_numpy(np.float64),
+        "volume": group["Volume"].to_numpy(np.int64),
+    }
+
+
+def symbol_meta(symbol: str, group: pd.DataFrame, columns: dict[str, np.ndarray], state: dict) -> dict:
+    """Latest-quote summary shown in the dashboard cards.
+
+    ``columns`` carries the daily indicator series as well and ``state`` their
+    recursion state (see ``pipeline/indicators.py``). Descriptive fields
+    (name, sector, ...) are left out when ``group`` lacks them, as rows
+    aggregated from ticks (``aggregate_ticks.py``) do, so extending a
+    partition keeps the ones it has.
+    """
+    last = group.iloc[-1]
+    close = columns["close"]
+    prev = close[-2] if len(close) > 1 else columns["open"][-1]
+    change = float(close[-1] - prev)
+    meta = {
+        "current": round(float(close[-1]), 2),
+        "change": round(change, 2),
+        "changePercent": round(change / prev * 100, 2) if prev else 0.0,
+        "volume": int(columns["volume"][-1]),
+        "avgVolume": round(float(columns["volume"][-VOLUME_DAYS:].mean()), 1),
+        "stats": latest_stats(close),
+        "indicators": indicators.summary(columns, state),
+    }
+    if "Name" in group and pd.notna(last["Name"]):
+        meta["name"] = str(last["Name"])
+    if "Sector" in group and pd.notna(last["Sector"]):
+        meta["sector"] = str(last["Sector"])
+    if "Industry" in group and pd.notna(last["Industry"]):
+        meta["industry"] = str(last["Industry"])
+    if "Market_Cap" in group and pd.notna(last["Market_Cap"]):
+        meta["marketCap"] = float(last["Market_Cap"])
+    if "Dividend_Yield" in group and pd.notna(last["Dividend_Yield"]):
+        meta["dividendYield"] = float(last["Dividend_Yield"])
+    return meta
+
+
+class RebuildRequired(Exception):
+    """New raw data that cannot be appended to the existing partitions."""
+
+
+def _clean_shards(pieces: list[str]) -> pd.DataFrame:
+    frame = read_shards(pieces)
+    frame["Date"] = pd.to_datetime(frame["Date"])
+    return clean(frame)
+
+
+def _partition_entry(dates: np.ndarray, sha256: str) -> dict:
+    """Manifest fields of a partition; the main process stamps the file (Manifest.record_partition)."""
+    return {"last_date": str(np.datetime64(int(dates[-1]), "D")), "rows": len(dates), "sha256": sha256}
+
+
+def build_partition(symbol: str, pieces: list[str], out_dir: str) -> tuple[str, int, dict | None]:
+    """Clean one symbol's shards and write its partition.
+
+    Returns ``(symbol, bars, manifest entry)``; the entry is ``None`` when no
+    valid bars remain.
+    """
+    frame = _clean_shards(pieces)
+    if frame.empty:
+        return symbol, 0, None
+    columns = symbol_columns(frame)
+    values, state = indicators.indicators(columns["high"], columns["low"], columns["close"])
+    levels = build_pyramid(columns)
+    levels["1d"].update(values)
+    path = partition_path(out_dir, symbol)
+    write_store(path, {symbol: levels}, {symbol: {"name": symbol, **symbol_meta(symbol, frame, levels["1d"], state)}})
+    return symbol, len(frame), _partition_entry(columns["date"], file_digest(path))
+
+
+def extend_partition(symbol: str, pieces: list[str], out_dir: str, sha256: str) -> tuple[str, int, dict | None]:
+    """Append the bars in ``pieces`` to an existing partition, like :func:`build_partition`.
+
+    Only the last weekly and monthly buckets are rolled up again, the
+    trailing statistics read just the last window of closes and indicators
+    continue from the state stored in the partition's metadata, so the cost
+    is independent of history length apart from copying the columns. The
+    caller has checked the partition against the manifest; its digest
+    ``sha256`` is chained over the new bars rather than re-hashing the file.
+    """
+    path = partition_path(out_dir, symbol)
+    frame = _clean_shards(pieces)
+    if frame.empty:
+        return symbol, 0, None
+    store = ColumnarStore(path)
+    daily = store.series(symbol)
+    new = symbol_columns(frame)
+    if new["date"][0] <= daily["date"][-1]:
+        raise RebuildRequired(f"{symbol}: new data revises bars already processed")
+    columns = {field: np.concatenate((daily[field], new[field])) for field in FIELDS}
+    values, state = indicators.extend(columns, daily, store.meta(symbol)["indicators"]["state"])
+    columns.update(values)
+    levels = extend_pyramid({res: store.series(symbol, res) for res in store.resolutions(symbol)}, columns)
+    meta = {**store.meta(symbol), **symbol_meta(symbol, frame, columns, state)}
+    write_store(path, {symbol: levels}, {symbol: meta})
+    digest = chain_digest(sha256, (np.ascontiguousarray(new[field]) for field in FIELDS))
+    return symbol, len(frame), _partition_entry(columns["date"], digest)
+
+
+def _shard(
+    pool: ProcessPoolExecutor, reads: list[tuple[str, int]], shard_dir: str, chunk_rows: int
+) -> dict[str, list[str]]:
+    """Shard ``(path, offset)`` reads on the pool; returns symbol -> shard pieces."""
+    pieces: dict[str, list[str]] = {}
+    paths = [path for path, _ in reads]
+    offsets = [offset for _, offset in reads]
+    found_all = pool.map(shard_raw_file, paths, repeat(shard_dir), range(len(reads)), repeat(chunk_rows), offsets)
+    for path, offset, found in zip(paths, offsets, found_all):
+        for symbol, files in found.items():
+            pieces.setdefault(symbol, []).extend(files)
+        print(f"sharded {path}" + (f" from byte {offset}" if offset else ""), flush=True)
+    return pieces
+
+
+def _build(futures: list, manifest: Manifest, out_dir: str) -> int:
+    """Wait for partition futures, reporting progress; returns the number of new bars."""
+    total = 0
+    for done, future in enumerate(as_completed(futures), 1):
+        symbol, bars, entry = future.result()
+        if entry is not None:
+            manifest.record_partition(symbol, partition_path(out_dir, symbol), **entry)
+        total += bars
+        print(f"[{done}/{len(futures)}] {symbol}: +{bars} bars", flush=True)
+    return total
+
+
+def build_store(
+    raw_dir: str, out_dir: str, jobs: int | None = None, chunk_rows: int = CHUNK_ROWS, full: bool = False
+) -> tuple[str, int, int]:
+    """Bring ``out_dir`` up to date with ``raw_dir``; returns ``(path, symbols, new bars)``.
+
+    Unless ``full`` is set, the manifest of the previous run limits the work
+    to raw bytes appended since and the partitions they extend. Anything
+    that is not a pure append falls back to rebuilding every partition.
+    """
+    paths = raw_paths(raw_dir)
+    sizes = {path: os.path.getsize(path) for path in paths}
+    store_path = os.path.join(out_dir, STORE_NAME)
+    shard_dir = os.path.join(out_dir, SHARD_DIR)
+    os.makedirs(os.path.join(out_dir, PARTITION_DIR), exist_ok=True)
+
+    manifest = None if full else Manifest.load(out_dir)
+    reads = manifest.unread(paths) if manifest else None
+    # Partitions are trusted only while untouched since the manifest recorded them
+    if reads is not None and not all(
+        manifest.partition_intact(symbol, partition_path(out_dir, symbol)) for symbol in manifest.partitions
+    ):
+        reads = None
+    if reads == [] and os.path.exists(store_path):
+        print("processed data is up to date")
+        return store_path, len(manifest.partitions), 0
+
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        if reads is not None:
+            shutil.rmtree(shard_dir, ignore_errors=True)
+            pieces = _shard(pool, reads, shard_dir, chunk_rows)
+            futures = [
+                pool.submit(extend_partition, symbol, files, out_dir, manifest.partitions[symbol]["sha256"])
+                if symbol in manifest.partitions else pool.submit(build_partition, symbol, files, out_dir)
+                for symbol, files in pieces.items()
+            ]
+            try:
+                total = _build(futures, manifest, out_dir)
+            except RebuildRequired as exc:
+                print(f"{exc}; rebuilding all partitions", flush=True)
+                reads = None
+        if reads is None:
+            manifest = Manifest(out_dir)
+            reads = [(path, 0) for path in paths]
+            shutil.rmtree(shard_dir, ignore_errors=True)
+            pieces = _shard(pool, reads, shard_dir, chunk_rows)
+            total = _build([pool.submit(build_partition, s, f, out_dir) for s, f in pieces.items()], manifest, out_dir)
+    shutil.rmtree(shard_dir, ignore_errors=True)
+
+    # A partition's hash changes exactly when its symbol's data does
+    versions = {symbol: entry["sha256"][:16] for symbol, entry in manifest.partitions.items()}
+    merge_stores([partition_path(out_dir, symbol) for symbol in sorted(manifest.partitions)], store_path, versions)
+    write_cube(store_path, os.path.join(out_dir, CUBE_NAME))
+    write_stories(store_path, out_dir)
+    for path, _ in reads:
+        manifest.record_file(path, sizes[path])
+    manifest.save()
+    return store_path, len(manifest.partitions), total
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--raw", default="raw", help="directory of raw CSV exports")
+    parser.add_argument("--out", default="processed", help="output directory")
+    parser.add_argument("--jobs", type=int, default=os.cpu_count(), help="worker processes (default: all cores)")
+    parser.add_argument("--chunk-rows", type=int, default=CHUNK_ROWS, help="rows read from a raw file at a time")
+    parser.add_argument("--full", action="store_true", help="ignore the manifest and rebuild every partition")
+    args = parser.parse_args(argv)
+
+    path, symbols, bars = build_store(args.raw, args.out, args.jobs, args.chunk_rows, args.full)
+    print(f"wrote {symbols} symbols, {bars} new bars to {path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,46 @@
+"""Serve the dashboard and the processed store's range-query API over HTTP.
+
+Replaces ``python -m http.server``: the app's files are served with ETags
+and gzip over keep-alive connections, and ``/api/symbols`` and ``/api/bars``
+answer range queries over ``processed/ohlcv.bin`` so the dashboard fetches
+only the bars it shows (see ``pipeline/server.py``). Popular queries are
+answered from an in-memory cache; ``/api/cache`` reports its hit rate.
+
+Usage::
+
+    cd data/
+    python serve.py [--root ..] [--store processed/ohlcv.bin] [--host 127.0.0.1] [--port 8000]
+                    [--cache-mb 64] [--cache-ttl 300]
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import os
+
+from pipeline.cache import DEFAULT_MAX_BYTES, DEFAULT_TTL, QueryCache
+from pipeline.server import serve
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--root", default=os.pardir, help="directory of the dashboard's files")
+    parser.add_argument("--store", default=os.path.join("processed", "ohlcv.bin"), help="processed columnar store")
+    parser.add_argument("--host", default="127.0.0.1", help="interface to listen on")
+    parser.add_argument("--port", type=int, default=8000, help="port to listen on")
+    parser.add_argument("--cache-mb", type=float, default=DEFAULT_MAX_BYTES / 2**20,
+                        help="memory for cached API responses")
+    parser.add_argument("--cache-ttl", type=float, default=DEFAULT_TTL, help="seconds a cached response is kept")
+    args = parser.parse_args(argv)
+
+    print(f"serving {os.path.abspath(args.root)} and {args.store} on http://{args.host}:{args.port}/")
+    try:
+        cache = QueryCache(int(args.cache_mb * 2**20), args.cache_ttl)
+        asyncio.run(serve(args.store, args.root, args.host, args.port, cache))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,43 @@
+"""Stream live quotes to the dashboard over Server-Sent Events.
+
+Replays a recorded tick file (CSV with ``Timestamp``, ``Symbol``, ``Price``
+and ``Size`` columns, see ``sample/ticks.csv``) and serves the resulting
+daily bars at ``http://HOST:PORT/quotes``, which ``src/js/utils/quoteStream.js``
+applies to the dashboard's store as they arrive.
+
+Usage::
+
+    cd data/
+    python stream_quotes.py sample/ticks.csv [--speed 1] [--loop] [--watermark 5] [--port 8765]
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+
+from pipeline.stream import replay, serve
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("ticks", help="recorded tick CSV to replay")
+    parser.add_argument("--host", default="127.0.0.1", help="interface to listen on")
+    parser.add_argument("--port", type=int, default=8765, help="port to listen on")
+    parser.add_argument("--speed", type=float, default=1.0,
+                        help="replay speed multiplier; 0 replays as fast as possible")
+    parser.add_argument("--loop", action="store_true",
+                        help="restart the tick file when it ends, on the days after the recording")
+    parser.add_argument("--watermark", type=float, default=0.0,
+                        help="seconds an out-of-order tick may lag the newest one")
+    args = parser.parse_args(argv)
+
+    print(f"streaming {args.ticks} on http://{args.host}:{args.port}/quotes")
+    try:
+        asyncio.run(serve(replay(args.ticks, args.speed, args.loop), args.host, args.port, args.watermark))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
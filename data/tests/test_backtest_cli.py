@@ -0,0 +1,21 @@
+import argparse
+
+import pytest
+
+from backtest import parse_range
+
+
+def test_window_ranges_are_integers():
+    assert parse_range("fast=5:20:5") == ("fast", [5, 10, 15])
+    assert parse_range("lookback=1,3") == ("lookback", [1, 3])
+    assert all(type(v) is int for v in parse_range("slow=20:40:10.0")[1])
+
+
+def test_thresholds_stay_fractional():
+    assert parse_range("threshold=1,2.5") == ("threshold", [1.0, 2.5])
+
+
+@pytest.mark.parametrize("spec", ["lookback=0:3", "fast=2.5,5", "signal=-1", "slow=5:5", "fast=a", "fast="])
+def test_invalid_ranges_are_rejected(spec):
+    with pytest.raises(argparse.ArgumentTypeError):
+        parse_range(spec)
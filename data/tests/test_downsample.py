@@ -0,0 +1,44 @@
+"""Parity of pipeline/downsample.py with src/js/utils/downsample.js.
+
+``fixtures/downsample_parity.json`` holds inputs with the outputs of the
+JavaScript functions; ``src/js/utils/downsample.test.js`` checks the same
+file, so both sides keep the same points. The sizes are ones where rounding
+float bucket edges would pick different rows.
+"""
+
+import json
+import os
+
+import numpy as np
+import pytest
+
+from pipeline.columnar import FIELDS
+from pipeline.downsample import bucket_edges, lttb, minmax_indices, ohlc_buckets
+
+with open(os.path.join(os.path.dirname(__file__), "fixtures", "downsample_parity.json")) as handle:
+    CASES = json.load(handle)
+
+
+def test_bucket_edges_are_integer_divisions():
+    assert bucket_edges(0, 30, 22).tolist() == [30 * i // 22 for i in range(23)]
+    assert bucket_edges(1, 31, 22)[0] == 1
+    assert bucket_edges(1, 31, 22)[-1] == 31
+
+
+@pytest.mark.parametrize("case", CASES["lttb"], ids=lambda case: f"n{len(case['y'])}-t{case['threshold']}")
+def test_lttb_matches_js(case):
+    y = np.array(case["y"])
+    assert lttb(np.arange(len(y)), y, case["threshold"]).tolist() == case["expected"]
+
+
+@pytest.mark.parametrize("case", CASES["minmax"], ids=lambda case: f"n{len(case['values'])}-b{case['buckets']}")
+def test_minmax_matches_js(case):
+    assert minmax_indices(np.array(case["values"]), case["buckets"]).tolist() == case["expected"]
+
+
+@pytest.mark.parametrize("case", CASES["ohlc"], ids=lambda case: f"n{len(case['date'])}-b{case['buckets']}")
+def test_ohlc_matches_js(case):
+    columns = {field: np.array(case[field]) for field in FIELDS}
+    out = ohlc_buckets(columns, case["buckets"])
+    for field in FIELDS:
+        assert out[field].tolist() == pytest.approx(case["expected"][field]), field
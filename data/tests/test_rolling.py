@@ -0,0 +1,31 @@
+import numpy as np
+import pytest
+
+from pipeline.rolling import WINDOWS, latest_stats, window_summary
+
+
+def test_latest_stats_summarises_the_trailing_closes():
+    close = 100.0 + np.arange(60)
+    stats = latest_stats(close)
+    assert list(stats) == [str(window) for window in WINDOWS]
+    assert stats["20"] == {
+        "count": 20,
+        "first": 140.0,
+        "last": 159.0,
+        "mean": 149.5,
+        "std": pytest.approx(np.arange(20).std()),
+        "min": 140.0,
+        "max": 159.0,
+        "range": 19.0,
+    }
+
+
+def test_short_histories_use_the_bars_available():
+    stats = latest_stats(np.array([3.0, 1.0, 2.0]))
+    assert stats["50"]["count"] == 3
+    assert stats["50"]["min"] == 1.0
+    assert stats["5"] == stats["50"]
+
+
+def test_empty_window():
+    assert window_summary(np.array([])) == {"count": 0}
@@ -0,0 +1,40 @@
+import asyncio
+
+from pipeline.server import DataServer, handle
+
+
+def exchange(server: DataServer, raw: bytes) -> bytes:
+    """Everything ``handle`` writes back to a client sending ``raw``."""
+
+    async def run() -> bytes:
+        listener = await asyncio.start_server(lambda r, w: handle(server, r, w), "127.0.0.1", 0)
+        port = listener.sockets[0].getsockname()[1]
+        async with listener:
+            reader, writer = await asyncio.open_connection("127.0.0.1", port)
+            writer.write(raw)
+            await writer.drain()
+            reply = await asyncio.wait_for(reader.read(), 5)
+            writer.close()
+            return reply
+
+    return asyncio.run(run())
+
+
+def test_invalid_content_length_is_a_bad_request(tmp_path):
+    server = DataServer(str(tmp_path / "missing.bin"), str(tmp_path))
+    reply = exchange(server, b"GET /api/symbols HTTP/1.1\r\nContent-Length: abc\r\n\r\n")
+    assert reply.startswith(b"HTTP/1.1 400 Bad Request\r\n")
+    assert b"Connection: close" in reply
+    assert reply.endswith(b'{"error": "invalid Content-Length"}')
+
+
+def test_unexpected_errors_are_answered_with_500(tmp_path, monkeypatch, caplog):
+    server = DataServer(str(tmp_path / "missing.bin"), str(tmp_path))
+
+    def broken(request, encoding):
+        raise KeyError("boom")
+
+    monkeypatch.setattr(server, "etag", broken)
+    reply = exchange(server, b"GET /api/symbols HTTP/1.1\r\n\r\n")
+    assert reply.startswith(b"HTTP/1.1 500 Internal Server Error\r\n")
+    assert "request failed" in caplog.text
@@ -0,0 +1,301 @@
+import React, { useCallback, useEffect, useMemo, useRef, useState } from 'react';
+import { useElementWidth } from '../utils/useElementWidth';
+import { epochDayToISO } from '../utils/ohlcvStore';
+
+// Candlestick chart drawn on a single <canvas>.
+//
+// Prices map to pixels through a linear scale fitted to the visible bars, so
+// there is no hand-tuned offset math. Each frame is four batched Path2D draws
+// (up/down wicks and bodies). When more bars are visible than there are
+// pixels for them, neighbouring bars are merged per candle slot (first open,
+// max high, min low, last close) on bucket boundaries aligned to absolute bar
+// indices, so 100k+ bars zoom and pan at display frame rate without flicker.
+
+const UP = '#10B981';
+const DOWN = '#EF4444';
+const GRID = '#374151';
+const AXIS = '#9CA3AF';
+const MARGIN = { top: 20, right: 30, bottom: 30, left: 60 };
+const FONT = '12px sans-serif';
+
+// Candle slots narrower than this merge several bars into one candle
+const MIN_CANDLE_PX = 3;
+// Fewest bars a zoom may narrow the view to
+const MIN_VISIBLE_BARS = 5;
+
+// Accepts chart rows ({ date, open, high, low, close }) or store columns
+// (typed arrays with epoch-day dates) and returns columns plus axis labels
+export const toCandleColumns = (data) => {
+  if (data && data.close && typeof data.close.length === 'number' && !Array.isArray(data)) {
+    const { date, open, high, low, close } = data;
+    return { open, high, low, close, labels: Array.from(date, epochDayToISO) };
+  }
+  const n = data.length;
+  const columns = {
+    open: new Float64Array(n),
+    high: new Float64Array(n),
+    low: new Float64Array(n),
+    close: new Float64Array(n),
+    labels: new Array(n)
+  };
+  data.forEach((bar, i) => {
+    columns.open[i] = bar.open;
+    columns.high[i] = bar.high;
+    columns.low[i] = bar.low;
+    columns.close[i] = bar.close;
+    columns.labels[i] = bar.date;
+  });
+  return columns;
+};
+
+// Round tick values covering [min, max]
+const niceTicks = (min, max, count) => {
+  const raw = (max - min) / Math.max(1, count);
+  const magnitude = Math.pow(10, Math.floor(Math.log10(raw)));
+  const step = [1, 2, 5, 10].map(m => m * magnitude).find(s => s >= raw) || raw;
+  const ticks = [];
+  for (let t = Math.ceil(min / step) * step; t <= max; t += step) {
+    ticks.push(t);
+  }
+  return ticks;
+};
+
+// Merged OHLC of bars [from, to)
+const mergeBars = ({ open, high, low, close }, from, to) => {
+  let h = high[from];
+  let l = low[from];
+  for (let i = from + 1; i < to; i++) {
+    if (high[i] > h) h = high[i];
+    if (low[i] < l) l = low[i];
+  }
+  return { open: open[from], high: h, low: l, close: close[to - 1] };
+};
+
+const CanvasCandlestickChart = ({ data, height = 400 }) => {
+  const [containerRef, width] = useElementWidth();
+  const canvasRef = useRef(null);
+  const columns = useMemo(() => toCandleColumns(data), [data]);
+  const count = columns.close.length;
+
+  // Visible bar range [start, end) in fractional bar units; kept in a ref so
+  // zooming and panning redraw without re-rendering React
+  const viewRef = useRef({ start: 0, end: count });
+  const frameRef = useRef(0);
+  const dragRef = useRef(null);
+  const [hovered, setHovered] = useState(null);
+
+  const plotWidth = Math.max(1, width - MARGIN.left - MARGIN.right);
+  const plotHeight = Math.max(1, height - MARGIN.top - MARGIN.bottom);
+
+  // Bars merged per candle at the current zoom
+  const barsPerCandle = useCallback(() => {
+    const { start, end } = viewRef.current;
+    const slot = plotWidth / (end - start);
+    return Math.max(1, Math.ceil(MIN_CANDLE_PX / slot));
+  }, [plotWidth]);
+
+  const draw = useCallback(() => {
+    frameRef.current = 0;
+    const canvas = canvasRef.current;
+    if (!canvas || !width || !count) return;
+
+    const dpr = window.devicePixelRatio || 1;
+    if (canvas.width !== Math.round(width * dpr) || canvas.height !== Math.round(height * dpr)) {
+      canvas.width = Math.round(width * dpr);
+      canvas.height = Math.round(height * dpr);
+    }
+    const ctx = canvas.getContext('2d');
+    ctx.setTransform(dpr, 0, 0, dpr, 0, 0);
+    ctx.clearRect(0, 0, width, height);
+
+    const { start, end } = viewRef.current;
+    const first = Math.max(0, Math.floor(start));
+    const last = Math.min(count, Math.ceil(end));
+    const slot = plotWidth / (end - start);
+    const step = barsPerCandle();
+
+    // Price scale fitted to the visible bars
+    let lo = Infinity;
+    let hi = -Infinity;
+    for (let i = first; i < last; i++) {
+      if (columns.low[i] < lo) lo = columns.low[i];
+      if (columns.high[i] > hi) hi = columns.high[i];
+    }
+    const pad = (hi - lo) * 0.05 || 1;
+    lo -= pad;
+    hi += pad;
+    const y = (price) => MARGIN.top + ((hi - price) / (hi - lo)) * plotHeight;
+    const x = (index) => MARGIN.left + (index - start) * slot;
+
+    // Grid and axes
+    ctx.font = FONT;
+    ctx.fillStyle = AXIS;
+    ctx.strokeStyle = GRID;
+    ctx.setLineDash([3, 3]);
+    ctx.textAlign = 'right';
+    ctx.textBaseline = 'middle';
+    niceTicks(lo, hi, Math.floor(plotHeight / 50)).forEach(tick => {
+      const ty = Math.round(y(tick)) + 0.5;
+      ctx.beginPath();
+      ctx.moveTo(MARGIN.left, ty);
+      ctx.lineTo(MARGIN.left + plotWidth, ty);
+      ctx.stroke();
+      ctx.fillText(`$${tick.toFixed(hi - lo < 10 ? 2 : 0)}`, MARGIN.left - 6, ty);
+    });
+    ctx.setLineDash([]);
+    ctx.textAlign = 'center';
+    ctx.textBaseline = 'top';
+    const labelEvery = Math.max(step, Math.ceil(90 / slot / step) * step);
+    for (let i = Math.ceil(first / labelEvery) * labelEvery; i < last; i += labelEvery) {
+      ctx.fillText(columns.labels[i], x(i + step / 2), MARGIN.top + plotHeight + 8);
+    }
+
+    // Candles, batched into one path per colour and part
+    const upWicks = new Path2D();
+    const downWicks = new Path2D();
+    const upBodies = new Path2D();
+    const downBodies = new Path2D();
+    const bodyWidth = Math.max(1, slot * step * 0.6);
+    for (let b = Math.floor(first / step) * step; b < last; b += step) {
+      const bar = step === 1 ? {
+        open: columns.open[b], high: columns.high[b], low: columns.low[b], close: columns.close[b]
+      } : mergeBars(columns, b, Math.min(b + step, count));
+      const center = x(b + Math.min(step, count - b) / 2);
+      const isGreen = bar.close > bar.open;
+      const wicks = isGreen ? upWicks : downWicks;
+      const bodies = isGreen ? upBodies : downBodies;
+      const wickX = Math.round(center) + 0.5;
+      wicks.moveTo(wickX, y(bar.high));
+      wicks.lineTo(wickX, y(bar.low));
+      const top = y(Math.max(bar.open, bar.close));
+      bodies.rect(center - bodyWidth / 2, top, bodyWidth, Math.max(1, y(Math.min(bar.open, bar.close)) - top));
+    }
+
+    ctx.save();
+    ctx.beginPath();
+    ctx.rect(MARGIN.left, MARGIN.top, plotWidth, plotHeight);
+    ctx.clip();
+    ctx.lineWidth = 1;
+    ctx.strokeStyle = UP;
+    ctx.stroke(upWicks);
+    ctx.strokeStyle = DOWN;
+    ctx.stroke(downWicks);
+    ctx.globalAlpha = 0.8;
+    ctx.fillStyle = UP;
+    ctx.fill(upBodies);
+    ctx.fillStyle = DOWN;
+    ctx.fill(downBodies);
+    ctx.restore();
+  }, [width, height, count, columns, plotWidth, plotHeight, barsPerCandle]);
+
+  const scheduleDraw = useCallback(() => {
+    if (!frameRef.current) {
+      frameRef.current = requestAnimationFrame(draw);
+    }
+  }, [draw]);
+
+  // New data resets the view to the full history
+  useEffect(() => {
+    viewRef.current = { start: 0, end: count };
+    setHovered(null);
+  }, [columns, count]);
+
+  useEffect(() => {
+    scheduleDraw();
+    return () => {
+      cancelAnimationFrame(frameRef.current);
+      frameRef.current = 0;
+    };
+  }, [scheduleDraw]);
+
+  const clampView = (start, span) => {
+    const clampedSpan = Math.min(count, Math.max(Math.min(MIN_VISIBLE_BARS, count), span));
+    const clampedStart = Math.min(count - clampedSpan, Math.max(0, start));
+    viewRef.current = { start: clampedStart, end: clampedStart + clampedSpan };
+  };
+
+  const barAt = (offsetX) => {
+    const { start, end } = viewRef.current;
+    return start + ((offsetX - MARGIN.left) / plotWidth) * (end - start);
+  };
+
+  // Wheel zoom around the cursor; registered natively so it can preventDefault
+  useEffect(() => {
+    const canvas = canvasRef.current;
+    if (!canvas) return undefined;
+    const onWheel = (event) => {
+      event.preventDefault();
+      const { start, end } = viewRef.current;
+      const anchor = barAt(event.offsetX);
+      const span = (end - start) * Math.exp(event.deltaY * 0.001);
+      clampView(anchor - ((anchor - start) / (end - start)) * span, span);
+      setHovered(null);
+      scheduleDraw();
+    };
+    canvas.addEventListener('wheel', onWheel, { passive: false });
+    return () => canvas.removeEventListener('wheel', onWheel);
+  }, [scheduleDraw, plotWidth, count]);
+
+  const handlePointerDown = (event) => {
+    event.currentTarget.setPointerCapture(event.pointerId);
+    dragRef.current = { x: event.nativeEvent.offsetX, start: viewRef.current.start };
+    setHovered(null);
+  };
+
+  const handlePointerMove = (event) => {
+    const { offsetX, offsetY } = event.nativeEvent;
+    const { start, end } = viewRef.current;
+    if (dragRef.current) {
+      const shift = ((offsetX - dragRef.current.x) / plotWidth) * (end - start);
+      clampView(dragRef.current.start - shift, end - start);
+      scheduleDraw();
+      return;
+    }
+    const index = Math.floor(barAt(offsetX));
+    if (offsetX < MARGIN.left || offsetX > MARGIN.left + plotWidth || index < 0 || index >= count) {
+      setHovered(null);
+      return;
+    }
+    const step = barsPerCandle();
+    const from = Math.floor(index / step) * step;
+    const to = Math.min(from + step, count);
+    const label = step === 1 ? columns.labels[from] : `${columns.labels[from]} – ${columns.labels[to - 1]}`;
+    setHovered({ x: offsetX, y: offsetY, label, ...mergeBars(columns, from, to) });
+  };
+
+  const handlePointerUp = (event) => {
+    event.currentTarget.releasePointerCapture(event.pointerId);
+    dragRef.current = null;
+  };
+
+  return (
+    <div ref={containerRef} className="relative" style={{ height }}>
+      <canvas
+        ref={canvasRef}
+        style={{ width: '100%', height, touchAction: 'none', cursor: 'crosshair' }}
+        onPointerDown={handlePointerDown}
+        onPointerMove={handlePointerMove}
+        onPointerUp={handlePointerUp}
+        onPointerLeave={() => setHovered(null)}
+      />
+      {hovered && (
+        <div
+          className="absolute pointer-events-none bg-gray-900 p-3 rounded-lg border border-gray-700"
+          style={{ left: Math.min(hovered.x + 12, width - 160), top: Math.max(0, hovered.y - 60) }}
+        >
+          <p className="text-gray-300 mb-2">{hovered.label}</p>
+          <div className="space-y-1">
+            <p className="text-white">Open: ${hovered.open.toFixed(2)}</p>
+            <p className="text-white">High: ${hovered.high.toFixed(2)}</p>
+            <p className="text-white">Low: ${hovered.low.toFixed(2)}</p>
+            <p className={`font-semibold ${hovered.close > hovered.open ? 'text-green-400' : 'text-red-400'}`}>
+              Close: ${hovered.close.toFixed(2)}
+            </p>
+          </div>
+        </div>
+      )}
+    </div>
+  );
+};
+
+export default CanvasCandlestickChart;
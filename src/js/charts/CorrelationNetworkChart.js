@@ -0,0 +1,459 @@
+import React, { useCallback, useEffect, useMemo, useRef, useState } from 'react';
+import { useElementWidth } from '../utils/useElementWidth';
+import { Quadtree } from '../utils/quadtree';
+import { edgeCount, neighbours, sectorLevel } from '../utils/correlationNetwork';
+
+// Market correlation network drawn on a single <canvas>.
+//
+// Node positions come precomputed per correlation threshold from
+// data/correlate.py, so nothing is simulated on load. Level of detail: while
+// the viewport holds more stocks than can be told apart, each sector is drawn
+// as one bubble with aggregated edges; zooming in (or clicking a sector)
+// expands it into its stocks, found through a quadtree range query. Dragging
+// a stock re-simulates only its neighbourhood in a Web Worker
+// (src/js/workers/layoutWorker.js); the rest of the layout stays put.
+
+const PALETTE = ['#3B82F6', '#10B981', '#F59E0B', '#EF4444', '#8B5CF6', '#EC4899', '#14B8A6', '#F97316', '#6366F1', '#84CC16'];
+const MUTED = '#9CA3AF';
+const POSITIVE_EDGE = 'rgba(59, 130, 246, 0.25)';
+const NEGATIVE_EDGE = 'rgba(239, 68, 68, 0.25)';
+const LABEL = '#374151';
+const FONT = '11px sans-serif';
+const PADDING = 30;
+
+// Stock level is shown once at most this many stocks are in view
+const MAX_DETAIL_NODES = 600;
+// Symbols are labelled from this zoom (pixels per layout unit)
+const LABEL_ZOOM = 25;
+const NODE_RADIUS = 4;
+const HIT_RADIUS_PX = 10;
+
+const createWorker = () => {
+  if (typeof Worker === 'undefined') return null;
+  return new Worker(new URL('../workers/layoutWorker.js', import.meta.url), { type: 'module' });
+};
+
+const CorrelationNetworkChart = ({ network, height = 500 }) => {
+  const [containerRef, width] = useElementWidth();
+  const canvasRef = useRef(null);
+  const [layoutIndex, setLayoutIndex] = useState(0);
+  const [colorBy, setColorBy] = useState('sector');
+  const [hovered, setHovered] = useState(null);
+
+  const layout = network.layouts[Math.min(layoutIndex, network.layouts.length - 1)];
+  const threshold = layout.threshold;
+
+  // Positions are copied so drags can move nodes; kept in refs so dragging
+  // and zooming redraw without re-rendering React
+  const positionsRef = useRef(null);
+  const treeRef = useRef(null);
+  // null until fitted to the layout once the container has been measured
+  const viewRef = useRef(null);
+  const frameRef = useRef(0);
+  const dragRef = useRef(null);
+  const workerRef = useRef(null);
+  const pendingRef = useRef({ busy: false, next: null });
+
+  const sectorIndex = useMemo(() => {
+    const names = [...new Set(network.sectors.map(sector => sector || 'Other'))];
+    return Int32Array.from(network.sectors, sector => names.indexOf(sector || 'Other'));
+  }, [network]);
+
+  const colorOf = useCallback((i) => {
+    const group = colorBy === 'sector' ? sectorIndex[i] : layout.cluster[i];
+    return group < PALETTE.length ? PALETTE[group] : MUTED;
+  }, [colorBy, sectorIndex, layout]);
+
+  const toScreen = (wx, wy) => {
+    const { cx, cy, scale } = viewRef.current;
+    return [(wx - cx) * scale + width / 2, (wy - cy) * scale + height / 2];
+  };
+
+  const toWorld = (sx, sy) => {
+    const { cx, cy, scale } = viewRef.current;
+    return [(sx - width / 2) / scale + cx, (sy - height / 2) / scale + cy];
+  };
+
+  const visibleWorld = () => {
+    const [x0, y0] = toWorld(0, 0);
+    const [x1, y1] = toWorld(width, height);
+    return [x0, y0, x1, y1];
+  };
+
+  const detailed = () => treeRef.current && treeRef.current.countInRect(...visibleWorld()) <= MAX_DETAIL_NODES;
+
+  const fitView = (x, y) => {
+    let minX = Infinity;
+    let minY = Infinity;
+    let maxX = -Infinity;
+    let maxY = -Infinity;
+    for (let i = 0; i < x.length; i++) {
+      minX = Math.min(minX, x[i]);
+      maxX = Math.max(maxX, x[i]);
+      minY = Math.min(minY, y[i]);
+      maxY = Math.max(maxY, y[i]);
+    }
+    const span = Math.max(maxX - minX, maxY - minY) || 1;
+    viewRef.current = {
+      cx: (minX + maxX) / 2,
+      cy: (minY + maxY) / 2,
+      scale: Math.max(1e-3, Math.min(width, height) - 2 * PADDING) / span
+    };
+  };
+
+  const draw = useCallback(() => {
+    frameRef.current = 0;
+    const canvas = canvasRef.current;
+    const positions = positionsRef.current;
+    if (!canvas || !width || !positions) return;
+
+    const dpr = window.devicePixelRatio || 1;
+    if (canvas.width !== Math.round(width * dpr) || canvas.height !== Math.round(height * dpr)) {
+      canvas.width = Math.round(width * dpr);
+      canvas.height = Math.round(height * dpr);
+    }
+    const ctx = canvas.getContext('2d');
+    ctx.setTransform(dpr, 0, 0, dpr, 0, 0);
+    ctx.clearRect(0, 0, width, height);
+    ctx.font = FONT;
+    ctx.textAlign = 'center';
+    ctx.textBaseline = 'top';
+    const { x, y } = positions;
+    if (!viewRef.current) fitView(x, y);
+    const { scale } = viewRef.current;
+
+    if (!detailed()) {
+      // Sector level: bubbles sized by member count, edges by shared links
+      const { nodes, edges } = sectorLevel(network, x, y, threshold);
+      const maxCount = Math.max(1, ...edges.map(edge => edge.count));
+      edges.forEach(edge => {
+        const [ax, ay] = toScreen(nodes[edge.source].x, nodes[edge.source].y);
+        const [bx, by] = toScreen(nodes[edge.target].x, nodes[edge.target].y);
+        ctx.strokeStyle = edge.correlation >= 0 ? POSITIVE_EDGE : NEGATIVE_EDGE;
+        ctx.lineWidth = 1 + 6 * (edge.count / maxCount);
+        ctx.beginPath();
+        ctx.moveTo(ax, ay);
+        ctx.lineTo(bx, by);
+        ctx.stroke();
+      });
+      nodes.forEach((node, s) => {
+        const [sx, sy] = toScreen(node.x, node.y);
+        const radius = 6 + 3 * Math.sqrt(node.count);
+        ctx.globalAlpha = 0.85;
+        ctx.fillStyle = s < PALETTE.length ? PALETTE[s] : MUTED;
+        ctx.beginPath();
+        ctx.arc(sx, sy, radius, 0, 2 * Math.PI);
+        ctx.fill();
+        ctx.globalAlpha = 1;
+        ctx.fillStyle = LABEL;
+        ctx.fillText(`${node.sector} (${node.count})`, sx, sy + radius + 2);
+      });
+      return;
+    }
+
+    // Stock level: only nodes in view, and the edges touching them
+    const visible = new Uint8Array(network.symbols.length);
+    const shown = [];
+    const [x0, y0, x1, y1] = visibleWorld();
+    const margin = NODE_RADIUS / scale;
+    treeRef.current.forEachInRect(x0 - margin, y0 - margin, x1 + margin, y1 + margin, (i) => {
+      visible[i] = 1;
+      shown.push(i);
+    });
+    const positive = new Path2D();
+    const negative = new Path2D();
+    const count = edgeCount(network, threshold);
+    for (let e = 0; e < count; e++) {
+      const a = network.source[e];
+      const b = network.target[e];
+      if (!visible[a] && !visible[b]) continue;
+      const path = network.correlation[e] >= 0 ? positive : negative;
+      const [ax, ay] = toScreen(x[a], y[a]);
+      const [bx, by] = toScreen(x[b], y[b]);
+      path.moveTo(ax, ay);
+      path.lineTo(bx, by);
+    }
+    ctx.lineWidth = 1;
+    ctx.strokeStyle = POSITIVE_EDGE;
+    ctx.stroke(positive);
+    ctx.strokeStyle = NEGATIVE_EDGE;
+    ctx.stroke(negative);
+
+    // One path per colour
+    const byColor = new Map();
+    shown.forEach(i => {
+      const color = colorOf(i);
+      if (!byColor.has(color)) byColor.set(color, new Path2D());
+      const [sx, sy] = toScreen(x[i], y[i]);
+      const path = byColor.get(color);
+      path.moveTo(sx + NODE_RADIUS, sy);
+      path.arc(sx, sy, NODE_RADIUS, 0, 2 * Math.PI);
+    });
+    byColor.forEach((path, color) => {
+      ctx.fillStyle = color;
+      ctx.fill(path);
+    });
+    if (scale >= LABEL_ZOOM) {
+      ctx.fillStyle = LABEL;
+      shown.forEach(i => {
+        const [sx, sy] = toScreen(x[i], y[i]);
+        ctx.fillText(network.symbols[i], sx, sy + NODE_RADIUS + 2);
+      });
+    }
+  }, [width, height, network, threshold, colorOf]);
+
+  const scheduleDraw = useCallback(() => {
+    if (!frameRef.current) {
+      frameRef.current = requestAnimationFrame(draw);
+    }
+  }, [draw]);
+
+  // A new layout (threshold) replaces the positions and restarts the worker's copy
+  useEffect(() => {
+    const x = Float32Array.from(layout.x);
+    const y = Float32Array.from(layout.y);
+    positionsRef.current = { x, y };
+    treeRef.current = new Quadtree(x, y);
+    viewRef.current = null;
+    setHovered(null);
+    if (!workerRef.current) {
+      workerRef.current = createWorker();
+    }
+    if (workerRef.current) {
+      workerRef.current.postMessage({
+        type: 'init', x, y, threshold,
+        source: network.source, target: network.target, correlation: network.correlation
+      });
+    }
+    scheduleDraw();
+  }, [network, layout]);
+
+  // Positions from the worker: apply them and send the latest drag if one queued
+  // up. The quadtree is re-indexed once the drag ends; moved nodes stay close
+  // enough to their indexed cells for the viewport query meanwhile
+  useEffect(() => {
+    const worker = workerRef.current;
+    if (!worker) return undefined;
+    worker.onmessage = ({ data }) => {
+      const { x, y } = positionsRef.current;
+      data.nodes.forEach((i, k) => {
+        x[i] = data.x[k];
+        y[i] = data.y[k];
+      });
+      if (!dragRef.current) {
+        // Last reply of a finished drag
+        treeRef.current = new Quadtree(x, y);
+      }
+      const pending = pendingRef.current;
+      pending.busy = false;
+      if (pending.next) {
+        worker.postMessage(pending.next);
+        pending.busy = true;
+        pending.next = null;
+      }
+      scheduleDraw();
+    };
+    return undefined;
+  }, [scheduleDraw]);
+
+  useEffect(() => () => {
+    if (workerRef.current) workerRef.current.terminate();
+    workerRef.current = null;
+  }, []);
+
+  useEffect(() => {
+    scheduleDraw();
+    return () => {
+      cancelAnimationFrame(frameRef.current);
+      frameRef.current = 0;
+    };
+  }, [scheduleDraw]);
+
+  const zoomAt = (sx, sy, factor) => {
+    const [wx, wy] = toWorld(sx, sy);
+    const scale = viewRef.current.scale * factor;
+    viewRef.current = { scale, cx: wx - (sx - width / 2) / scale, cy: wy - (sy - height / 2) / scale };
+  };
+
+  // Wheel zoom around the cursor; registered natively so it can preventDefault
+  useEffect(() => {
+    const canvas = canvasRef.current;
+    if (!canvas) return undefined;
+    const onWheel = (event) => {
+      event.preventDefault();
+      if (!viewRef.current) return;
+      zoomAt(event.offsetX, event.offsetY, Math.exp(-event.deltaY * 0.001));
+      setHovered(null);
+      scheduleDraw();
+    };
+    canvas.addEventListener('wheel', onWheel, { passive: false });
+    return () => canvas.removeEventListener('wheel', onWheel);
+  }, [scheduleDraw, width, height]);
+
+  const nodeAt = (sx, sy) => {
+    if (!treeRef.current || !detailed()) return -1;
+    const [wx, wy] = toWorld(sx, sy);
+    return treeRef.current.nearest(wx, wy, HIT_RADIUS_PX / viewRef.current.scale);
+  };
+
+  const sectorAt = (sx, sy) => {
+    const { x, y } = positionsRef.current;
+    const { nodes } = sectorLevel(network, x, y, Infinity);
+    let best = null;
+    nodes.forEach(node => {
+      const [nx, ny] = toScreen(node.x, node.y);
+      const radius = 6 + 3 * Math.sqrt(node.count);
+      if ((nx - sx) ** 2 + (ny - sy) ** 2 <= radius * radius) best = node;
+    });
+    return best;
+  };
+
+  const sendDrag = (message) => {
+    const worker = workerRef.current;
+    const pending = pendingRef.current;
+    if (!worker) return;
+    // At most one drag in flight; later ones collapse into the newest
+    if (pending.busy) {
+      pending.next = message;
+    } else {
+      worker.postMessage(message);
+      pending.busy = true;
+    }
+  };
+
+  const handlePointerDown = (event) => {
+    const { offsetX, offsetY } = event.nativeEvent;
+    if (!viewRef.current) return;
+    event.currentTarget.setPointerCapture(event.pointerId);
+    setHovered(null);
+    const node = nodeAt(offsetX, offsetY);
+    if (node >= 0) {
+      dragRef.current = { node };
+      return;
+    }
+    if (!detailed()) {
+      // Clicking a sector bubble zooms into its stocks
+      const sector = sectorAt(offsetX, offsetY);
+      if (sector) {
+        viewRef.current = { ...viewRef.current, cx: sector.x, cy: sector.y };
+        zoomAt(width / 2, height / 2, 3);
+        scheduleDraw();
+        return;
+      }
+    }
+    dragRef.current = { x: offsetX, y: offsetY, cx: viewRef.current.cx, cy: viewRef.current.cy };
+  };
+
+  const handlePointerMove = (event) => {
+    const { offsetX, offsetY } = event.nativeEvent;
+    if (!viewRef.current) return;
+    const drag = dragRef.current;
+    if (drag && drag.node !== undefined) {
+      const [wx, wy] = toWorld(offsetX, offsetY);
+      const { x, y } = positionsRef.current;
+      x[drag.node] = wx;
+      y[drag.node] = wy;
+      sendDrag({ type: 'drag', node: drag.node, x: wx, y: wy });
+      scheduleDraw();
+      return;
+    }
+    if (drag) {
+      const { scale } = viewRef.current;
+      viewRef.current = {
+        scale,
+        cx: drag.cx - (offsetX - drag.x) / scale,
+        cy: drag.cy - (offsetY - drag.y) / scale
+      };
+      scheduleDraw();
+      return;
+    }
+    const node = nodeAt(offsetX, offsetY);
+    if (node >= 0) {
+      setHovered({
+        x: offsetX,
+        y: offsetY,
+        title: network.symbols[node],
+        detail: `${network.sectors[node] || 'Other'} · cluster ${layout.cluster[node] + 1}`,
+        links: neighbours(network, node, threshold).slice(0, 3)
+      });
+      return;
+    }
+    const sector = detailed() ? null : sectorAt(offsetX, offsetY);
+    setHovered(sector ? {
+      x: offsetX,
+      y: offsetY,
+      title: sector.sector,
+      detail: `${sector.count} stocks · click to expand`,
+      links: []
+    } : null);
+  };
+
+  const handlePointerUp = (event) => {
+    event.currentTarget.releasePointerCapture(event.pointerId);
+    if (dragRef.current && dragRef.current.node !== undefined) {
+      if (workerRef.current) workerRef.current.postMessage({ type: 'release' });
+      const { x, y } = positionsRef.current;
+      treeRef.current = new Quadtree(x, y);
+    }
+    dragRef.current = null;
+  };
+
+  return (
+    <div>
+      <div className="flex flex-wrap gap-4 mb-4 text-sm text-gray-700">
+        <label className="flex items-center gap-2">
+          Correlation ≥
+          <select
+            value={layoutIndex}
+            onChange={(e) => setLayoutIndex(Number(e.target.value))}
+            className="border border-gray-300 rounded-lg px-2 py-1"
+          >
+            {network.layouts.map((option, index) => (
+              <option key={option.threshold} value={index}>{option.threshold.toFixed(2)}</option>
+            ))}
+          </select>
+        </label>
+        <label className="flex items-center gap-2">
+          Color by
+          <select
+            value={colorBy}
+            onChange={(e) => setColorBy(e.target.value)}
+            className="border border-gray-300 rounded-lg px-2 py-1"
+          >
+            <option value="sector">Sector</option>
+            <option value="cluster">Correlation cluster</option>
+          </select>
+        </label>
+        <span className="text-gray-500">
+          {network.symbols.length} stocks · {edgeCount(network, threshold)} links · {network.window}-day returns to {network.asOf}
+        </span>
+      </div>
+      <div ref={containerRef} className="relative" style={{ height }}>
+        <canvas
+          ref={canvasRef}
+          style={{ width: '100%', height, touchAction: 'none', cursor: 'grab' }}
+          onPointerDown={handlePointerDown}
+          onPointerMove={handlePointerMove}
+          onPointerUp={handlePointerUp}
+          onPointerLeave={() => setHovered(null)}
+        />
+        {hovered && (
+          <div
+            className="absolute pointer-events-none bg-white p-3 rounded-lg shadow-lg border border-gray-200"
+            style={{ left: Math.min(hovered.x + 12, width - 200), top: Math.max(0, hovered.y - 60) }}
+          >
+            <p className="font-semibold text-gray-800">{hovered.title}</p>
+            <p className="text-gray-600">{hovered.detail}</p>
+            {hovered.links.map(link => (
+              <p key={link.symbol} className={link.correlation >= 0 ? 'text-blue-600' : 'text-red-600'}>
+                {link.symbol}: {link.correlation.toFixed(2)}
+              </p>
+            ))}
+          </div>
+        )}
+      </div>
+    </div>
+  );
+};
+
+export default CorrelationNetworkChart;
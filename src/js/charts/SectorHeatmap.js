@@ -0,0 +1,94 @@
+import React, { useMemo, useState } from 'react';
+import { ROOT, cubeChildren, cubeNode, cubePath } from '../utils/sectorCube';
+
+// Sector performance heatmap with drill-down: market -> sectors ->
+// industries -> stocks. Every level is a slice of the precomputed sector cube
+// (src/js/utils/sectorCube.js), so clicking into a sector with hundreds of
+// stocks reads no bars. Tiles are sized by market-cap weight and coloured by
+// the period return, relative to the largest move on screen.
+
+const MIN_TILE_PERCENT = 8;
+const TILE_HEIGHT = 72;
+const NEUTRAL = '#F3F4F6';
+const LEVEL_LABELS = { sector: 'sectors', industry: 'industries', symbol: 'stocks' };
+
+const tileColor = (value, scale) => {
+  if (!Number.isFinite(value) || !scale) return NEUTRAL;
+  const intensity = Math.min(Math.abs(value) / scale, 1);
+  const alpha = (0.15 + 0.75 * intensity).toFixed(2);
+  return value >= 0 ? `rgba(16, 185, 129, ${alpha})` : `rgba(239, 68, 68, ${alpha})`;
+};
+
+const formatReturn = (value) => (Number.isFinite(value) ? `${value >= 0 ? '+' : ''}${(value * 100).toFixed(2)}%` : 'n/a');
+
+const formatVolume = (value) => (value >= 1e9 ? `${(value / 1e9).toFixed(1)}B` : `${(value / 1e6).toFixed(1)}M`);
+
+const SectorHeatmap = ({ cube, defaultPeriod = '1M' }) => {
+  const [node, setNode] = useState(ROOT);
+  const [period, setPeriod] = useState(cube.periods.includes(defaultPeriod) ? defaultPeriod : cube.periods[0]);
+  const [hovered, setHovered] = useState(null);
+
+  // A reloaded cube may renumber nodes; start again from the market
+  const current = node < cube.name.length ? node : ROOT;
+  const tiles = useMemo(() => cubeChildren(cube, current, period), [cube, current, period]);
+  const scale = tiles.reduce((max, tile) => (Number.isFinite(tile.return) ? Math.max(max, Math.abs(tile.return)) : max), 0);
+  const summary = cubeNode(cube, current, period);
+  const detail = hovered !== null && hovered < cube.name.length ? cubeNode(cube, hovered, period) : null;
+
+  return (
+    <div>
+      <div className="flex flex-wrap items-center justify-between gap-4 mb-4">
+        <div className="flex flex-wrap items-center gap-1 text-sm">
+          {cubePath(cube, current).map((step, index) => (
+            <React.Fragment key={step}>
+              {index > 0 && <span className="text-gray-400">/</span>}
+              <button
+                onClick={() => setNode(step)}
+                className={step === current ? 'font-semibold text-gray-800' : 'text-blue-600 hover:underline'}
+              >
+                {cube.name[step]}
+              </button>
+            </React.Fragment>
+          ))}
+          <span className="text-gray-500 ml-2">{formatReturn(summary.return)}</span>
+        </div>
+        <div className="flex gap-1">
+          {cube.periods.map(option => (
+            <button
+              key={option}
+              onClick={() => setPeriod(option)}
+              className={`px-3 py-1 rounded-lg text-sm ${option === period ? 'bg-blue-600 text-white' : 'bg-gray-100 text-gray-700 hover:bg-gray-200'}`}
+            >
+              {option}
+            </button>
+          ))}
+        </div>
+      </div>
+      <div className="flex flex-wrap gap-1" onMouseLeave={() => setHovered(null)}>
+        {tiles.map(tile => (
+          <div
+            key={tile.node}
+            onClick={() => !tile.leaf && setNode(tile.node)}
+            onMouseEnter={() => setHovered(tile.node)}
+            className={`rounded-md p-2 overflow-hidden ${tile.leaf ? '' : 'cursor-pointer hover:ring-2 hover:ring-blue-400'}`}
+            style={{
+              flex: `${tile.weight || 0} 1 ${Math.max((tile.weight || 0) * 100, MIN_TILE_PERCENT)}%`,
+              height: TILE_HEIGHT,
+              backgroundColor: tileColor(tile.return, scale)
+            }}
+          >
+            <p className="text-sm font-semibold text-gray-800 truncate">{tile.name}</p>
+            <p className="text-xs text-gray-700">{formatReturn(tile.return)}</p>
+          </div>
+        ))}
+      </div>
+      <p className="text-sm text-gray-600 mt-3 h-5">
+        {detail
+          ? `${detail.name}: ${formatReturn(detail.return)} over ${period}, ${(detail.weight * 100).toFixed(1)}% of ${cube.name[cube.parent[detail.node]]}, volume ${formatVolume(detail.volume)}`
+          : `${tiles.length} ${tiles.length ? LEVEL_LABELS[tiles[0].level] : ''} as of ${cube.asOf}${tiles.length && !tiles[0].leaf ? ' - click a tile to drill down' : ''}`}
+      </p>
+    </div>
+  );
+};
+
+export default SectorHeatmap;
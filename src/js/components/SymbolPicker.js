@@ -0,0 +1,101 @@
+import React, { useMemo, useState } from 'react';
+import { buildSymbolTrie } from '../utils/symbolTrie';
+import VirtualList from './VirtualList';
+
+// Searchable stock selector. Typing filters tickers and company names through
+// a prefix trie (src/js/utils/symbolTrie.js) and the matches render in a
+// windowed list, so the full exchange universe costs a few dozen DOM nodes.
+
+const ROW_HEIGHT = 36;
+const LIST_HEIGHT = 288;
+
+const SymbolPicker = ({ store, value, onChange }) => {
+  const [query, setQuery] = useState('');
+  const [open, setOpen] = useState(false);
+  const [active, setActive] = useState(0);
+
+  // Names do not change with live quotes, so the trie lives as long as the store
+  const trie = useMemo(() => buildSymbolTrie(store), [store]);
+  const matches = useMemo(() => trie.search(query), [trie, query]);
+
+  const choose = (symbol) => {
+    onChange(symbol);
+    setQuery('');
+    setOpen(false);
+  };
+
+  const handleKeyDown = (e) => {
+    if (e.key === 'ArrowDown') {
+      e.preventDefault();
+      setOpen(true);
+      setActive(index => Math.min(index + 1, matches.length - 1));
+    } else if (e.key === 'ArrowUp') {
+      e.preventDefault();
+      setActive(index => Math.max(index - 1, 0));
+    } else if (e.key === 'Enter' && matches[active]) {
+      choose(matches[active]);
+    } else if (e.key === 'Escape') {
+      setQuery('');
+      setOpen(false);
+    }
+  };
+
+  const current = store.has(value) ? `${store.meta(value).name} (${value})` : value;
+
+  return (
+    <div className="relative w-72">
+      <input
+        type="text"
+        value={open ? query : current}
+        placeholder="Search ticker or company"
+        onFocus={() => {
+          setOpen(true);
+          setActive(0);
+        }}
+        onBlur={() => setOpen(false)}
+        onChange={(e) => {
+          setQuery(e.target.value);
+          setActive(0);
+          setOpen(true);
+        }}
+        onKeyDown={handleKeyDown}
+        className="w-full border border-gray-300 rounded-lg px-3 py-2 focus:ring-2 focus:ring-blue-500 focus:border-transparent"
+      />
+      {open && (
+        <div className="absolute z-10 mt-1 w-full bg-white border border-gray-200 rounded-lg shadow-lg">
+          {matches.length ? (
+            <VirtualList
+              itemCount={matches.length}
+              rowHeight={ROW_HEIGHT}
+              height={LIST_HEIGHT}
+              scrollToIndex={active}
+              renderRow={(index, style) => {
+                const symbol = matches[index];
+                return (
+                  <div
+                    key={symbol}
+                    style={style}
+                    // Keep focus in the input so the list stays mounted for the click
+                    onMouseDown={(e) => e.preventDefault()}
+                    onClick={() => choose(symbol)}
+                    onMouseEnter={() => setActive(index)}
+                    className={`px-3 flex items-center justify-between cursor-pointer text-sm ${index === active ? 'bg-blue-50' : ''} ${symbol === value ? 'font-semibold' : ''}`}
+                  >
+                    <span className="truncate">{store.meta(symbol).name}</span>
+                    <span className="text-gray-500 ml-2 whitespace-nowrap">
+                      {[store.label(symbol, 'sector'), symbol].filter(Boolean).join(' · ')}
+                    </span>
+                  </div>
+                );
+              }}
+            />
+          ) : (
+            <p className="px-3 py-2 text-sm text-gray-500">No matching symbols</p>
+          )}
+        </div>
+      )}
+    </div>
+  );
+};
+
+export default SymbolPicker;
@@ -0,0 +1,47 @@
+import React, { useEffect, useRef, useState } from 'react';
+
+// Windowed list: of `itemCount` fixed-height rows only those inside the
+// scrolled viewport (plus `overscan` either side) are mounted, so a list of
+// thousands of symbols keeps a few dozen DOM nodes. `renderRow(index, style)`
+// must apply `style`, which positions the row.
+
+const DEFAULT_OVERSCAN = 4;
+
+const VirtualList = ({ itemCount, rowHeight, height, renderRow, overscan = DEFAULT_OVERSCAN, scrollToIndex = null, className = '' }) => {
+  const [scrollTop, setScrollTop] = useState(0);
+  const container = useRef(null);
+
+  // Keep a keyboard-selected row in view
+  useEffect(() => {
+    const node = container.current;
+    if (!node || scrollToIndex === null || scrollToIndex < 0) return;
+    const top = scrollToIndex * rowHeight;
+    if (top < node.scrollTop) {
+      node.scrollTop = top;
+    } else if (top + rowHeight > node.scrollTop + height) {
+      node.scrollTop = top + rowHeight - height;
+    }
+  }, [scrollToIndex, rowHeight, height]);
+
+  const first = Math.max(0, Math.floor(scrollTop / rowHeight) - overscan);
+  const last = Math.min(itemCount, Math.ceil((scrollTop + height) / rowHeight) + overscan);
+  const rows = [];
+  for (let index = first; index < last; index++) {
+    rows.push(renderRow(index, { position: 'absolute', top: index * rowHeight, left: 0, right: 0, height: rowHeight }));
+  }
+
+  return (
+    <div
+      ref={container}
+      className={`overflow-y-auto ${className}`}
+      style={{ height: Math.min(height, itemCount * rowHeight) }}
+      onScroll={(e) => setScrollTop(e.currentTarget.scrollTop)}
+    >
+      <div style={{ position: 'relative', height: itemCount * rowHeight }}>
+        {rows}
+      </div>
+    </div>
+  );
+};
+
+export default VirtualList;
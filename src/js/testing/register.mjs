@@ -0,0 +1,4 @@
+// Preloaded by `npm test` (node --import): installs resolveHooks.mjs
+import { register } from 'node:module';
+
+register('./resolveHooks.mjs', import.meta.url);
@@ -0,0 +1,27 @@
+// Module hooks for running the dashboard sources under Node's test runner.
+//
+// The sources are ES modules in .js files imported without extensions, as a
+// bundler resolves them. Node needs both spelled out: relative specifiers
+// that do not resolve are retried with '.js', and .js files of this repo are
+// loaded as ES modules.
+
+const RELATIVE = /^\.{1,2}\//;
+const HAS_EXTENSION = /\.[cm]?js$/;
+
+export const resolve = async (specifier, context, next) => {
+  try {
+    return await next(specifier, context);
+  } catch (error) {
+    if (error.code !== 'ERR_MODULE_NOT_FOUND' || !RELATIVE.test(specifier) || HAS_EXTENSION.test(specifier)) {
+      throw error;
+    }
+    return next(`${specifier}.js`, context);
+  }
+};
+
+export const load = (url, context, next) => {
+  if (url.startsWith('file:') && url.endsWith('.js') && !url.includes('/node_modules/')) {
+    return next(url, { ...context, format: 'module' });
+  }
+  return next(url, context);
+};
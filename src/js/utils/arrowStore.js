@@ -0,0 +1,216 @@
+// Arrow IPC stream reader for the pipeline's Arrow export.
+//
+// data/export_arrow.py (data/pipeline/arrow.py) writes one Arrow IPC stream
+// per bar resolution with one record batch per symbol. This reads just the
+// subset of the format those streams use - a schema, record batches of
+// fixed-width columns (Int, FloatingPoint, Date[DAY]) and a dictionary batch
+// it skips - straight off the flatbuffer metadata, and turns every batch
+// into typed-array views over the fetched ArrayBuffer. The result is an
+// ordinary OHLCVStore, so the charts read the Arrow buffers with no JSON
+// round trip and no per-row objects, exactly as they read ohlcv.bin. The
+// dashboards load it in place of ohlcv.bin when given storeFormat="arrow".
+
+import { OHLCVStore, loadOHLCVStore, DEFAULT_STORE_URL } from './ohlcvStore';
+
+export const DEFAULT_ARROW_URL = 'data/processed/arrow';
+
+export const ARROW_RESOLUTIONS = ['1d', '1w', '1mo'];
+
+const ARROW_VERSION = 1;
+const METADATA_KEY = 'ohlcv';
+const CONTINUATION = 0xffffffff;
+const LITTLE_ENDIAN = 0;
+
+// MessageHeader and Type union members (format/Message.fbs, format/Schema.fbs)
+const SCHEMA = 1;
+const DICTIONARY_BATCH = 2;
+const RECORD_BATCH = 3;
+const TYPE_INT = 2;
+const TYPE_FLOAT = 3;
+const TYPE_DATE = 8;
+const DATE_DAY = 0;
+const DATE_MILLISECOND = 1;
+
+const INT_TYPES = {
+  8: [Uint8Array, Int8Array],
+  16: [Uint16Array, Int16Array],
+  32: [Uint32Array, Int32Array]
+};
+const FLOAT_TYPES = [null, Float32Array, Float64Array];
+
+// Minimal flatbuffer table access: `field(i)` is the absolute position of
+// field i, or 0 when the table leaves it at its default
+const table = (view, pos) => {
+  const vtable = pos - view.getInt32(pos, true);
+  const vtableSize = view.getUint16(vtable, true);
+  const field = (i) => {
+    const slot = 4 + 2 * i;
+    const offset = slot < vtableSize ? view.getUint16(vtable + slot, true) : 0;
+    return offset ? pos + offset : 0;
+  };
+  const indirect = (at) => at + view.getUint32(at, true);
+  const vector = (i) => {
+    if (!field(i)) return [0, 0];
+    const at = indirect(field(i));
+    return [at + 4, view.getUint32(at, true)];
+  };
+  return {
+    uint8: (i, fallback = 0) => (field(i) ? view.getUint8(field(i)) : fallback),
+    int16: (i, fallback = 0) => (field(i) ? view.getInt16(field(i), true) : fallback),
+    int32: (i, fallback = 0) => (field(i) ? view.getInt32(field(i), true) : fallback),
+    int64: (i, fallback = 0) => (field(i) ? readInt64(view, field(i)) : fallback),
+    table: (i) => (field(i) ? table(view, indirect(field(i))) : null),
+    string: (i) => (field(i) ? readString(view, indirect(field(i))) : null),
+    // [position, length] of a vector's elements
+    vector,
+    tables: (i) => {
+      const [start, length] = vector(i);
+      return Array.from({ length }, (_, k) => table(view, indirect(start + 4 * k)));
+    }
+  };
+};
+
+const readInt64 = (view, pos) => view.getUint32(pos, true) + view.getInt32(pos + 4, true) * 2 ** 32;
+
+const readString = (view, pos) => new TextDecoder().decode(
+  new Uint8Array(view.buffer, view.byteOffset + pos + 4, view.getUint32(pos, true))
+);
+
+// Typed array of a field's type; null for dictionary-encoded fields (the
+// symbol column), which are skipped. Every supported field has exactly a
+// validity and a values (or indices) buffer.
+const arrayType = (field) => {
+  if (field.table(4)) return null;
+  const typeId = field.uint8(2);
+  const type = field.table(3);
+  let Type;
+  if (typeId === TYPE_INT) {
+    Type = INT_TYPES[type.int32(0)]?.[type.uint8(1)];
+  } else if (typeId === TYPE_FLOAT) {
+    Type = FLOAT_TYPES[type.int16(0)];
+  } else if (typeId === TYPE_DATE && type.int16(0, DATE_MILLISECOND) === DATE_DAY) {
+    Type = Int32Array;
+  }
+  if (!Type) {
+    throw new Error(`Unsupported Arrow type of column ${field.string(0)}`);
+  }
+  return Type;
+};
+
+const parseSchema = (schema) => {
+  if (schema.int16(0) !== LITTLE_ENDIAN) {
+    throw new Error('Big-endian Arrow streams are not supported');
+  }
+  const fields = schema.tables(1).map(field => ({ name: field.string(0), Type: arrayType(field) }));
+  const metadata = {};
+  schema.tables(2).forEach(pair => {
+    metadata[pair.string(0)] = pair.string(1);
+  });
+  return { fields, metadata };
+};
+
+// Zero-copy view of a body buffer; copied only if a foreign writer left it
+// misaligned for its element size
+const column = (buffer, offset, length, Type) => {
+  if (offset % Type.BYTES_PER_ELEMENT === 0) {
+    return new Type(buffer, offset, length);
+  }
+  return new Type(buffer.slice(offset, offset + length * Type.BYTES_PER_ELEMENT));
+};
+
+// { rows, columns } of a record batch; each field owns a validity buffer
+// and a values buffer (NaN, not nulls, marks missing derived values)
+const parseBatch = (view, batch, bodyStart, fields) => {
+  const rows = batch.int64(0);
+  const [buffers] = batch.vector(2);
+  const columns = {};
+  fields.forEach(({ name, Type }, i) => {
+    if (!Type) return;
+    const values = buffers + 16 * (2 * i + 1);
+    columns[name] = column(view.buffer, bodyStart + readInt64(view, values), rows, Type);
+  });
+  return { rows, columns };
+};
+
+// Messages of an IPC stream: [header type, header table, body start]
+const messages = (buffer) => {
+  const view = new DataView(buffer);
+  const out = [];
+  let pos = 0;
+  while (pos + 4 <= buffer.byteLength) {
+    let size = view.getUint32(pos, true);
+    pos += 4;
+    if (size === CONTINUATION) {
+      size = view.getUint32(pos, true);
+      pos += 4;
+    }
+    if (size === 0) break;
+    const message = table(view, pos + view.getUint32(pos, true));
+    const bodyStart = pos + size;
+    out.push([message.uint8(1), message.table(2), bodyStart]);
+    pos = bodyStart + message.int64(3);
+  }
+  return { view, messages: out };
+};
+
+// Reads one resolution's stream: { resolution, symbols, dictionaries, meta, levels }
+// with `levels` holding each symbol's { rows, columns } in stream order
+export const parseArrowStream = (buffer) => {
+  const { view, messages: parsed } = messages(buffer);
+  let schema = null;
+  const levels = [];
+  parsed.forEach(([type, header, bodyStart]) => {
+    if (type === SCHEMA) {
+      schema = parseSchema(header);
+    } else if (type === RECORD_BATCH) {
+      if (header.table(3)) {
+        throw new Error('Compressed Arrow record batches are not supported');
+      }
+      levels.push(parseBatch(view, header, bodyStart, schema.fields));
+    } else if (type !== DICTIONARY_BATCH) {
+      throw new Error(`Unexpected Arrow message type ${type}`);
+    }
+  });
+  if (!schema || !schema.metadata[METADATA_KEY]) {
+    throw new Error('Not an OHLCV Arrow stream');
+  }
+  const info = JSON.parse(schema.metadata[METADATA_KEY]);
+  if (info.version !== ARROW_VERSION) {
+    throw new Error(`Unsupported OHLCV Arrow version ${info.version}`);
+  }
+  return { ...info, levels };
+};
+
+// OHLCVStore over the streams of several resolutions (ArrayBuffers, daily first)
+export const parseArrowStore = (buffers) => {
+  const entries = {};
+  let dictionaries = {};
+  buffers.forEach((buffer, i) => {
+    const stream = parseArrowStream(buffer);
+    if (i === 0) dictionaries = stream.dictionaries;
+    stream.symbols.forEach((symbol, k) => {
+      if (!entries[symbol]) {
+        entries[symbol] = { meta: stream.meta[symbol], levels: {} };
+      }
+      entries[symbol].levels[stream.resolution] = stream.levels[k];
+    });
+  });
+  return new OHLCVStore(entries, dictionaries);
+};
+
+export const loadArrowStore = async (url = DEFAULT_ARROW_URL, options, resolutions = ARROW_RESOLUTIONS) => {
+  const buffers = await Promise.all(resolutions.map(async resolution => {
+    const response = await fetch(`${url}/${resolution}.arrows`, options);
+    if (!response.ok) {
+      throw new Error(`Failed to load ${url}/${resolution}.arrows: ${response.status}`);
+    }
+    return response.arrayBuffer();
+  }));
+  return parseArrowStore(buffers);
+};
+
+// Whole store of a static deployment: the Arrow export for 'arrow',
+// ohlcv.bin otherwise ('columnar')
+export const loadStaticStore = (format, options) => (
+  format === 'arrow' ? loadArrowStore(DEFAULT_ARROW_URL, options) : loadOHLCVStore(DEFAULT_STORE_URL, options)
+);
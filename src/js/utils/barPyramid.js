@@ -0,0 +1,64 @@
+// Timeframe -> bar-pyramid level selection.
+//
+// The processed store carries daily, weekly and monthly bars per symbol
+// (data/pipeline/pyramid.py). For a timeframe and a chart width we pick the
+// coarsest level whose bars in that window still fill the chart, so a 20-year
+// ALL view draws a few hundred monthly bars instead of ~5,000 daily ones.
+
+// Finest to coarsest, matching RESOLUTIONS in data/pipeline/pyramid.py
+export const RESOLUTIONS = ['1d', '1w', '1mo'];
+
+export const TIMEFRAMES = ['1W', '1M', '3M', '1Y', 'ALL'];
+
+// Calendar days covered by each timeframe; ALL covers the whole history
+export const TIMEFRAME_DAYS = {
+  '1W': 7,
+  '1M': 30,
+  '3M': 91,
+  '1Y': 365,
+  'ALL': Infinity
+};
+
+// A bar narrower than this stops being readable in the area/bar charts
+export const MIN_PIXELS_PER_BAR = 3;
+
+// Used until the chart container has been measured
+export const DEFAULT_CHART_WIDTH = 600;
+
+// First index i in sorted `values` with values[i] >= target
+export const lowerBound = (values, target, lo = 0, hi = values.length) => {
+  while (lo < hi) {
+    const mid = (lo + hi) >>> 1;
+    if (values[mid] < target) {
+      lo = mid + 1;
+    } else {
+      hi = mid;
+    }
+  }
+  return lo;
+};
+
+const windowFor = (dates, timeframe) => {
+  const end = dates.length;
+  const days = TIMEFRAME_DAYS[timeframe] ?? Infinity;
+  if (!end || days === Infinity) {
+    return { start: 0, end };
+  }
+  return { start: lowerBound(dates, dates[end - 1] - days + 1), end };
+};
+
+// Returns { resolution, start, end } addressing the rows to draw
+export const selectView = (store, symbol, timeframe, pixelWidth) => {
+  const available = RESOLUTIONS.filter(resolution => store.resolutions(symbol).includes(resolution));
+  const target = Math.max(1, Math.floor((pixelWidth || DEFAULT_CHART_WIDTH) / MIN_PIXELS_PER_BAR));
+
+  let view = null;
+  available.forEach(resolution => {
+    const span = windowFor(store.series(symbol, resolution).date, timeframe);
+    // Levels are ordered fine -> coarse: keep moving up while the span fills the chart
+    if (!view || span.end - span.start >= target) {
+      view = { resolution, ...span };
+    }
+  });
+  return view;
+};
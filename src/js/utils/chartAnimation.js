@@ -0,0 +1,16 @@
+// Animation settings for charts that update in place.
+//
+// Charts keep a stable React key and receive new series as props, so Recharts
+// tweens from the previous points instead of remounting the whole SVG tree.
+// Above `limit` points the tween costs more than it shows, so animation is
+// switched off and an update lands in a single frame.
+
+export const ANIMATION_POINT_LIMIT = 500;
+
+// Short enough that stock/timeframe switches feel immediate
+export const TRANSITION_MS = 400;
+
+export const chartAnimation = (pointCount, limit = ANIMATION_POINT_LIMIT) => ({
+  isAnimationActive: pointCount <= limit,
+  animationDuration: TRANSITION_MS
+});
@@ -0,0 +1,116 @@
+// Correlation network reader.
+//
+// data/correlate.py writes processed/correlation.json: the symbols (with
+// sectors) as nodes and the pairs whose rolling return correlation passed the
+// pipeline threshold as columnar edge arrays, sorted by descending absolute
+// correlation, plus a precomputed layout and cluster labels per threshold.
+// Edges are loaded into typed arrays once; a stricter threshold is just a
+// shorter prefix, found by binary search, so the threshold slider never
+// rescans or recomputes the matrix. sectorLevel() aggregates a layout into
+// one node per sector for the zoomed-out level of detail.
+
+export const DEFAULT_NETWORK_URL = 'data/processed/correlation.json';
+
+const NETWORK_VERSION = 2;
+
+export const parseCorrelationNetwork = (json) => {
+  if (json.version !== NETWORK_VERSION) {
+    throw new Error(`Unsupported correlation network version ${json.version}`);
+  }
+  const { source, target, correlation } = json.edges;
+  return {
+    asOf: json.asOf,
+    window: json.window,
+    threshold: json.threshold,
+    symbols: json.symbols,
+    sectors: json.sectors,
+    source: Int32Array.from(source),
+    target: Int32Array.from(target),
+    correlation: Float32Array.from(correlation),
+    layouts: json.layouts.map(({ threshold, x, y, cluster }) => ({
+      threshold,
+      x: Float32Array.from(x),
+      y: Float32Array.from(y),
+      cluster: Int32Array.from(cluster)
+    }))
+  };
+};
+
+export const loadCorrelationNetwork = async (url = DEFAULT_NETWORK_URL, options) => {
+  const response = await fetch(url, options);
+  if (!response.ok) {
+    throw new Error(`Failed to load ${url}: ${response.status}`);
+  }
+  return parseCorrelationNetwork(await response.json());
+};
+
+// Number of edges with |correlation| >= threshold (they are the first ones)
+export const edgeCount = ({ correlation }, threshold) => {
+  let lo = 0;
+  let hi = correlation.length;
+  while (lo < hi) {
+    const mid = (lo + hi) >>> 1;
+    if (Math.abs(correlation[mid]) >= threshold) {
+      lo = mid + 1;
+    } else {
+      hi = mid;
+    }
+  }
+  return lo;
+};
+
+// Edges of one node above a threshold, strongest first
+export const neighbours = (network, node, threshold) => {
+  const count = edgeCount(network, threshold);
+  const result = [];
+  for (let i = 0; i < count; i++) {
+    if (network.source[i] === node) {
+      result.push({ symbol: network.symbols[network.target[i]], correlation: network.correlation[i] });
+    } else if (network.target[i] === node) {
+      result.push({ symbol: network.symbols[network.source[i]], correlation: network.correlation[i] });
+    }
+  }
+  return result;
+};
+
+// One node per sector at the centroid of its members (positions x/y), and one
+// edge per sector pair summarising the stock edges above `threshold` between
+// them. Symbols without a sector share the 'Other' node.
+export const sectorLevel = (network, x, y, threshold) => {
+  const index = new Map();
+  const member = new Int32Array(network.symbols.length);
+  const nodes = [];
+  network.sectors.forEach((sector, i) => {
+    const name = sector || 'Other';
+    if (!index.has(name)) {
+      index.set(name, nodes.length);
+      nodes.push({ sector: name, x: 0, y: 0, count: 0 });
+    }
+    const node = nodes[index.get(name)];
+    member[i] = index.get(name);
+    node.x += x[i];
+    node.y += y[i];
+    node.count++;
+  });
+  nodes.forEach(node => {
+    node.x /= node.count;
+    node.y /= node.count;
+  });
+
+  const pairs = new Map();
+  const count = edgeCount(network, threshold);
+  for (let e = 0; e < count; e++) {
+    const a = member[network.source[e]];
+    const b = member[network.target[e]];
+    if (a === b) continue;
+    const key = a < b ? a * nodes.length + b : b * nodes.length + a;
+    const pair = pairs.get(key) || { source: Math.min(a, b), target: Math.max(a, b), count: 0, total: 0 };
+    pair.count++;
+    pair.total += network.correlation[e];
+    pairs.set(key, pair);
+  }
+  const edges = Array.from(pairs.values(), ({ source, target, count: n, total }) => ({
+    source, target, count: n, correlation: total / n
+  }));
+  return { nodes, edges, member };
+};
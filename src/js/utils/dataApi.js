@@ -0,0 +1,219 @@
+// Range queries against the data server (data/serve.py).
+//
+// /api/symbols returns every symbol's metadata with just its latest daily
+// bars, and /api/bars cuts one symbol's history to a date range, both in the
+// columnar store format, so they parse with parseOHLCVStore. The dashboard
+// starts from the symbol list and fetches the window of the selected symbol
+// and timeframe on demand; the server answers repeats with 304 through the
+// browser's HTTP cache (ETag / If-None-Match). With a SeriesCache
+// (seriesCache.js) fetched series also persist in IndexedDB, and only the
+// date ranges the cache lacks go to the network.
+
+import { TIMEFRAME_DAYS, lowerBound } from './barPyramid';
+import { FIELDS, OHLCVStore, epochDayToISO, parseOHLCVStore } from './ohlcvStore';
+
+export const DEFAULT_API_URL = 'api';
+
+// Columns the dashboards draw: OHLCV plus the MACD panel's indicators
+export const DASHBOARD_FIELDS = [...FIELDS, 'macd', 'macdSignal', 'macdHist', 'rsi14'];
+
+// Every slice covers at least this many calendar days, so the trailing
+// statistics (up to 50 bars) and volume averages have their history
+export const MIN_SLICE_DAYS = 91;
+
+const fetchStore = async (url, options) => {
+  const response = await fetch(url, options);
+  if (!response.ok) {
+    throw new Error(`Failed to load ${url}: ${response.status}`);
+  }
+  return parseOHLCVStore(await response.arrayBuffer());
+};
+
+// The symbol list as a store whose histories are still to be fetched. Each
+// entry remembers the server's latest daily bar, to tell whether cached
+// series (seriesCache.js) are missing newer bars.
+export const loadSymbols = async (apiUrl = DEFAULT_API_URL, options) => {
+  const store = await fetchStore(`${apiUrl}/symbols`, options);
+  store.symbols.forEach(symbol => {
+    const entry = store.entries[symbol];
+    const { date } = entry.levels['1d'].columns;
+    entry.loadedFrom = Infinity;
+    entry.latestDay = date.length ? date[date.length - 1] : -Infinity;
+  });
+  return store;
+};
+
+// { symbol, from, to, resolution, fields }: dates as ISO strings, lists as arrays
+export const barsUrl = (apiUrl, params) => {
+  const query = new URLSearchParams();
+  Object.entries(params).forEach(([name, value]) => {
+    if (value !== undefined && value !== null) {
+      query.set(name, Array.isArray(value) ? value.join(',') : value);
+    }
+  });
+  return `${apiUrl}/bars?${query}`;
+};
+
+export const loadBars = (params, apiUrl = DEFAULT_API_URL, options) => fetchStore(barsUrl(apiUrl, params), options);
+
+// First epoch day of the slice behind a timeframe, counted back from the
+// symbol's latest bar; -Infinity for the whole history
+export const timeframeStart = (store, symbol, timeframe) => {
+  const { date } = store.series(symbol, '1d');
+  const latest = store.entries[symbol].latestDay ?? (date.length ? date[date.length - 1] : -Infinity);
+  const days = Math.max(TIMEFRAME_DAYS[timeframe] ?? Infinity, MIN_SLICE_DAYS);
+  return latest !== -Infinity && days !== Infinity ? latest - days + 1 : -Infinity;
+};
+
+// Columns of `symbol` in a fetched store: resolution -> field -> TypedArray
+const columnsOf = (slice, symbol) => {
+  const levels = {};
+  Object.entries(slice.entries[symbol].levels).forEach(([resolution, level]) => {
+    levels[resolution] = level.columns;
+  });
+  return levels;
+};
+
+// Rows of `columns` dated in [lo, hi)
+const rowsBetween = (columns, lo, hi) => {
+  const start = lowerBound(columns.date, lo);
+  const end = lowerBound(columns.date, hi);
+  const out = {};
+  Object.entries(columns).forEach(([field, values]) => {
+    out[field] = values.subarray(start, end);
+  });
+  return out;
+};
+
+// Concatenates column sets of one resolution in date order (fields common to all)
+const concatColumns = (parts) => {
+  const present = parts.filter(Boolean);
+  const fields = Object.keys(present[0]).filter(field => present.every(part => field in part));
+  const out = {};
+  fields.forEach(field => {
+    const total = present.reduce((sum, part) => sum + part[field].length, 0);
+    const column = new present[0][field].constructor(total);
+    let offset = 0;
+    present.forEach(part => {
+      column.set(part[field], offset);
+      offset += part[field].length;
+    });
+    out[field] = column;
+  });
+  return out;
+};
+
+// Cached series with older bars before them and newer bars from `newerFrom`
+// on stitched around them. Coarse bars are dated by their first day, so the
+// last weekly/monthly bar is replaced when the newer fetch starts on it.
+const stitch = (older, cached, newer, newerFrom) => {
+  const levels = {};
+  const resolutions = new Set([older, cached, newer].filter(Boolean).flatMap(Object.keys));
+  resolutions.forEach(resolution => {
+    const middle = cached && cached[resolution];
+    levels[resolution] = concatColumns([
+      older && older[resolution],
+      middle && (newer ? rowsBetween(middle, -Infinity, newerFrom) : middle),
+      newer && newer[resolution]
+    ]);
+  });
+  return levels;
+};
+
+// Epoch day from which a refresh of `levels` must start: the first day of the
+// last bar at the coarsest resolution, since that bar may still grow
+const refreshFrom = (levels) => Math.min(...Object.values(levels).map(({ date }) => (
+  date.length ? date[date.length - 1] : -Infinity
+)));
+
+// True when the cached daily bars overlapping a fresh fetch still match it,
+// i.e. history was only appended to and not revised
+const seamMatches = (cached, fresh) => {
+  const old = cached['1d'];
+  const now = fresh['1d'];
+  if (!old || !now || !now.date.length) return true;
+  const i = lowerBound(old.date, now.date[0]);
+  return i >= old.date.length || (old.date[i] === now.date[0] && old.close[i] === now.close[0]);
+};
+
+const sliceOf = (symbol, meta, levels) => new OHLCVStore({
+  [symbol]: {
+    meta,
+    levels: Object.fromEntries(Object.entries(levels).map(([resolution, columns]) => (
+      [resolution, { rows: columns.date.length, columns }]
+    )))
+  }
+});
+
+// Fetches the bars `timeframe` shows for `symbol` into `store` unless they
+// are already there. With a series cache, only the ranges the cached record
+// lacks are fetched and the result is written back. Resolves to true when
+// the store changed. A fetch aborted through `options.signal` rejects, and a
+// slice that arrives after a wider one for the symbol (an earlier, longer
+// timeframe) is dropped, so a slow narrow response never shrinks the view.
+export const ensureTimeframe = async (store, symbol, timeframe, { apiUrl = DEFAULT_API_URL, cache = null, options } = {}) => {
+  const from = timeframeStart(store, symbol, timeframe);
+  if (store.isLoaded(symbol, from)) {
+    return false;
+  }
+  const fetchRange = (lo, hi) => loadBars({
+    symbol,
+    from: lo === -Infinity ? undefined : epochDayToISO(lo),
+    to: hi === undefined ? undefined : epochDayToISO(hi),
+    fields: DASHBOARD_FIELDS
+  }, apiUrl, options);
+
+  let record = cache ? await cache.get(symbol).catch(() => null) : null;
+  let levels;
+  let meta = store.meta(symbol);
+  let start = from;
+  if (record) {
+    const latest = store.entries[symbol].latestDay ?? Infinity;
+    const daily = record.levels['1d'].date;
+    const newerFrom = refreshFrom(record.levels);
+    const [older, newer] = await Promise.all([
+      record.from > from ? fetchRange(from, record.from - 1) : null,
+      !daily.length || daily[daily.length - 1] < latest ? fetchRange(newerFrom) : null
+    ]);
+    if (newer && !seamMatches(record.levels, columnsOf(newer, symbol))) {
+      // Bars already cached were revised: start over from the network
+      record = null;
+    } else {
+      levels = stitch(older && columnsOf(older, symbol), record.levels, newer && columnsOf(newer, symbol), newerFrom);
+      start = Math.min(from, record.from);
+      if (newer) meta = newer.meta(symbol);
+    }
+  }
+  if (!record) {
+    const fetched = await fetchRange(from);
+    levels = columnsOf(fetched, symbol);
+    meta = fetched.meta(symbol);
+  }
+  // The store may have moved on while the bars were on their way
+  if (options?.signal?.aborted || store.isLoaded(symbol, start)) {
+    return false;
+  }
+  // put copies the columns before setSlice replays the live bar into them
+  if (cache) {
+    cache.put(symbol, meta, start, levels).catch(() => {});
+  }
+  store.setSlice(symbol, sliceOf(symbol, meta, levels), start);
+  return true;
+};
+
+// Store holding just `symbol`'s cached series, to paint the first view while
+// the network is still answering; null when nothing is cached
+export const loadCachedStore = async (cache, symbol) => {
+  const record = cache ? await cache.get(symbol).catch(() => null) : null;
+  return record ? sliceOf(symbol, record.meta, record.levels) : null;
+};
+
+// Copies the cached series of `symbol` into a freshly loaded symbol list, so
+// the view keeps painting from cache until ensureTimeframe has refreshed it
+export const seedFromCache = async (store, cache, symbol) => {
+  const record = cache && store.has(symbol) ? await cache.get(symbol).catch(() => null) : null;
+  if (record) {
+    store.setSlice(symbol, sliceOf(symbol, store.meta(symbol), record.levels), Infinity);
+  }
+  return store;
+};
@@ -0,0 +1,132 @@
+// Pixel-aware downsampling for the price and volume charts.
+//
+// Mirrors data/pipeline/downsample.py so server-side exports and the browser
+// agree on which points survive: LTTB for the price line, min/max per bucket
+// for volume bars and OHLC merging for candles. Functions return row indices
+// relative to the arrays passed in.
+
+import { DEFAULT_CHART_WIDTH, MIN_PIXELS_PER_BAR } from './barPyramid';
+
+const bucketEdge = (start, stop, buckets, i) => start + Math.floor(((stop - start) * i) / buckets);
+
+const range = (n) => {
+  const out = new Int32Array(n);
+  for (let i = 0; i < n; i++) out[i] = i;
+  return out;
+};
+
+// Largest-Triangle-Three-Buckets: keeps `threshold` points including both ends
+export const lttb = (x, y, threshold) => {
+  const n = y.length;
+  if (threshold >= n || threshold < 3) {
+    return range(n);
+  }
+  const buckets = threshold - 2;
+  const out = new Int32Array(threshold);
+  out[threshold - 1] = n - 1;
+
+  let a = 0;
+  for (let i = 0; i < buckets; i++) {
+    const lo = bucketEdge(1, n - 1, buckets, i);
+    const hi = bucketEdge(1, n - 1, buckets, i + 1);
+
+    // Centroid of the next bucket (the final point for the last bucket)
+    let nextX = x[n - 1];
+    let nextY = y[n - 1];
+    if (i + 1 < buckets) {
+      const nextHi = bucketEdge(1, n - 1, buckets, i + 2);
+      nextX = 0;
+      nextY = 0;
+      for (let j = hi; j < nextHi; j++) {
+        nextX += x[j];
+        nextY += y[j];
+      }
+      nextX /= nextHi - hi;
+      nextY /= nextHi - hi;
+    }
+
+    let best = lo;
+    let bestArea = -1;
+    for (let j = lo; j < hi; j++) {
+      const area = Math.abs((x[a] - nextX) * (y[j] - y[a]) - (x[a] - x[j]) * (nextY - y[a]));
+      if (area > bestArea) {
+        bestArea = area;
+        best = j;
+      }
+    }
+    a = best;
+    out[i + 1] = a;
+  }
+  return out;
+};
+
+// Sorted indices of the min and max of each bucket, plus the first and last rows
+export const minMaxIndices = (values, buckets) => {
+  const n = values.length;
+  if (buckets <= 0 || 2 * buckets >= n) {
+    return range(n);
+  }
+  const keep = [0];
+  for (let i = 0; i < buckets; i++) {
+    const lo = bucketEdge(0, n, buckets, i);
+    const hi = bucketEdge(0, n, buckets, i + 1);
+    let min = lo;
+    let max = lo;
+    for (let j = lo + 1; j < hi; j++) {
+      if (values[j] < values[min]) min = j;
+      if (values[j] > values[max]) max = j;
+    }
+    keep.push(Math.min(min, max), Math.max(min, max));
+  }
+  keep.push(n - 1);
+  return Int32Array.from(new Set(keep));
+};
+
+// Merges OHLCV columns into at most `buckets` bars (first open, max high,
+// min low, last close, summed volume), dated by each bucket's first bar
+export const ohlcBuckets = ({ date, open, high, low, close, volume }, buckets) => {
+  const n = date.length;
+  if (buckets <= 0 || buckets >= n) {
+    return { date, open, high, low, close, volume };
+  }
+  const out = {
+    date: new Int32Array(buckets),
+    open: new Float64Array(buckets),
+    high: new Float64Array(buckets),
+    low: new Float64Array(buckets),
+    close: new Float64Array(buckets),
+    volume: new Float64Array(buckets)
+  };
+  for (let i = 0; i < buckets; i++) {
+    const lo = bucketEdge(0, n, buckets, i);
+    const hi = bucketEdge(0, n, buckets, i + 1);
+    let h = high[lo];
+    let l = low[lo];
+    let v = 0;
+    for (let j = lo; j < hi; j++) {
+      if (high[j] > h) h = high[j];
+      if (low[j] < l) l = low[j];
+      v += volume[j];
+    }
+    out.date[i] = date[lo];
+    out.open[i] = open[lo];
+    out.high[i] = h;
+    out.low[i] = l;
+    out.close[i] = close[hi - 1];
+    out.volume[i] = v;
+  }
+  return out;
+};
+
+// Chart rows for one pyramid view: an LTTB-reduced price line with about one
+// point per pixel and min/max-reduced volume bars at MIN_PIXELS_PER_BAR spacing
+export const downsampleView = (store, symbol, { resolution, start, end }, pixelWidth) => {
+  const width = pixelWidth || DEFAULT_CHART_WIDTH;
+  const { date, close, volume } = store.series(symbol, resolution);
+  const price = lttb(date.subarray(start, end), close.subarray(start, end), width);
+  const bars = minMaxIndices(volume.subarray(start, end), Math.floor(width / (2 * MIN_PIXELS_PER_BAR)));
+  return {
+    price: store.rowsAt(symbol, price, resolution, start),
+    volume: store.rowsAt(symbol, bars, resolution, start)
+  };
+};
@@ -0,0 +1,31 @@
+import { describe, it } from 'node:test';
+import assert from 'node:assert/strict';
+import { readFileSync } from 'node:fs';
+import { lttb, minMaxIndices, ohlcBuckets } from './downsample';
+
+// Shared with data/tests/test_downsample.py, which checks the Python side
+// against the same expected points
+const CASES = JSON.parse(readFileSync(new URL('../../../data/tests/fixtures/downsample_parity.json', import.meta.url)));
+
+describe('downsample parity with data/pipeline/downsample.py', () => {
+  it('keeps the same LTTB points', () => {
+    CASES.lttb.forEach(({ y, threshold, expected }) => {
+      assert.deepEqual(Array.from(lttb(y.map((_, i) => i), y, threshold)), expected);
+    });
+  });
+
+  it('keeps the same bucket extremes', () => {
+    CASES.minmax.forEach(({ values, buckets, expected }) => {
+      assert.deepEqual(Array.from(minMaxIndices(values, buckets)), expected);
+    });
+  });
+
+  it('merges the same OHLC buckets', () => {
+    CASES.ohlc.forEach(({ buckets, expected, ...columns }) => {
+      const out = ohlcBuckets(columns, buckets);
+      Object.entries(expected).forEach(([field, values]) => {
+        assert.deepEqual(Array.from(out[field]), values, field);
+      });
+    });
+  });
+});
@@ -0,0 +1,156 @@
+// Hover hit-testing for dense charts.
+//
+// Indexes are built once per dataset and answer "which point is under the
+// cursor" without scanning the series: a binary search over the sorted x
+// values for time series, and a uniform grid for scatter plots. Both map
+// mouse pixels through the same plot layout the Recharts charts are given,
+// so callers pass PLOT_MARGIN / axis sizes to the chart and the index agrees
+// with what is drawn.
+
+import { lowerBound } from './barPyramid';
+
+export const PLOT_MARGIN = { top: 5, right: 5, bottom: 5, left: 5 };
+export const Y_AXIS_WIDTH = 60;
+export const X_AXIS_HEIGHT = 30;
+
+// Hover farther than this from every scatter point shows no tooltip
+export const SCATTER_HIT_RADIUS = 24;
+
+// Pixel rectangle of the plotting area inside a chart of width x height
+export const plotArea = (width, height) => ({
+  left: PLOT_MARGIN.left + Y_AXIS_WIDTH,
+  top: PLOT_MARGIN.top,
+  width: Math.max(1, width - PLOT_MARGIN.left - PLOT_MARGIN.right - Y_AXIS_WIDTH),
+  height: Math.max(1, height - PLOT_MARGIN.top - PLOT_MARGIN.bottom - X_AXIS_HEIGHT)
+});
+
+const extent = (values) => {
+  let min = Infinity;
+  let max = -Infinity;
+  for (let i = 0; i < values.length; i++) {
+    if (values[i] < min) min = values[i];
+    if (values[i] > max) max = values[i];
+  }
+  return min === max ? [min - 1, max + 1] : [min, max];
+};
+
+// Nearest x in a sorted series, O(log n)
+export class TimeAxisIndex {
+  constructor(xs) {
+    this.xs = xs;
+    this.domain = xs.length ? [xs[0], xs[xs.length - 1]] : [0, 1];
+    if (this.domain[0] === this.domain[1]) {
+      this.domain = [this.domain[0] - 1, this.domain[1] + 1];
+    }
+  }
+
+  nearest(x) {
+    const n = this.xs.length;
+    if (!n) return -1;
+    const i = lowerBound(this.xs, x);
+    if (i === 0) return 0;
+    if (i === n) return n - 1;
+    return x - this.xs[i - 1] <= this.xs[i] - x ? i - 1 : i;
+  }
+
+  // Row index under pixel (px, py) of a width x height chart, or -1
+  hitTest(px, py, width, height) {
+    const area = plotArea(width, height);
+    if (px < area.left || px > area.left + area.width || py < area.top || py > area.top + area.height) {
+      return -1;
+    }
+    const [x0, x1] = this.domain;
+    return this.nearest(x0 + ((px - area.left) / area.width) * (x1 - x0));
+  }
+}
+
+// Uniform grid over normalised (x, y); nearest-point queries visit only the
+// cells around the cursor, expanding ring by ring until no closer point can exist
+export class GridIndex {
+  constructor(xs, ys) {
+    const n = xs.length;
+    this.xs = xs;
+    this.ys = ys;
+    this.domainX = extent(xs);
+    this.domainY = extent(ys);
+    this.side = Math.max(1, Math.ceil(Math.sqrt(n / 2)));
+
+    // Counting sort of point ids by cell: cellStart[c]..cellStart[c + 1] in ids
+    const cells = new Int32Array(n);
+    const cellStart = new Int32Array(this.side * this.side + 1);
+    for (let i = 0; i < n; i++) {
+      cells[i] = this.cellOf(xs[i], ys[i]);
+      cellStart[cells[i] + 1]++;
+    }
+    for (let c = 0; c < this.side * this.side; c++) {
+      cellStart[c + 1] += cellStart[c];
+    }
+    const fill = cellStart.slice(0, -1);
+    const ids = new Int32Array(n);
+    for (let i = 0; i < n; i++) {
+      ids[fill[cells[i]]++] = i;
+    }
+    this.cellStart = cellStart;
+    this.ids = ids;
+  }
+
+  column(x) {
+    const [x0, x1] = this.domainX;
+    return Math.min(this.side - 1, Math.max(0, Math.floor(((x - x0) / (x1 - x0)) * this.side)));
+  }
+
+  row(y) {
+    const [y0, y1] = this.domainY;
+    return Math.min(this.side - 1, Math.max(0, Math.floor(((y - y0) / (y1 - y0)) * this.side)));
+  }
+
+  cellOf(x, y) {
+    return this.row(y) * this.side + this.column(x);
+  }
+
+  // Nearest point to (x, y) with distances measured in pixels, where the
+  // domain spans pxWidth x pxHeight; -1 if none lies within maxDistance px
+  nearest(x, y, pxWidth, pxHeight, maxDistance = Infinity) {
+    if (!this.ids.length) return -1;
+    const sx = pxWidth / (this.domainX[1] - this.domainX[0]);
+    const sy = pxHeight / (this.domainY[1] - this.domainY[0]);
+    const cellPx = Math.min(pxWidth, pxHeight) / this.side;
+    const col = this.column(x);
+    const row = this.row(y);
+
+    let best = -1;
+    let bestDist = maxDistance * maxDistance;
+    for (let ring = 0; ring < this.side; ring++) {
+      // Every cell in this ring is at least (ring - 1) cells from the cursor
+      const reach = Math.max(0, ring - 1) * cellPx;
+      if (reach * reach > bestDist) break;
+      for (let r = row - ring; r <= row + ring; r++) {
+        if (r < 0 || r >= this.side) continue;
+        const edge = r === row - ring || r === row + ring;
+        for (let c = col - ring; c <= col + ring; c += edge ? 1 : 2 * ring || 1) {
+          if (c < 0 || c >= this.side) continue;
+          const cell = r * this.side + c;
+          for (let k = this.cellStart[cell]; k < this.cellStart[cell + 1]; k++) {
+            const i = this.ids[k];
+            const dx = (this.xs[i] - x) * sx;
+            const dy = (this.ys[i] - y) * sy;
+            const dist = dx * dx + dy * dy;
+            if (dist <= bestDist) {
+              bestDist = dist;
+              best = i;
+            }
+          }
+        }
+      }
+    }
+    return best;
+  }
+
+  // Point index under pixel (px, py) of a width x height chart, or -1
+  hitTest(px, py, width, height, maxDistance = SCATTER_HIT_RADIUS) {
+    const area = plotArea(width, height);
+    const x = this.domainX[0] + ((px - area.left) / area.width) * (this.domainX[1] - this.domainX[0]);
+    const y = this.domainY[1] - ((py - area.top) / area.height) * (this.domainY[1] - this.domainY[0]);
+    return this.nearest(x, y, area.width, area.height, maxDistance);
+  }
+}
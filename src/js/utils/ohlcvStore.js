@@ -0,0 +1,369 @@
+// Columnar OHLCV store reader.
+//
+// Mirrors data/pipeline/columnar.py: an 8-byte magic, a uint32 version, a
+// uint32 header length, a JSON header and then 8-byte aligned typed arrays,
+// with one set of columns per bar resolution ('1d', '1w', '1mo').
+// Columns are exposed as zero-copy typed-array views over the fetched
+// ArrayBuffer, so a symbol's history costs exactly its raw bytes in memory.
+// Live bars (see quoteStream.js) update the last bar in place or append into
+// reserved capacity, so streaming does not copy the history per tick.
+// A store may also hold only part of each history: the data API
+// (data/pipeline/server.py, see dataApi.js) answers with stores in the same
+// format cut to a date range, and setSlice() swaps one in per symbol.
+// Sector and industry are dictionary-encoded: meta holds an index into the
+// header's dictionaries, decoded by label() where a name is displayed.
+
+import { latestStats, rollingStatsOf } from './rollingStats';
+
+const MAGIC = 'OHLCVCOL';
+const VERSION = 4;
+const PREAMBLE_BYTES = 16;
+const MS_PER_DAY = 86400000;
+
+export const DEFAULT_STORE_URL = 'data/processed/ohlcv.bin';
+
+export const FIELDS = ['date', 'open', 'high', 'low', 'close', 'volume'];
+
+const ARRAY_TYPES = {
+  i4: Int32Array,
+  u4: Uint32Array,
+  f4: Float32Array,
+  f8: Float64Array
+};
+
+export const epochDayToISO = (day) => new Date(day * MS_PER_DAY).toISOString().slice(0, 10);
+
+export const isoToEpochDay = (iso) => Math.floor(Date.parse(iso) / MS_PER_DAY);
+
+// Bucket of an epoch day at a pyramid resolution, as in data/pipeline/pyramid.py
+const bucketKey = (day, resolution) => {
+  if (resolution === '1w') return Math.floor((day + 3) / 7);
+  if (resolution === '1mo') {
+    const date = new Date(day * MS_PER_DAY);
+    return date.getUTCFullYear() * 12 + date.getUTCMonth();
+  }
+  return day;
+};
+
+const round2 = (value) => Math.round(value * 100) / 100;
+
+// Appends one row, doubling the column capacity when it runs out. Columns stay
+// views of exactly `rows` bars over the larger buffers. Derived columns
+// (indicators) get NaN until the next pipeline run computes them.
+const appendRow = (level, row) => {
+  const { rows } = level;
+  const fields = Object.keys(level.columns);
+  if (!level.buffers || rows >= level.buffers.date.length) {
+    const capacity = Math.max(16, rows * 2);
+    const buffers = {};
+    fields.forEach(field => {
+      // Live volume may outgrow the uint32 column written by the pipeline
+      const Type = field === 'volume' ? Float64Array : level.columns[field].constructor;
+      buffers[field] = new Type(capacity);
+      buffers[field].set(level.columns[field]);
+    });
+    level.buffers = buffers;
+  }
+  level.rows = rows + 1;
+  fields.forEach(field => {
+    level.buffers[field][rows] = field in row ? row[field] : NaN;
+    level.columns[field] = level.buffers[field].subarray(0, level.rows);
+  });
+};
+
+// Live volume may outgrow the uint32 column written by the pipeline, so the
+// column is widened before a bar is written in place. Appended rows already
+// land in float64 buffers (appendRow), whose views need nothing.
+const widenVolume = (level) => {
+  if (!(level.columns.volume instanceof Float64Array)) {
+    level.columns.volume = Float64Array.from(level.columns.volume);
+  }
+};
+
+// Index of `day` in the sorted `dates`, -1 when it is not there
+const indexOfDay = (dates, day) => {
+  let lo = 0;
+  let hi = dates.length;
+  while (lo < hi) {
+    const mid = (lo + hi) >> 1;
+    if (dates[mid] < day) lo = mid + 1;
+    else hi = mid;
+  }
+  return lo < dates.length && dates[lo] === day ? lo : -1;
+};
+
+// Rolls the last bar of a coarse level up again from the daily bars of its
+// bucket, as data/pipeline/pyramid.py does, so a revised tick can lower its
+// high or raise its low. Returns false when the daily level does not reach
+// back to the bucket's first day (an API slice starting mid-bucket).
+const rollUpLast = (level, daily) => {
+  const i = level.rows - 1;
+  const start = indexOfDay(daily.columns.date, level.columns.date[i]);
+  if (start < 0) return false;
+  const { open, high, low, close, volume } = daily.columns;
+  let hi = -Infinity;
+  let lo = Infinity;
+  let sum = 0;
+  for (let k = start; k < daily.rows; k++) {
+    hi = Math.max(hi, high[k]);
+    lo = Math.min(lo, low[k]);
+    sum += volume[k];
+  }
+  widenVolume(level);
+  const { columns } = level;
+  columns.open[i] = open[start];
+  columns.high[i] = hi;
+  columns.low[i] = lo;
+  columns.close[i] = close[daily.rows - 1];
+  columns.volume[i] = sum;
+  return true;
+};
+
+const rowAt = ({ date, open, high, low, close, volume }, i) => ({
+  date: epochDayToISO(date[i]),
+  day: date[i],
+  price: close[i],
+  volume: volume[i],
+  high: high[i],
+  low: low[i],
+  open: open[i],
+  close: close[i]
+});
+
+export class OHLCVStore {
+  constructor(entries, dictionaries = {}) {
+    // symbol -> { meta, levels: { resolution: { rows, columns: { field: TypedArray } } } }
+    this.entries = entries;
+    // field -> names; meta of a dictionary field holds an index into them
+    this.dictionaries = dictionaries;
+    this.symbols = Object.keys(entries);
+    // Bumped whenever any symbol's data changes; per-symbol counters live in entries
+    this.revision = 0;
+  }
+
+  has(symbol) {
+    return symbol in this.entries;
+  }
+
+  // Data version of one symbol, for cache invalidation (see selectors.js)
+  version(symbol) {
+    return this.entries[symbol].version || 0;
+  }
+
+  meta(symbol) {
+    return this.entries[symbol].meta;
+  }
+
+  // Display name of a dictionary-encoded meta field (sector, industry);
+  // plain strings (sample data) pass through, codes without a dictionary
+  // give undefined
+  label(symbol, field) {
+    const value = this.entries[symbol].meta[field];
+    const names = this.dictionaries[field];
+    return typeof value === 'number' ? names?.[value] : value;
+  }
+
+  // [symbol, meta] pairs, the columnar counterpart of Object.entries(stockData)
+  quotes() {
+    return this.symbols.map(symbol => [symbol, this.entries[symbol].meta]);
+  }
+
+  resolutions(symbol) {
+    return Object.keys(this.entries[symbol].levels);
+  }
+
+  length(symbol, resolution = '1d') {
+    return this.entries[symbol].levels[resolution].rows;
+  }
+
+  series(symbol, resolution = '1d') {
+    return this.entries[symbol].levels[resolution].columns;
+  }
+
+  // Materialize chart rows ({ date, day, price, volume, high, low, open, close })
+  // for [start, end) only; everything else stays columnar.
+  rows(symbol, start = 0, end = this.length(symbol), resolution = '1d') {
+    const columns = this.series(symbol, resolution);
+    const out = new Array(Math.max(0, end - start));
+    for (let i = start; i < end; i++) {
+      out[i - start] = rowAt(columns, i);
+    }
+    return out;
+  }
+
+  // Rows for selected indices (e.g. downsampling output), shifted by `offset`
+  rowsAt(symbol, indices, resolution = '1d', offset = 0) {
+    const columns = this.series(symbol, resolution);
+    return Array.from(indices, i => rowAt(columns, i + offset));
+  }
+
+  // Dashboard-shaped stock object: the latest quote plus the priceHistory of
+  // one view ({ resolution, start, end }, see barPyramid.selectView).
+  stock(symbol, { resolution = '1d', start = 0, end = this.length(symbol, resolution) } = {}) {
+    return { ...this.meta(symbol), priceHistory: this.rows(symbol, start, end, resolution) };
+  }
+
+  // Applies a live daily bar ({ date, open, high, low, close, volume }, date as
+  // ISO string or epoch day): replaces the last bar when the dates match,
+  // appends otherwise, and rolls the change into the weekly and monthly
+  // levels. The quote fields of meta are recomputed from the new close.
+  // Returns false for unknown symbols and bars older than the last stored one.
+  upsertBar(symbol, bar) {
+    const entry = this.entries[symbol];
+    if (!entry) return false;
+    const day = typeof bar.date === 'number' ? bar.date : isoToEpochDay(bar.date);
+    const daily = entry.levels['1d'];
+    const last = daily.rows - 1;
+    const row = { date: day, open: bar.open, high: bar.high, low: bar.low, close: bar.close, volume: bar.volume };
+
+    let replacedVolume = 0;
+    if (last >= 0 && daily.columns.date[last] > day) {
+      return false;
+    }
+    // Kept so a slice loaded later can replay it (see setSlice)
+    entry.liveBar = row;
+    // Window stats follow the closes one bar at a time after the first tick
+    if (!entry.rolling) {
+      entry.rolling = rollingStatsOf(daily.columns.close);
+    }
+    const replacing = last >= 0 && daily.columns.date[last] === day;
+    if (replacing) {
+      entry.rolling.replaceLast(row.close);
+    } else {
+      entry.rolling.push(row.close);
+    }
+    if (replacing) {
+      replacedVolume = daily.columns.volume[last];
+      widenVolume(daily);
+      FIELDS.forEach(field => {
+        daily.columns[field][last] = row[field];
+      });
+    } else {
+      appendRow(daily, row);
+    }
+
+    Object.entries(entry.levels).forEach(([resolution, level]) => {
+      if (resolution === '1d') return;
+      const i = level.rows - 1;
+      const { columns } = level;
+      if (i >= 0 && bucketKey(columns.date[i], resolution) === bucketKey(day, resolution)) {
+        if (!rollUpLast(level, daily)) {
+          // Without the whole bucket only the revised bar's own effect is known
+          widenVolume(level);
+          columns.high[i] = Math.max(columns.high[i], row.high);
+          columns.low[i] = Math.min(columns.low[i], row.low);
+          columns.close[i] = row.close;
+          columns.volume[i] += row.volume - replacedVolume;
+        }
+      } else {
+        appendRow(level, row);
+      }
+    });
+
+    const { open, close, volume } = daily.columns;
+    const n = daily.rows;
+    const prev = n > 1 ? close[n - 2] : open[n - 1];
+    const change = close[n - 1] - prev;
+    entry.meta = {
+      ...entry.meta,
+      current: round2(close[n - 1]),
+      change: round2(change),
+      changePercent: prev ? round2((change / prev) * 100) : 0,
+      volume: volume[n - 1],
+      stats: entry.rolling.summary()
+    };
+    entry.version = (entry.version || 0) + 1;
+    this.revision++;
+    return true;
+  }
+
+  // True when the symbol's bars from `fromDay` on are in the store. Only
+  // stores assembled from API slices hold partial histories.
+  isLoaded(symbol, fromDay) {
+    const { loadedFrom } = this.entries[symbol];
+    return loadedFrom === undefined || loadedFrom <= fromDay;
+  }
+
+  // Replaces the symbol's bars with those of `slice` (an OHLCVStore holding
+  // the symbol's history from `fromDay` on, -Infinity for all of it) and
+  // replays the latest live bar on top.
+  setSlice(symbol, slice, fromDay) {
+    const entry = this.entries[symbol];
+    const { meta, levels } = slice.entries[symbol];
+    entry.meta = { ...entry.meta, ...meta };
+    entry.levels = levels;
+    entry.loadedFrom = fromDay;
+    entry.rolling = null;
+    if (entry.liveBar) {
+      this.upsertBar(symbol, entry.liveBar);
+    }
+    entry.version = (entry.version || 0) + 1;
+    this.revision++;
+  }
+
+  // Builds a store from the legacy `{ symbol: { ...quote, priceHistory } }`
+  // literals so sample data flows through the same columnar code path.
+  static fromRecords(stockData) {
+    const entries = {};
+    Object.entries(stockData).forEach(([symbol, { priceHistory, ...meta }]) => {
+      const n = priceHistory.length;
+      const columns = {
+        date: new Int32Array(n),
+        open: new Float64Array(n),
+        high: new Float64Array(n),
+        low: new Float64Array(n),
+        close: new Float64Array(n),
+        volume: new Float64Array(n)
+      };
+      priceHistory.forEach((bar, i) => {
+        columns.date[i] = isoToEpochDay(bar.date);
+        columns.open[i] = bar.open;
+        columns.high[i] = bar.high;
+        columns.low[i] = bar.low;
+        columns.close[i] = bar.close;
+        columns.volume[i] = bar.volume;
+      });
+      entries[symbol] = {
+        meta: { stats: latestStats(columns.close), ...meta },
+        levels: { '1d': { rows: n, columns } }
+      };
+    });
+    return new OHLCVStore(entries);
+  }
+}
+
+export const parseOHLCVStore = (buffer) => {
+  const view = new DataView(buffer);
+  const magic = new TextDecoder('ascii').decode(new Uint8Array(buffer, 0, MAGIC.length));
+  if (magic !== MAGIC) {
+    throw new Error('Not an OHLCV columnar store');
+  }
+  const version = view.getUint32(8, true);
+  if (version !== VERSION) {
+    throw new Error(`Unsupported OHLCV store version ${version}`);
+  }
+  const headerBytes = view.getUint32(12, true);
+  const header = JSON.parse(new TextDecoder().decode(new Uint8Array(buffer, PREAMBLE_BYTES, headerBytes)));
+
+  const entries = {};
+  header.symbols.forEach(({ symbol, meta, levels }) => {
+    const views = {};
+    Object.entries(levels).forEach(([resolution, { rows, columns }]) => {
+      const level = { rows, columns: {} };
+      Object.entries(columns).forEach(([field, { dtype, offset, length }]) => {
+        level.columns[field] = new ARRAY_TYPES[dtype](buffer, offset, length);
+      });
+      views[resolution] = level;
+    });
+    entries[symbol] = { meta, levels: views };
+  });
+  return new OHLCVStore(entries, header.dictionaries);
+};
+
+export const loadOHLCVStore = async (url, options) => {
+  const response = await fetch(url, options);
+  if (!response.ok) {
+    throw new Error(`Failed to load ${url}: ${response.status}`);
+  }
+  return parseOHLCVStore(await response.arrayBuffer());
+};
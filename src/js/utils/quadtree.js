@@ -0,0 +1,142 @@
+// Point quadtree over parallel x/y arrays.
+//
+// Built once per layout change in O(n log n). Each cell keeps its point count
+// and centre of mass, so the same tree answers viewport queries (which nodes
+// to draw), nearest-point picking (which node is under the pointer) and
+// Barnes–Hut repulsion (distant cells act as one point), as in
+// data/pipeline/layout.py.
+
+const LEAF_SIZE = 8;
+const MAX_DEPTH = 16;
+
+const buildCell = (x, y, indices, x0, y0, size, depth) => {
+  let cx = 0;
+  let cy = 0;
+  for (let i = 0; i < indices.length; i++) {
+    cx += x[indices[i]];
+    cy += y[indices[i]];
+  }
+  const cell = {
+    x0, y0, size,
+    mass: indices.length,
+    cx: cx / indices.length,
+    cy: cy / indices.length,
+    children: null,
+    points: null
+  };
+  if (indices.length <= LEAF_SIZE || depth >= MAX_DEPTH) {
+    cell.points = indices;
+    return cell;
+  }
+  const half = size / 2;
+  const quadrants = [[], [], [], []];
+  for (let i = 0; i < indices.length; i++) {
+    const p = indices[i];
+    quadrants[(x[p] >= x0 + half ? 1 : 0) + (y[p] >= y0 + half ? 2 : 0)].push(p);
+  }
+  cell.children = quadrants
+    .map((members, q) => members.length
+      ? buildCell(x, y, Int32Array.from(members), x0 + (q & 1) * half, y0 + (q >> 1) * half, half, depth + 1)
+      : null)
+    .filter(Boolean);
+  return cell;
+};
+
+export class Quadtree {
+  constructor(x, y, indices = null) {
+    this.x = x;
+    this.y = y;
+    const members = indices || Int32Array.from({ length: x.length }, (_, i) => i);
+    let minX = Infinity;
+    let minY = Infinity;
+    let maxX = -Infinity;
+    let maxY = -Infinity;
+    for (let i = 0; i < members.length; i++) {
+      const p = members[i];
+      if (x[p] < minX) minX = x[p];
+      if (x[p] > maxX) maxX = x[p];
+      if (y[p] < minY) minY = y[p];
+      if (y[p] > maxY) maxY = y[p];
+    }
+    const size = Math.max(maxX - minX, maxY - minY) * (1 + 1e-6) || 1;
+    this.root = members.length ? buildCell(x, y, members, minX, minY, size, 0) : null;
+  }
+
+  // Calls visit(index) for every point inside [x0, x1] x [y0, y1]
+  forEachInRect(x0, y0, x1, y1, visit) {
+    const stack = this.root ? [this.root] : [];
+    while (stack.length) {
+      const cell = stack.pop();
+      if (cell.x0 > x1 || cell.y0 > y1 || cell.x0 + cell.size < x0 || cell.y0 + cell.size < y0) continue;
+      if (cell.points) {
+        cell.points.forEach(p => {
+          if (this.x[p] >= x0 && this.x[p] <= x1 && this.y[p] >= y0 && this.y[p] <= y1) visit(p);
+        });
+      } else {
+        stack.push(...cell.children);
+      }
+    }
+  }
+
+  countInRect(x0, y0, x1, y1) {
+    let count = 0;
+    this.forEachInRect(x0, y0, x1, y1, () => { count++; });
+    return count;
+  }
+
+  // Closest point within `radius` of (px, py), or -1
+  nearest(px, py, radius) {
+    let best = -1;
+    let bestDist = radius * radius;
+    const stack = this.root ? [this.root] : [];
+    while (stack.length) {
+      const cell = stack.pop();
+      // Distance from the point to the cell's square
+      const dx = Math.max(cell.x0 - px, 0, px - cell.x0 - cell.size);
+      const dy = Math.max(cell.y0 - py, 0, py - cell.y0 - cell.size);
+      if (dx * dx + dy * dy > bestDist) continue;
+      if (cell.points) {
+        cell.points.forEach(p => {
+          const d = (this.x[p] - px) ** 2 + (this.y[p] - py) ** 2;
+          if (d <= bestDist) {
+            bestDist = d;
+            best = p;
+          }
+        });
+      } else {
+        stack.push(...cell.children);
+      }
+    }
+    return best;
+  }
+
+  // Barnes–Hut repulsion k² / d on point `self` at (px, py): cells smaller than
+  // theta times their distance act through their centre of mass. Returns [fx, fy]
+  repulsion(self, px, py, k2 = 1, theta = 0.7) {
+    let fx = 0;
+    let fy = 0;
+    const push = (sx, sy, mass) => {
+      const dx = px - sx;
+      const dy = py - sy;
+      const dist2 = Math.max(dx * dx + dy * dy, 1e-9);
+      fx += (dx * k2 * mass) / dist2;
+      fy += (dy * k2 * mass) / dist2;
+    };
+    const stack = this.root ? [this.root] : [];
+    while (stack.length) {
+      const cell = stack.pop();
+      const dx = cell.cx - px;
+      const dy = cell.cy - py;
+      if (cell.size * cell.size < theta * theta * (dx * dx + dy * dy)) {
+        push(cell.cx, cell.cy, cell.mass);
+      } else if (cell.points) {
+        cell.points.forEach(p => {
+          if (p !== self) push(this.x[p], this.y[p], 1);
+        });
+      } else {
+        stack.push(...cell.children);
+      }
+    }
+    return [fx, fy];
+  }
+}
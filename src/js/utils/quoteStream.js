@@ -0,0 +1,42 @@
+// Live quote subscription.
+//
+// data/stream_quotes.py pushes the current daily bar of every symbol that
+// traded as Server-Sent Events ('bars' events carrying a JSON array of
+// { symbol, date, open, high, low, close, volume }). Each bar is applied to
+// the store in place (OHLCVStore.upsertBar) and the dashboard is told to
+// re-render at most once per animation frame, however many ticks arrived.
+
+export const DEFAULT_QUOTE_STREAM_URL = 'http://localhost:8765/quotes';
+
+// Streams bars into `store` and calls onUpdate(store.revision) after each
+// batch of changes. Returns a function that closes the stream.
+export const subscribeQuotes = (store, onUpdate, url = DEFAULT_QUOTE_STREAM_URL) => {
+  if (typeof EventSource === 'undefined') {
+    return () => {};
+  }
+  const query = `symbols=${store.symbols.map(encodeURIComponent).join(',')}`;
+  const source = new EventSource(`${url}${url.includes('?') ? '&' : '?'}${query}`);
+  let frame = 0;
+
+  const flush = () => {
+    frame = 0;
+    onUpdate(store.revision);
+  };
+
+  source.addEventListener('bars', (event) => {
+    let changed = false;
+    JSON.parse(event.data).forEach(({ symbol, ...bar }) => {
+      if (store.has(symbol) && store.upsertBar(symbol, bar)) {
+        changed = true;
+      }
+    });
+    if (changed && !frame) {
+      frame = requestAnimationFrame(flush);
+    }
+  });
+
+  return () => {
+    source.close();
+    cancelAnimationFrame(frame);
+  };
+};
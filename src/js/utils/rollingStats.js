@@ -0,0 +1,189 @@
+// Incremental rolling-window statistics.
+//
+// Each push is O(1) amortised: min and max come from monotonic deques, mean
+// and variance from a sliding Welford update, so nothing rescans the window
+// and there is no Math.max(...values) spread to overflow the call stack on
+// long histories. The latest value can also be replaced in O(1), for a live
+// bar revised tick by tick. Summaries match window_summary() in
+// data/pipeline/rolling.py.
+
+export const WINDOWS = [5, 20, 50];
+
+// Ring-buffer deque of (seq, value) pairs kept monotonic by `better`
+class MonotonicDeque {
+  constructor(capacity, better) {
+    this.seqs = new Float64Array(capacity);
+    this.values = new Float64Array(capacity);
+    this.capacity = capacity;
+    this.head = 0;
+    this.length = 0;
+    this.better = better;
+  }
+
+  push(seq, value) {
+    while (this.length && !this.better(this.values[(this.head + this.length - 1) % this.capacity], value)) {
+      this.length--;
+    }
+    const slot = (this.head + this.length) % this.capacity;
+    this.seqs[slot] = seq;
+    this.values[slot] = value;
+    this.length++;
+  }
+
+  expire(oldestSeq) {
+    while (this.length && this.seqs[this.head] < oldestSeq) {
+      this.head = (this.head + 1) % this.capacity;
+      this.length--;
+    }
+  }
+
+  get value() {
+    return this.length ? this.values[this.head] : NaN;
+  }
+}
+
+// The deques hold every value but the latest, which is kept out of them so
+// replaceLast() never has to restore candidates the old value evicted; min
+// and max fold it back in.
+export class RollingWindow {
+  constructor(size) {
+    this.size = size;
+    this.ring = new Float64Array(size);
+    this.count = 0;
+    this.seq = 0;
+    this.mean = NaN;
+    this.m2 = 0;
+    this.minDeque = new MonotonicDeque(size, (a, b) => a < b);
+    this.maxDeque = new MonotonicDeque(size, (a, b) => a > b);
+  }
+
+  push(value) {
+    const slot = this.seq % this.size;
+    if (this.count === this.size) {
+      const old = this.ring[slot];
+      const oldMean = this.mean;
+      this.mean += (value - old) / this.size;
+      this.m2 += (value - old) * (value - this.mean + old - oldMean);
+    } else {
+      const prevMean = this.count ? this.mean : 0;
+      this.count++;
+      this.mean = prevMean + (value - prevMean) / this.count;
+      this.m2 += (value - prevMean) * (value - this.mean);
+    }
+    // Of the earlier values only those still in the window with `value` stay
+    this.minDeque.expire(this.seq - this.size + 1);
+    this.maxDeque.expire(this.seq - this.size + 1);
+    if (this.seq > 0 && this.size > 1) {
+      this.minDeque.push(this.seq - 1, this.last);
+      this.maxDeque.push(this.seq - 1, this.last);
+    }
+    this.ring[slot] = value;
+    this.seq++;
+    return this;
+  }
+
+  // Replaces the latest value (push() when the window is empty)
+  replaceLast(value) {
+    if (!this.count) {
+      return this.push(value);
+    }
+    const slot = (this.seq - 1) % this.size;
+    const old = this.ring[slot];
+    const oldMean = this.mean;
+    this.mean += (value - old) / this.count;
+    this.m2 += (value - old) * (value - this.mean + old - oldMean);
+    this.ring[slot] = value;
+    return this;
+  }
+
+  get variance() {
+    return this.count ? Math.max(this.m2, 0) / this.count : NaN;
+  }
+
+  get std() {
+    return Math.sqrt(this.variance);
+  }
+
+  get min() {
+    return this.minDeque.length ? Math.min(this.minDeque.value, this.last) : this.last;
+  }
+
+  get max() {
+    return this.maxDeque.length ? Math.max(this.maxDeque.value, this.last) : this.last;
+  }
+
+  get range() {
+    return this.max - this.min;
+  }
+
+  get first() {
+    return this.ring[(this.seq - this.count) % this.size];
+  }
+
+  get last() {
+    return this.ring[(this.seq - 1) % this.size];
+  }
+
+  // Same shape as window_summary() in data/pipeline/rolling.py
+  summary() {
+    if (!this.count) {
+      return { count: 0 };
+    }
+    return {
+      count: this.count,
+      first: this.first,
+      last: this.last,
+      mean: this.mean,
+      std: this.std,
+      min: this.min,
+      max: this.max,
+      range: this.range
+    };
+  }
+}
+
+// One RollingWindow per size, fed together as bars arrive
+export class RollingStats {
+  constructor(windows = WINDOWS) {
+    this.windows = {};
+    windows.forEach(size => {
+      this.windows[size] = new RollingWindow(size);
+    });
+  }
+
+  push(value) {
+    Object.values(this.windows).forEach(window => window.push(value));
+    return this;
+  }
+
+  replaceLast(value) {
+    Object.values(this.windows).forEach(window => window.replaceLast(value));
+    return this;
+  }
+
+  extend(values) {
+    for (let i = 0; i < values.length; i++) {
+      this.push(values[i]);
+    }
+    return this;
+  }
+
+  // { '5': summary, '20': summary, '50': summary }, as stored in symbol meta
+  summary() {
+    const out = {};
+    Object.entries(this.windows).forEach(([size, window]) => {
+      out[size] = window.summary();
+    });
+    return out;
+  }
+}
+
+// RollingStats fed the trailing closes; only the last max(windows) values are visited
+export const rollingStatsOf = (values, windows = WINDOWS) => {
+  const tail = values.subarray
+    ? values.subarray(Math.max(0, values.length - Math.max(...windows)))
+    : values.slice(-Math.max(...windows));
+  return new RollingStats(windows).extend(tail);
+};
+
+export const latestStats = (values, windows = WINDOWS) => rollingStatsOf(values, windows).summary();
@@ -0,0 +1,72 @@
+import { describe, it } from 'node:test';
+import assert from 'node:assert/strict';
+import { RollingStats, RollingWindow, WINDOWS, latestStats } from './rollingStats';
+
+// Summary of a plain array, recomputed from scratch
+const bruteForce = (values) => {
+  const n = values.length;
+  const mean = values.reduce((sum, v) => sum + v, 0) / n;
+  const variance = values.reduce((sum, v) => sum + (v - mean) ** 2, 0) / n;
+  const min = values.reduce((a, b) => Math.min(a, b));
+  const max = values.reduce((a, b) => Math.max(a, b));
+  return { count: n, first: values[0], last: values[n - 1], mean, std: Math.sqrt(variance), min, max, range: max - min };
+};
+
+// Equal to 4 decimals; incremental updates drift by rounding error only
+const assertSummary = (actual, expected) => {
+  Object.entries(expected).forEach(([key, value]) => {
+    assert.ok(Math.abs(actual[key] - value) < 5e-5, `${key}: ${actual[key]} != ${value}`);
+  });
+};
+
+describe('RollingWindow', () => {
+  it('evicts the oldest value from min and max', () => {
+    const window = new RollingWindow(3);
+    [1, 2, 3, 4].forEach(v => window.push(v));
+    assert.equal(window.min, 2);
+    assert.equal(window.max, 4);
+  });
+
+  it('matches a brute-force window on random pushes and replacements', () => {
+    let seed = 7;
+    const random = () => {
+      seed = (seed * 16807) % 2147483647;
+      return seed / 2147483647;
+    };
+    [1, 2, 5, 20].forEach(size => {
+      const window = new RollingWindow(size);
+      const values = [];
+      for (let i = 0; i < 500; i++) {
+        const value = Math.round(random() * 1000) / 10;
+        if (values.length && random() < 0.3) {
+          values[values.length - 1] = value;
+          window.replaceLast(value);
+        } else {
+          values.push(value);
+          window.push(value);
+        }
+        assertSummary(window.summary(), bruteForce(values.slice(-size)));
+      }
+    });
+  });
+});
+
+describe('latestStats', () => {
+  it('summarises the trailing closes of every window', () => {
+    const closes = Float64Array.from({ length: 60 }, (_, i) => 100 + i);
+    const stats = latestStats(closes);
+    WINDOWS.forEach(size => {
+      assertSummary(stats[size], bruteForce(Array.from(closes.subarray(60 - size))));
+    });
+    assert.equal(stats[20].min, 140);
+    assert.equal(stats[20].range, 19);
+  });
+
+  it('agrees with RollingStats fed one close at a time', () => {
+    const closes = Array.from({ length: 80 }, (_, i) => 50 + 10 * Math.sin(i / 3));
+    const rolling = new RollingStats();
+    closes.forEach(close => rolling.push(close));
+    const expected = latestStats(closes);
+    WINDOWS.forEach(size => assertSummary(rolling.summary()[size], expected[size]));
+  });
+});
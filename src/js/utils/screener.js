@@ -0,0 +1,261 @@
+// Universe-wide screening over the latest quotes.
+//
+// buildScreen sorts the universe once per metric into an index permutation
+// (ascending, symbols without a value left out) with its inverse, and the
+// same per peer group (sector). Top-k and bottom-k are then slices of a
+// permutation, and a symbol's percentile is a lookup plus a binary search
+// over the sorted values for ties - no query walks the universe.
+//
+// The build is split so the sorting can run off the main thread: screenInputs
+// reads the store into typed arrays, sortScreen (pure typed arrays in and out,
+// see src/js/workers/screenWorker.js) does the sorting and assembleScreen
+// wraps the result for the queries below. Live quotes change the store every
+// frame, so the dashboards build it through useScreen (useScreen.js), which
+// runs sortScreen in the worker; buildScreen does all three in place.
+
+import { lowerBound } from './barPyramid';
+
+export const SCREEN_METRICS = ['changePercent', 'volume', 'marketCap', 'volumeRatio'];
+
+export const METRIC_LABELS = {
+  changePercent: 'Daily change',
+  volume: 'Volume',
+  marketCap: 'Market cap',
+  volumeRatio: 'Volume ratio'
+};
+
+// Store and API symbols may carry no market cap (undefined, NaN or 0)
+export const hasMarketCap = (value) => Number.isFinite(value) && value > 0;
+
+// Shown in place of the market cap commentary; the stories of
+// data/pipeline/narrative.py use the same sentence. The name comes first so
+// one ending in a period ('Apple Inc.') does not end the sentence twice.
+export const missingMarketCapText = (name) => `${name} reports no market capitalization.`;
+
+// Display text of a metric value; 'n/a' where the symbol lacks it
+export const formatMetric = (metric, value) => {
+  if (!Number.isFinite(value) || (metric === 'marketCap' && !hasMarketCap(value))) return 'n/a';
+  if (metric === 'changePercent') return `${value >= 0 ? '+' : ''}${value.toFixed(2)}%`;
+  if (metric === 'volume') return `${(value / 1e6).toFixed(1)}M`;
+  if (metric === 'marketCap') return `$${(value / 1e12).toFixed(2)}T`;
+  return `${value.toFixed(2)}x`;
+};
+
+// Trailing daily bars behind the volume ratio when the pipeline did not
+// store avgVolume (inline sample data), as selectVolumeStats
+const VOLUME_DAYS = 5;
+const NO_GROUP = 'Other';
+
+const averageVolume = (store, symbol, meta) => {
+  if (meta.avgVolume !== undefined) return meta.avgVolume;
+  const { volume } = store.series(symbol, '1d');
+  const start = Math.max(0, volume.length - VOLUME_DAYS);
+  let total = 0;
+  for (let i = start; i < volume.length; i++) {
+    total += volume[i];
+  }
+  return volume.length > start ? total / (volume.length - start) : 0;
+};
+
+const metricValues = (store, symbols) => {
+  const values = {};
+  SCREEN_METRICS.forEach(metric => {
+    values[metric] = new Float64Array(symbols.length);
+  });
+  symbols.forEach((symbol, i) => {
+    const meta = store.meta(symbol);
+    const avgVolume = averageVolume(store, symbol, meta);
+    values.changePercent[i] = meta.changePercent ?? NaN;
+    values.volume[i] = meta.volume ?? NaN;
+    values.marketCap[i] = meta.marketCap ?? NaN;
+    values.volumeRatio[i] = avgVolume ? meta.volume / avgVolume : NaN;
+  });
+  return values;
+};
+
+const upperBound = (values, target) => {
+  let lo = 0;
+  let hi = values.length;
+  while (lo < hi) {
+    const mid = (lo + hi) >>> 1;
+    if (values[mid] <= target) lo = mid + 1;
+    else hi = mid;
+  }
+  return lo;
+};
+
+// A sorted set of symbols: `order` holds symbol indexes by ascending value,
+// `sorted` the values along it and `rank` each symbol's position in its set
+// (-1 without a value)
+const sortedSet = (order, sorted, rank) => ({ order, sorted, rank });
+
+// Typed-array inputs of sortScreen plus what the queries need to name results
+export const screenInputs = (store) => {
+  const { symbols } = store;
+  // Sector codes (or names, in sample data) as group keys; named on display
+  const group = symbols.map(symbol => store.meta(symbol).sector ?? NO_GROUP);
+  const groupIds = new Map();
+  const groupOf = Int32Array.from(group, name => {
+    if (!groupIds.has(name)) groupIds.set(name, groupIds.size);
+    return groupIds.get(name);
+  });
+  return {
+    symbols,
+    group,
+    groupKeys: [...groupIds.keys()],
+    groupNames: store.dictionaries.sector,
+    values: metricValues(store, symbols),
+    groupOf,
+    groupCount: groupIds.size
+  };
+};
+
+// Per metric: the universe `order`, `sorted` values and `rank`, and the same
+// for peers as contiguous group blocks (`grouped`, `groupedSorted`,
+// `peerRank`, block `starts`); plus the mean daily change. Only typed arrays
+// and numbers, so it can be posted between threads.
+export const sortScreen = ({ values, groupOf, groupCount }) => {
+  const n = groupOf.length;
+  const metrics = {};
+  SCREEN_METRICS.forEach(metric => {
+    const column = values[metric];
+    let order = new Int32Array(n);
+    let valid = 0;
+    for (let i = 0; i < n; i++) {
+      if (!Number.isNaN(column[i])) order[valid++] = i;
+    }
+    order = order.slice(0, valid).sort((a, b) => column[a] - column[b] || a - b);
+    const rank = new Int32Array(n).fill(-1);
+    order.forEach((i, position) => {
+      rank[i] = position;
+    });
+
+    // Peer groups: one stable bucket pass over the universe order keeps each
+    // group's members in ascending order, in contiguous blocks
+    const starts = new Int32Array(groupCount + 1);
+    order.forEach(i => {
+      starts[groupOf[i] + 1]++;
+    });
+    for (let g = 0; g < groupCount; g++) {
+      starts[g + 1] += starts[g];
+    }
+    const fill = starts.slice(0, groupCount);
+    const grouped = new Int32Array(valid);
+    const peerRank = new Int32Array(n).fill(-1);
+    order.forEach(i => {
+      const g = groupOf[i];
+      peerRank[i] = fill[g] - starts[g];
+      grouped[fill[g]++] = i;
+    });
+    metrics[metric] = {
+      order,
+      sorted: Float64Array.from(order, i => column[i]),
+      rank,
+      grouped,
+      groupedSorted: Float64Array.from(grouped, i => column[i]),
+      peerRank,
+      starts
+    };
+  });
+
+  let total = 0;
+  let count = 0;
+  values.changePercent.forEach(value => {
+    if (!Number.isNaN(value)) {
+      total += value;
+      count++;
+    }
+  });
+  return { values, metrics, avgChange: count ? total / count : 0 };
+};
+
+// Buffers of a sortScreen input or result, for postMessage transfer lists
+export const screenBuffers = ({ values, metrics = {}, groupOf }) => [
+  ...Object.values(values).map(column => column.buffer),
+  ...Object.values(metrics).flatMap(sorted => Object.values(sorted).map(array => array.buffer)),
+  ...(groupOf ? [groupOf.buffer] : [])
+];
+
+// The screen queried below, from screenInputs and the matching sortScreen result
+export const assembleScreen = (inputs, { values, metrics, avgChange }) => {
+  const universe = {};
+  const peers = {};
+  SCREEN_METRICS.forEach(metric => {
+    const { order, sorted, rank, grouped, groupedSorted, peerRank, starts } = metrics[metric];
+    universe[metric] = sortedSet(order, sorted, rank);
+    peers[metric] = new Map();
+    inputs.groupKeys.forEach((name, g) => {
+      peers[metric].set(name, sortedSet(
+        grouped.subarray(starts[g], starts[g + 1]),
+        groupedSorted.subarray(starts[g], starts[g + 1]),
+        peerRank
+      ));
+    });
+  });
+  return {
+    symbols: inputs.symbols,
+    index: new Map(inputs.symbols.map((symbol, i) => [symbol, i])),
+    values,
+    group: inputs.group,
+    groupNames: inputs.groupNames,
+    universe,
+    peers,
+    avgChange
+  };
+};
+
+export const buildScreen = (store) => {
+  const inputs = screenInputs(store);
+  return assembleScreen(inputs, sortScreen(inputs));
+};
+
+const entryAt = (screen, metric, i) => ({
+  symbol: screen.symbols[i],
+  value: screen.values[metric][i]
+});
+
+// The `k` symbols with the highest (top) or lowest values of `metric`
+export const topK = (screen, metric, k, sorted = screen.universe[metric]) => {
+  const { order } = sorted;
+  const count = Math.min(k, order.length);
+  return Array.from({ length: count }, (_, j) => entryAt(screen, metric, order[order.length - 1 - j]));
+};
+
+export const bottomK = (screen, metric, k, sorted = screen.universe[metric]) => Array.from(
+  sorted.order.subarray(0, Math.min(k, sorted.order.length)),
+  i => entryAt(screen, metric, i)
+);
+
+// Share of `sorted` with a lower value than the symbol, counting ties half
+const percentileIn = (sorted, value) => {
+  const below = lowerBound(sorted.sorted, value);
+  const equal = upperBound(sorted.sorted, value) - below;
+  return ((below + equal / 2) / sorted.order.length) * 100;
+};
+
+// { value, rank (1 = highest), count, percentile } of a symbol in the
+// universe, or null when it has no value for `metric`
+export const percentileOf = (screen, metric, symbol, sorted = screen.universe[metric]) => {
+  const i = screen.index.get(symbol);
+  if (i === undefined || sorted.rank[i] < 0) return null;
+  const value = screen.values[metric][i];
+  return {
+    value,
+    rank: sorted.order.length - sorted.rank[i],
+    count: sorted.order.length,
+    percentile: percentileIn(sorted, value)
+  };
+};
+
+// The symbol's standing within its peer group (sector) with the group's top `k`
+export const peerGroup = (screen, metric, symbol, k = 0) => {
+  const i = screen.index.get(symbol);
+  if (i === undefined) return null;
+  const group = screen.group[i];
+  const sorted = screen.peers[metric].get(group);
+  return {
+    group: typeof group === 'number' ? screen.groupNames?.[group] ?? NO_GROUP : group,
+    standing: percentileOf(screen, metric, symbol, sorted),
+    top: topK(screen, metric, k, sorted)
+  };
+};
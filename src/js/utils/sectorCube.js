@@ -0,0 +1,89 @@
+// Sector aggregation cube reader.
+//
+// data/process_data.py writes processed/sectors.json (data/pipeline/cube.py):
+// a market > sector > industry > symbol tree with the return and volume of
+// every node for each period, precomputed. Nodes are numbered level by level
+// with each node's children contiguous and heaviest first, so drilling into
+// any node is a slice of typed arrays - no bars are read or rescanned.
+
+export const DEFAULT_CUBE_URL = 'data/processed/sectors.json';
+
+const CUBE_VERSION = 1;
+
+// Missing returns (JSON null) become NaN
+const toFloat64 = (values) => Float64Array.from(values, value => (value === null ? NaN : value));
+
+export const parseSectorCube = (json) => {
+  if (json.version !== CUBE_VERSION) {
+    throw new Error(`Unsupported sector cube version ${json.version}`);
+  }
+  const { nodes } = json;
+  const returns = {};
+  const volume = {};
+  json.periods.forEach(period => {
+    returns[period] = toFloat64(json.returns[period]);
+    volume[period] = Float64Array.from(json.volume[period]);
+  });
+  return {
+    asOf: json.asOf,
+    periods: json.periods,
+    levels: json.levels,
+    name: nodes.name,
+    level: Int8Array.from(nodes.level),
+    parent: Int32Array.from(nodes.parent),
+    firstChild: Int32Array.from(nodes.firstChild),
+    childCount: Int32Array.from(nodes.childCount),
+    marketCap: Float64Array.from(nodes.marketCap),
+    weight: toFloat64(nodes.weight),
+    returns,
+    volume
+  };
+};
+
+export const loadSectorCube = async (url = DEFAULT_CUBE_URL, options) => {
+  const response = await fetch(url, options);
+  if (!response.ok) {
+    throw new Error(`Failed to load ${url}: ${response.status}`);
+  }
+  return parseSectorCube(await response.json());
+};
+
+export const ROOT = 0;
+
+export const cubeNode = (cube, node, period) => ({
+  node,
+  name: cube.name[node],
+  level: cube.levels[cube.level[node]],
+  leaf: cube.childCount[node] === 0,
+  return: cube.returns[period][node],
+  volume: cube.volume[period][node],
+  marketCap: cube.marketCap[node],
+  weight: cube.weight[node]
+});
+
+// Children of `node` for one period, heaviest first (at most `limit` of them)
+export const cubeChildren = (cube, node, period, limit = Infinity) => {
+  const start = cube.firstChild[node];
+  const count = Math.min(cube.childCount[node], limit);
+  const result = new Array(Math.max(count, 0));
+  for (let i = 0; i < count; i++) {
+    result[i] = cubeNode(cube, start + i, period);
+  }
+  return result;
+};
+
+// Nodes from the root down to `node`, for the drill-down breadcrumb
+export const cubePath = (cube, node) => {
+  const path = [];
+  for (let current = node; current >= 0; current = cube.parent[current]) {
+    path.unshift(current);
+  }
+  return path;
+};
+
+// Market-cap share of each sector in percent, shaped like the allocation pie's data
+export const sectorAllocation = (cube, palette) => cubeChildren(cube, ROOT, cube.periods[0]).map((sector, index) => ({
+  name: sector.name,
+  value: Math.round(sector.weight * 1000) / 10,
+  color: palette[index % palette.length]
+}));
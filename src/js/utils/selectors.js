@@ -0,0 +1,140 @@
+// Memoized derived data for the dashboards.
+//
+// Every derived dataset is cached under the inputs it really depends on: the
+// store, the symbol's data version and the selector arguments (view, chart
+// width, ...). State that a selector does not read - hovered point, view
+// type, animation key - never invalidates it, and switching back to a symbol
+// reuses its cached values until ingestion bumps that symbol's version.
+
+import { DEFAULT_CHART_WIDTH, MIN_PIXELS_PER_BAR, lowerBound, selectView as pickView } from './barPyramid';
+import { downsampleView, minMaxIndices } from './downsample';
+import { epochDayToISO } from './ohlcvStore';
+import { GridIndex, TimeAxisIndex } from './hitTest';
+import { buildScreen } from './screener';
+
+const MAX_SYMBOLS = 64;
+const MAX_ENTRIES_PER_SYMBOL = 8;
+
+const argKey = (args) => args
+  .map(arg => (arg !== null && typeof arg === 'object' ? JSON.stringify(arg) : String(arg)))
+  .join('|');
+
+// Map with least-recently-used eviction beyond `limit` entries
+const touch = (map, key, value, limit) => {
+  map.delete(key);
+  map.set(key, value);
+  if (map.size > limit) {
+    map.delete(map.keys().next().value);
+  }
+  return value;
+};
+
+// Selector over one symbol: compute(store, symbol, ...args)
+export const createSymbolSelector = (compute) => {
+  const cache = new Map(); // symbol -> { store, version, values: Map(argKey -> value) }
+  return (store, symbol, ...args) => {
+    const version = store.version(symbol);
+    let slot = cache.get(symbol);
+    if (!slot || slot.store !== store || slot.version !== version) {
+      slot = { store, version, values: new Map() };
+    }
+    touch(cache, symbol, slot, MAX_SYMBOLS);
+
+    const key = argKey(args);
+    if (slot.values.has(key)) {
+      return touch(slot.values, key, slot.values.get(key), MAX_ENTRIES_PER_SYMBOL);
+    }
+    return touch(slot.values, key, compute(store, symbol, ...args), MAX_ENTRIES_PER_SYMBOL);
+  };
+};
+
+// Selector over the whole universe, invalidated by any symbol's version bump
+export const createStoreSelector = (compute) => {
+  let cached = null;
+  return (store, ...args) => {
+    const key = argKey(args);
+    if (!cached || cached.store !== store || cached.revision !== store.revision || cached.key !== key) {
+      cached = { store, revision: store.revision, key, value: compute(store, ...args) };
+    }
+    return cached.value;
+  };
+};
+
+// { resolution, start, end } of the pyramid level drawn for a timeframe
+export const selectView = createSymbolSelector(pickView);
+
+export const selectCurrentStock = createSymbolSelector((store, symbol, view) => store.stock(symbol, view));
+
+export const selectChartSeries = createSymbolSelector(downsampleView);
+
+// Volume vs Price correlation points, volume in millions
+export const selectCorrelationData = createSymbolSelector((store, symbol, { resolution, start, end }) => {
+  const { date, close, volume } = store.series(symbol, resolution);
+  const points = new Array(end - start);
+  for (let i = start; i < end; i++) {
+    points[i - start] = {
+      volume: volume[i] / 1000000,
+      price: close[i],
+      date: epochDayToISO(date[i])
+    };
+  }
+  return points;
+});
+
+// Hover indexes over the drawn price and volume series (binary search on day)
+export const selectTimeIndexes = createSymbolSelector((store, symbol, view, pixelWidth) => {
+  const { price, volume } = selectChartSeries(store, symbol, view, pixelWidth);
+  return {
+    price: new TimeAxisIndex(Float64Array.from(price, row => row.day)),
+    volume: new TimeAxisIndex(Float64Array.from(volume, row => row.day))
+  };
+});
+
+// Uniform-grid hover index over the Price vs Volume scatter points
+export const selectScatterIndex = createSymbolSelector((store, symbol, view) => {
+  const points = selectCorrelationData(store, symbol, view);
+  return new GridIndex(Float64Array.from(points, p => p.volume), Float64Array.from(points, p => p.price));
+});
+
+const finiteOrNull = (value) => (Number.isFinite(value) ? value : null);
+
+// MACD/RSI rows over the dates of a view, read from the daily indicator
+// columns (whatever the view's resolution) and reduced to the chart width by
+// keeping each bucket's histogram extremes. Empty when the store has none.
+export const selectIndicatorSeries = createSymbolSelector((store, symbol, { resolution, start, end }, pixelWidth) => {
+  const daily = store.series(symbol, '1d');
+  if (!daily.macd || end <= start) {
+    return [];
+  }
+  const dates = store.series(symbol, resolution).date;
+  const lo = lowerBound(daily.date, dates[start]);
+  const hi = end < dates.length ? lowerBound(daily.date, dates[end]) : daily.date.length;
+  const width = pixelWidth || DEFAULT_CHART_WIDTH;
+  const indices = minMaxIndices(daily.macdHist.subarray(lo, hi), Math.floor(width / (2 * MIN_PIXELS_PER_BAR)));
+  return Array.from(indices, i => ({
+    day: daily.date[lo + i],
+    macd: finiteOrNull(daily.macd[lo + i]),
+    signal: finiteOrNull(daily.macdSignal[lo + i]),
+    histogram: finiteOrNull(daily.macdHist[lo + i]),
+    rsi: finiteOrNull(daily.rsi14[lo + i])
+  }));
+});
+
+// Average daily volume over the trailing `days` bars and today's volume relative to it
+export const selectVolumeStats = createSymbolSelector((store, symbol, days) => {
+  const { volume } = store.series(symbol, '1d');
+  const start = Math.max(0, volume.length - days);
+  let total = 0;
+  for (let i = start; i < volume.length; i++) {
+    total += volume[i];
+  }
+  const avgVolume = volume.length > start ? total / (volume.length - start) : 0;
+  return {
+    avgVolume,
+    volumeRatio: avgVolume ? store.meta(symbol).volume / avgVolume : 0
+  };
+});
+
+// Sorted screening indexes over every symbol's latest quote (screener.js),
+// built in place; the dashboards use the worker-backed useScreen.js
+export const selectScreen = createStoreSelector(buildScreen);
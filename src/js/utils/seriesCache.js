@@ -0,0 +1,108 @@
+// Persistent IndexedDB cache of fetched series.
+//
+// Every symbol viewed through the data API (dataApi.js) is kept as one record:
+// its metadata and, per resolution, the columns of the contiguous date range
+// fetched so far ({ symbol, meta, from, levels: { resolution: { field:
+// TypedArray } }, bytes, lastUsed }). Switching back to a symbol, or
+// reloading the page, reads the record instead of the network; dataApi.js
+// then fetches only the bars missing at either end and stitches them on.
+// Records are evicted least recently used first once they exceed the budget.
+
+const DB_NAME = 'stock-dashboard';
+const DB_VERSION = 1;
+const STORE = 'series';
+
+export const DEFAULT_CACHE_BUDGET = 64 * 1024 * 1024;
+
+const promisify = (request) => new Promise((resolve, reject) => {
+  request.onsuccess = () => resolve(request.result);
+  request.onerror = () => reject(request.error);
+});
+
+const transactionDone = (tx) => new Promise((resolve, reject) => {
+  tx.oncomplete = () => resolve();
+  tx.onerror = () => reject(tx.error);
+  tx.onabort = () => reject(tx.error);
+});
+
+const recordBytes = (levels) => Object.values(levels)
+  .reduce((total, columns) => total + Object.values(columns).reduce((sum, column) => sum + column.byteLength, 0), 0);
+
+export class SeriesCache {
+  constructor(budget = DEFAULT_CACHE_BUDGET, name = DB_NAME) {
+    this.budget = budget;
+    this.db = new Promise((resolve, reject) => {
+      const request = indexedDB.open(name, DB_VERSION);
+      request.onupgradeneeded = () => {
+        const store = request.result.createObjectStore(STORE, { keyPath: 'symbol' });
+        store.createIndex('lastUsed', 'lastUsed');
+      };
+      request.onsuccess = () => resolve(request.result);
+      request.onerror = () => reject(request.error);
+    });
+  }
+
+  // The cached record of `symbol` (marked as just used), or null
+  async get(symbol) {
+    const db = await this.db;
+    const tx = db.transaction(STORE, 'readwrite');
+    const store = tx.objectStore(STORE);
+    const record = await promisify(store.get(symbol));
+    if (record) {
+      record.lastUsed = Date.now();
+      store.put(record);
+    }
+    await transactionDone(tx);
+    return record || null;
+  }
+
+  // Stores `symbol`'s series from epoch day `from` on and evicts the least
+  // recently used records beyond the budget. Columns are copied out of the
+  // response buffers they view, which would otherwise be stored whole.
+  async put(symbol, meta, from, levels) {
+    const compact = {};
+    Object.entries(levels).forEach(([resolution, columns]) => {
+      compact[resolution] = {};
+      Object.entries(columns).forEach(([field, column]) => {
+        compact[resolution][field] = column.slice();
+      });
+    });
+    const record = { symbol, meta, from, levels: compact, bytes: recordBytes(compact), lastUsed: Date.now() };
+    if (record.bytes > this.budget) {
+      return;
+    }
+    const db = await this.db;
+    const tx = db.transaction(STORE, 'readwrite');
+    const store = tx.objectStore(STORE);
+    store.put(record);
+    let total = 0;
+    await new Promise((resolve, reject) => {
+      // Newest first: everything past the budget is evicted
+      const cursor = store.index('lastUsed').openCursor(null, 'prev');
+      cursor.onsuccess = () => {
+        const current = cursor.result;
+        if (!current) {
+          resolve();
+          return;
+        }
+        total += current.value.bytes;
+        if (total > this.budget) {
+          current.delete();
+        }
+        current.continue();
+      };
+      cursor.onerror = () => reject(cursor.error);
+    });
+    await transactionDone(tx);
+  }
+
+  async delete(symbol) {
+    const db = await this.db;
+    const tx = db.transaction(STORE, 'readwrite');
+    tx.objectStore(STORE).delete(symbol);
+    await transactionDone(tx);
+  }
+}
+
+// A cache when the browser has IndexedDB, otherwise null
+export const openSeriesCache = (budget) => (typeof indexedDB === 'undefined' ? null : new SeriesCache(budget));
@@ -0,0 +1,41 @@
+// Momentum classification for the narrative panels.
+//
+// Reads the latest MACD and RSI values the pipeline stores in each symbol's
+// meta (data/pipeline/indicators.py). Stores without indicators (the inline
+// sample data) fall back to the day's percentage change.
+
+export const STRONG_BULLISH = 'strong-bullish';
+export const MILD_BULLISH = 'mild-bullish';
+export const MILD_BEARISH = 'mild-bearish';
+export const STRONG_BEARISH = 'strong-bearish';
+
+export const RSI_OVERBOUGHT = 70;
+export const RSI_OVERSOLD = 30;
+
+const hasIndicators = (quote) => Boolean(
+  quote.indicators && quote.indicators.macdHist !== null && quote.indicators.rsi14 !== null
+);
+
+export const momentumSignal = (quote) => {
+  if (!hasIndicators(quote)) {
+    const change = quote.changePercent;
+    if (change > 2) return STRONG_BULLISH;
+    if (change > 0) return MILD_BULLISH;
+    if (change > -2) return MILD_BEARISH;
+    return STRONG_BEARISH;
+  }
+  const { macd, macdHist, rsi14 } = quote.indicators;
+  if (macdHist > 0) {
+    return macd > 0 && rsi14 >= 55 ? STRONG_BULLISH : MILD_BULLISH;
+  }
+  return macd < 0 && rsi14 <= 45 ? STRONG_BEARISH : MILD_BEARISH;
+};
+
+// One-line MACD/RSI reading, or null without indicators
+export const indicatorSummary = (quote) => {
+  if (!hasIndicators(quote)) return null;
+  const { macd, macdSignal, rsi14 } = quote.indicators;
+  const cross = macd >= macdSignal ? 'above' : 'below';
+  const zone = rsi14 >= RSI_OVERBOUGHT ? 'overbought' : rsi14 <= RSI_OVERSOLD ? 'oversold' : 'neutral';
+  return `MACD ${macd.toFixed(2)} ${cross} signal ${macdSignal.toFixed(2)} · RSI ${rsi14.toFixed(0)} (${zone})`;
+};
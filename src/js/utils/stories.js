@@ -0,0 +1,53 @@
+// Narrative texts of the data story, generated nightly.
+//
+// data/process_data.py writes processed/stories.json (data/pipeline/narrative.py):
+// for every symbol the text each narrative section's rules chose, plus an
+// opportunity score and the symbols ranked by it. The dashboard looks texts
+// up by symbol instead of branching on thresholds while it renders. Each
+// symbol's texts describe its own latest bar, dated by its `asOf`.
+
+export const DEFAULT_STORIES_URL = 'data/processed/stories.json';
+
+const STORIES_VERSION = 2;
+
+export const parseStories = (json) => {
+  if (json.version !== STORIES_VERSION) {
+    throw new Error(`Unsupported stories version ${json.version}`);
+  }
+  const index = new Map(json.symbols.map((symbol, i) => [symbol, i]));
+  return {
+    asOf: json.asOf,
+    sections: json.sections,
+    symbols: json.symbols,
+    symbolAsOf: json.symbolAsOf,
+    index,
+    text: json.text,
+    opportunity: Float64Array.from(json.opportunity),
+    ranking: Int32Array.from(json.ranking)
+  };
+};
+
+export const loadStories = async (url = DEFAULT_STORIES_URL, options) => {
+  const response = await fetch(url, options);
+  if (!response.ok) {
+    throw new Error(`Failed to load ${url}: ${response.status}`);
+  }
+  return parseStories(await response.json());
+};
+
+// { section: text } for one symbol, or null when it has no story
+export const storyFor = (stories, symbol) => {
+  const i = stories ? stories.index.get(symbol) : undefined;
+  if (i === undefined) return null;
+  const story = { asOf: stories.symbolAsOf[i], opportunityScore: stories.opportunity[i] };
+  stories.sections.forEach(section => {
+    story[section] = stories.text[section][i];
+  });
+  return story;
+};
+
+// The `count` symbols with the highest opportunity score
+export const topOpportunities = (stories, count) => Array.from(
+  stories.ranking.subarray(0, count),
+  i => ({ symbol: stories.symbols[i], opportunity: stories.opportunity[i], text: stories.text.opportunity[i] })
+);
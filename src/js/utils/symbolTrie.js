@@ -0,0 +1,72 @@
+// Prefix trie over tickers and company names for the symbol picker.
+//
+// Every symbol is indexed under its ticker, its full name and each later word
+// of the name ("Apple Inc." under "aapl", "apple inc." and "inc."), all
+// lowercased. Each node keeps the ids of every symbol below it in insertion
+// order, so a lookup walks one node per typed character and returns a slice:
+// no matching or sorting happens while typing.
+
+const keysOf = (symbol, name) => {
+  const keys = [symbol.toLowerCase()];
+  if (name && name !== symbol) {
+    const full = name.toLowerCase();
+    keys.push(full);
+    full.split(/\s+/).slice(1).forEach(word => {
+      if (word) keys.push(word);
+    });
+  }
+  return keys;
+};
+
+export class SymbolTrie {
+  // `entries` are [symbol, name] pairs in the order matches should be listed
+  constructor(entries) {
+    this.symbols = entries.map(([symbol]) => symbol);
+    this.tickers = new Map(this.symbols.map((symbol, id) => [symbol.toLowerCase(), id]));
+    this.root = { children: new Map(), ids: [] };
+    entries.forEach(([symbol, name], id) => {
+      keysOf(symbol, name).forEach(key => this.insert(key, id));
+    });
+  }
+
+  insert(key, id) {
+    let node = this.root;
+    for (const char of key) {
+      let child = node.children.get(char);
+      if (!child) {
+        child = { children: new Map(), ids: [] };
+        node.children.set(char, child);
+      }
+      // A symbol's keys are inserted together, so a repeat is the last id
+      if (child.ids[child.ids.length - 1] !== id) {
+        child.ids.push(id);
+      }
+      node = child;
+    }
+  }
+
+  // Up to `limit` symbols with a key starting with `query`; an exact ticker
+  // match comes first
+  search(query, limit = Infinity) {
+    const prefix = query.trim().toLowerCase();
+    let node = this.root;
+    for (const char of prefix) {
+      node = node.children.get(char);
+      if (!node) return [];
+    }
+    if (!prefix) return this.symbols.slice(0, limit);
+    const ids = node.ids.slice(0, limit);
+    const exact = this.tickers.get(prefix);
+    if (exact !== undefined && ids[0] !== exact) {
+      return [exact, ...ids.filter(id => id !== exact)].slice(0, limit).map(id => this.symbols[id]);
+    }
+    return ids.map(id => this.symbols[id]);
+  }
+}
+
+// Trie over a store's symbols, largest market cap first
+export const buildSymbolTrie = (store) => {
+  const entries = store.symbols.map(symbol => [symbol, store.meta(symbol).name, store.meta(symbol).marketCap || 0]);
+  entries.sort((a, b) => b[2] - a[2] || (a[0] < b[0] ? -1 : 1));
+  return new SymbolTrie(entries.map(([symbol, name]) => [symbol, name]));
+};
@@ -0,0 +1,23 @@
+import { useCallback, useRef, useState } from 'react';
+
+// Tracks the rendered width of an element via ResizeObserver.
+// Returns [callbackRef, width]; width is 0 until the element is measured.
+export const useElementWidth = () => {
+  const [width, setWidth] = useState(0);
+  const observer = useRef(null);
+
+  const ref = useCallback((node) => {
+    if (observer.current) {
+      observer.current.disconnect();
+      observer.current = null;
+    }
+    if (node) {
+      observer.current = new ResizeObserver(([entry]) => {
+        setWidth(Math.round(entry.contentRect.width));
+      });
+      observer.current.observe(node);
+    }
+  }, []);
+
+  return [ref, width];
+};
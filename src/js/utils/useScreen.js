@@ -0,0 +1,75 @@
+import { useEffect, useRef, useState } from 'react';
+import { assembleScreen, screenBuffers, screenInputs } from './screener';
+import { selectScreen } from './selectors';
+
+// The universe screen (screener.js) of a store, kept current off the main
+// thread. Every store revision asks src/js/workers/screenWorker.js for a new
+// sort, but at most one request is in flight: revisions arriving meanwhile
+// collapse into a single follow-up that reads the store when it is sent, so
+// superseded revisions are never sorted, and replies for a store that has
+// since been replaced are dropped. Returns null until the first sort of a
+// store arrives; without Worker support the screen is built in place
+// (selectScreen).
+
+const supported = typeof Worker !== 'undefined';
+
+const createWorker = () => new Worker(new URL('../workers/screenWorker.js', import.meta.url), { type: 'module' });
+
+export const useScreen = (store) => {
+  const [screen, setScreen] = useState(null);
+  // inFlight: { id, store, revision, inputs } of the request being sorted;
+  // queued: a newer revision waits for the worker
+  const state = useRef({ worker: null, nextId: 0, inFlight: null, queued: false, store });
+  state.current.store = store;
+  const { revision } = store;
+
+  useEffect(() => {
+    if (!supported) return undefined;
+    const current = state.current;
+    const worker = createWorker();
+    const send = () => {
+      const inputs = screenInputs(current.store);
+      const { values, groupOf, groupCount } = inputs;
+      const id = current.nextId++;
+      current.inFlight = { id, store: current.store, revision: current.store.revision, inputs };
+      current.queued = false;
+      worker.postMessage({ id, values, groupOf, groupCount }, screenBuffers({ values, groupOf }));
+    };
+    worker.onmessage = ({ data }) => {
+      const { id, store: sorted, inputs } = current.inFlight;
+      current.inFlight = null;
+      if (data.id === id && sorted === current.store) {
+        setScreen({ store: sorted, value: assembleScreen(inputs, data.result) });
+      }
+      if (current.queued) send();
+    };
+    // A failed sort must not leave later revisions waiting behind it
+    worker.onerror = () => {
+      current.inFlight = null;
+      if (current.queued) send();
+    };
+    current.worker = { send };
+    send();
+    return () => {
+      worker.terminate();
+      current.worker = null;
+      current.inFlight = null;
+      current.queued = false;
+    };
+  }, []);
+
+  // Ask for a sort of each new revision; a busy worker takes the latest once free
+  useEffect(() => {
+    const current = state.current;
+    if (!current.worker) return;
+    const { inFlight } = current;
+    if (!inFlight) {
+      current.worker.send();
+    } else if (inFlight.store !== store || inFlight.revision !== revision) {
+      current.queued = true;
+    }
+  }, [store, revision]);
+
+  if (!supported) return selectScreen(store);
+  return screen && screen.store === store ? screen.value : null;
+};
@@ -0,0 +1,148 @@
+// Local re-layout of the correlation network while a node is dragged.
+//
+// The full layout is precomputed by data/correlate.py; dragging only
+// re-simulates the dragged node's neighbourhood (nodes within a couple of
+// edges), off the main thread. Nodes outside it stay where they are, so they
+// are indexed in a quadtree once per drag and repel the neighbourhood through
+// Barnes–Hut; the few moving nodes repel each other exactly. The forces match
+// data/pipeline/layout.py.
+//
+// Messages in:  { type: 'init', x, y, source, target, correlation, threshold }
+//               { type: 'drag', node, x, y }
+//               { type: 'release' }
+// Messages out: { type: 'positions', nodes, x, y } for the nodes that moved.
+
+import { Quadtree } from '../utils/quadtree';
+
+const NEIGHBOURHOOD_HOPS = 2;
+const NEIGHBOURHOOD_LIMIT = 300;
+const TICKS = 8;
+const STEP = 0.5;
+const GRAVITY = 0.05;
+
+let x = null;
+let y = null;
+// Adjacency in CSR form: neighbours of i are adjacent[offsets[i]..offsets[i + 1])
+let offsets = null;
+let adjacent = null;
+let weights = null;
+
+const buildAdjacency = (n, source, target, correlation, threshold) => {
+  const degree = new Int32Array(n + 1);
+  let count = 0;
+  for (let e = 0; e < correlation.length && Math.abs(correlation[e]) >= threshold; e++) {
+    degree[source[e] + 1]++;
+    degree[target[e] + 1]++;
+    count++;
+  }
+  for (let i = 0; i < n; i++) degree[i + 1] += degree[i];
+  offsets = degree;
+  adjacent = new Int32Array(offsets[n]);
+  weights = new Float32Array(offsets[n]);
+  const fill = offsets.slice(0, n);
+  for (let e = 0; e < count; e++) {
+    const a = source[e];
+    const b = target[e];
+    adjacent[fill[a]] = b;
+    weights[fill[a]++] = correlation[e];
+    adjacent[fill[b]] = a;
+    weights[fill[b]++] = correlation[e];
+  }
+};
+
+// Breadth-first neighbourhood of `node`, capped so a hub does not pull in the graph
+const neighbourhood = (node) => {
+  const seen = new Set([node]);
+  let frontier = [node];
+  for (let hop = 0; hop < NEIGHBOURHOOD_HOPS && seen.size < NEIGHBOURHOOD_LIMIT; hop++) {
+    const next = [];
+    frontier.forEach(i => {
+      for (let k = offsets[i]; k < offsets[i + 1] && seen.size < NEIGHBOURHOOD_LIMIT; k++) {
+        if (!seen.has(adjacent[k])) {
+          seen.add(adjacent[k]);
+          next.push(adjacent[k]);
+        }
+      }
+    });
+    frontier = next;
+  }
+  seen.delete(node);
+  return Int32Array.from(seen);
+};
+
+// The neighbourhood of a drag and a quadtree of every node outside it
+const session = (node) => {
+  const nodes = neighbourhood(node);
+  const moving = new Uint8Array(x.length);
+  moving[node] = 1;
+  nodes.forEach(i => { moving[i] = 1; });
+  const others = [];
+  for (let i = 0; i < x.length; i++) {
+    if (!moving[i]) others.push(i);
+  }
+  return { node, nodes, tree: new Quadtree(x, y, Int32Array.from(others)) };
+};
+
+const relax = ({ node: dragged, nodes, tree }) => {
+  const moving = Int32Array.from([dragged, ...nodes]);
+  for (let tick = 0; tick < TICKS; tick++) {
+    const limit = STEP * (1 - tick / TICKS);
+    const moves = new Float32Array(nodes.length * 2);
+    nodes.forEach((i, m) => {
+      let [fx, fy] = tree.repulsion(-1, x[i], y[i]);
+      moving.forEach(j => {
+        if (j === i) return;
+        const dx = x[i] - x[j];
+        const dy = y[i] - y[j];
+        const dist2 = Math.max(dx * dx + dy * dy, 1e-9);
+        fx += dx / dist2;
+        fy += dy / dist2;
+      });
+      for (let k = offsets[i]; k < offsets[i + 1]; k++) {
+        if (weights[k] <= 0) continue;
+        const j = adjacent[k];
+        const dx = x[j] - x[i];
+        const dy = y[j] - y[i];
+        const pull = weights[k] * Math.sqrt(dx * dx + dy * dy);
+        fx += dx * pull;
+        fy += dy * pull;
+      }
+      fx -= GRAVITY * x[i];
+      fy -= GRAVITY * y[i];
+      const length = Math.sqrt(fx * fx + fy * fy) || 1;
+      const scale = Math.min(length, limit) / length;
+      moves[m * 2] = fx * scale;
+      moves[m * 2 + 1] = fy * scale;
+    });
+    nodes.forEach((i, m) => {
+      x[i] += moves[m * 2];
+      y[i] += moves[m * 2 + 1];
+    });
+  }
+  return {
+    nodes: moving,
+    x: Float32Array.from(moving, i => x[i]),
+    y: Float32Array.from(moving, i => y[i])
+  };
+};
+
+let current = null;
+
+self.onmessage = ({ data }) => {
+  if (data.type === 'init') {
+    x = Float32Array.from(data.x);
+    y = Float32Array.from(data.y);
+    buildAdjacency(x.length, data.source, data.target, data.correlation, data.threshold);
+    current = null;
+  } else if (data.type === 'drag' && x) {
+    if (!current || current.node !== data.node) {
+      current = session(data.node);
+    }
+    x[data.node] = data.x;
+    y[data.node] = data.y;
+    const update = relax(current);
+    self.postMessage({ type: 'positions', ...update }, [update.nodes.buffer, update.x.buffer, update.y.buffer]);
+  } else if (data.type === 'release') {
+    current = null;
+  }
+};
@@ -0,0 +1,17 @@
+// Screen sorting off the main thread.
+//
+// Live quotes bump the store revision every frame, and each revision needs
+// the universe re-sorted per metric (src/js/utils/screener.js). The dashboard
+// posts the metric columns and group ids (screenInputs) as transferred
+// buffers; the sorted permutations come back the same way, with the columns,
+// so nothing is copied in either direction.
+//
+// Messages in:  { id, values, groupOf, groupCount }
+// Messages out: { id, result } with result = sortScreen(...)
+
+import { sortScreen, screenBuffers } from '../utils/screener';
+
+self.onmessage = ({ data }) => {
+  const result = sortScreen(data);
+  self.postMessage({ id: data.id, result }, screenBuffers(result));
+};